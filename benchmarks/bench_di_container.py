@@ -0,0 +1,101 @@
+# Microbenchmark for resolving a transient class through DIContainer.get.
+# Compares the cached constructor plans against the previous implementation, which ran
+# inspect.signature and the registration checks on every resolution.
+#
+#   $ python -m benchmarks.bench_di_container
+import asyncio
+import inspect
+import time
+
+from typing import Type
+
+from src.core.dicontainer import DIContainer
+
+
+class LegacyDIContainer(DIContainer):
+    _instance = None  # Separate singleton from DIContainer's
+
+    async def _create_instance(self, class_type: Type):
+        constructor = inspect.signature(class_type.__init__)
+        dependencies = []
+
+        for param in list(constructor.parameters.values())[1:]:
+            param_type = param.annotation
+            param_name = param.name
+
+            if param_type == inspect._empty:
+                if param_name in self._singleton_classes or param_name in self._services:
+                    dependencies.append(await self.get(param_name))
+                elif param_name in self._transient_classes:
+                    dependencies.append(await self.get(param_name))
+                elif param_name in self._transient_instances:
+                    dependencies.append(await self.get(param_name))
+                elif param_name in self._singleton_instances:
+                    dependencies.append(await self.get(param_name))
+                elif param.default != param.empty:
+                    dependencies.append(param.default)
+                else:
+                    raise Exception(f"Cannot resolve dependency '{param_name}' for class {class_type.__name__}")
+            elif param_type in [str, int, float, bool]:
+                if param.default != param.empty:
+                    dependencies.append(param.default)
+                else:
+                    raise Exception(f"Cannot resolve primitive type dependency '{param_name}' for class {class_type.__name__}")
+            else:
+                dependencies.append(await self.get(param_type.__name__))
+
+        return class_type(*dependencies)
+
+
+class ConfigService:
+    pass
+
+
+class EventBus:
+    pass
+
+
+class TemplateService:
+    def __init__(self, config_service: ConfigService, event_bus: EventBus, template_dir: str = 'templates'):
+        self.config_service = config_service
+        self.event_bus = event_bus
+        self.template_dir = template_dir
+
+
+class FormService:
+    def __init__(self, ConfigService, EventBus, csrf: bool = True):
+        self.config_service = ConfigService
+        self.event_bus = EventBus
+        self.csrf = csrf
+
+
+def setup(container: DIContainer):
+    container.register_singleton_instance(ConfigService(), 'ConfigService')
+    container.register_singleton_instance(EventBus(), 'EventBus')
+    container.register_transient_class(TemplateService, 'TemplateService')
+    container.register_transient_class(FormService, 'FormService')
+
+
+async def measure(container: DIContainer, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await container.get('TemplateService')
+        await container.get('FormService')
+    return (time.perf_counter() - start) / (iterations * 2) * 1e9
+
+
+async def main(iterations: int = 100_000):
+    results = {}
+    for name, container in (('legacy', LegacyDIContainer()), ('cached plan', DIContainer())):
+        setup(container)
+        await measure(container, 1_000)  # Warm-up
+        results[name] = await measure(container, iterations)
+
+    print(f"DIContainer.get of a transient with 3 constructor parameters, {iterations * 2} resolutions")
+    for name, ns in results.items():
+        print(f"  {name:<12} {ns:8.1f} ns/resolution")
+    print(f"  speed-up     {results['legacy'] / results['cached plan']:8.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,80 @@
+# Microbenchmark for EventBus.publish.
+# Compares the precompiled dispatch against the previous implementation, which classified
+# every listener with asyncio.iscoroutinefunction/iscoroutine on every publish, with the EventBus metrics
+# off, on with the default latency sampling, and on timing every listener call.
+#
+#   $ python -m benchmarks.bench_event_bus
+import asyncio
+import time
+
+from src.core.event_bus import Event, EventBus
+
+
+class LegacyEventBus(EventBus):
+    async def publish(self, event: Event):
+        handled = False
+        if event.name in self.listeners:
+            for listener in self.listeners[event.name]:
+                if event.data.get('response_already_sent', False):
+                    break
+                try:
+                    if asyncio.iscoroutinefunction(listener):
+                        await listener(event)
+                        handled = True
+                    elif asyncio.iscoroutine(listener):
+                        await listener
+                        handled = True
+                    else:
+                        listener(event)
+                        handled = True
+                except Exception as e:
+                    print(f"Error in listener for event '{event.name}': {e}")
+        if not handled:
+            await self.handle_unhandled_event(event)
+
+
+async def async_listener(event: Event):
+    pass
+
+
+def sync_listener(event: Event):
+    pass
+
+
+async def plain_loop(listeners, event: Event):
+    for listener in listeners:
+        await listener(event)
+
+
+async def measure(publish, event: Event, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await publish(event)
+    return (time.perf_counter() - start) / iterations * 1e9
+
+
+async def main(iterations: int = 200_000, listener_count: int = 4):
+    results = {}
+    buses = [('legacy', LegacyEventBus()), ('metrics off', EventBus()), ('precompiled', EventBus()), ('timed calls', EventBus())]
+    buses[1][1].configure_metrics(enabled=False)
+    buses[3][1].configure_metrics(sample_every=1)
+    for name, bus in buses:
+        for i in range(listener_count):
+            bus.subscribe('http.request.completed', async_listener if i % 2 == 0 else sync_listener)
+        event = Event(name='http.request.completed', data={})
+        await measure(bus.publish, event, 1_000)  # Warm-up
+        results[name] = await measure(bus.publish, event, iterations)
+
+    # Lower bound: awaiting the same number of coroutine functions in a plain loop
+    listeners = [async_listener] * listener_count
+    event = Event(name='http.request.completed', data={})
+    results['plain loop'] = await measure(lambda ev: plain_loop(listeners, ev), event, iterations)
+
+    print(f"EventBus.publish, {listener_count} listeners, {iterations} iterations")
+    for name, ns in results.items():
+        print(f"  {name:<12} {ns:8.1f} ns/publish")
+    print(f"  speed-up     {results['legacy'] / results['precompiled']:8.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
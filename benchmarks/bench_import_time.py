@@ -0,0 +1,77 @@
+# Cold-start benchmark: how long a fresh worker takes to import the application.
+# Runs `python -X importtime -c "import <module>"` in clean interpreters, reports the best total and the
+# slowest top-level packages, and fails (exit status 1) when the import goes over the time budget or loads
+# an optional subsystem that should only be imported on first use.
+#
+#   $ python -m benchmarks.bench_import_time
+#   $ python -m benchmarks.bench_import_time --module demo_app.app --budget-ms 400 --runs 5
+import argparse
+import os
+import subprocess
+import sys
+
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Libraries the framework loads lazily: importing the app must not pull them in
+LAZY_MODULES = ('jinja2', 'mako', 'redis', 'jwt', 'aiohttp', 'aiofiles', 'pytest')
+
+
+# One import in a fresh interpreter: [(self µs, cumulative µs, depth, module), ...] in import order
+def import_profile(module: str) -> List[Tuple[int, int, int, str]]:
+    env = dict(os.environ, PYTHONPATH=ROOT, PYTHONDONTWRITEBYTECODE='')
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+                            cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    profile = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        profile.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return profile
+
+
+def total_ms(profile, module: str) -> float:
+    return next(cumulative for _, cumulative, _, name in reversed(profile) if name == module) / 1000
+
+
+# Self time aggregated per top-level package, slowest first
+def by_package(profile) -> List[Tuple[str, float]]:
+    totals: Dict[str, int] = defaultdict(int)
+    for self_us, _, _, name in profile:
+        totals[name.split('.')[0]] += self_us
+    return sorted(((package, us / 1000) for package, us in totals.items()), key=lambda item: -item[1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time benchmark and cold-start guard")
+    parser.add_argument('--module', default='demo_app.app')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=400.0)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    profiles = [import_profile(args.module) for _ in range(args.runs)]
+    best = min(profiles, key=lambda profile: total_ms(profile, args.module))
+    best_ms = total_ms(best, args.module)
+    loaded = sorted({name.split('.')[0] for _, _, _, name in best} & set(LAZY_MODULES))
+
+    print(f"import {args.module}: best of {args.runs} runs {best_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    for package, ms in by_package(best)[:args.top]:
+        print(f"  {package:<24} {ms:8.1f} ms")
+
+    failures = []
+    if best_ms > args.budget_ms:
+        failures.append(f"import took {best_ms:.1f} ms, over the {args.budget_ms:.0f} ms budget")
+    if loaded:
+        failures.append(f"optional modules imported eagerly: {', '.join(loaded)}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# Microbenchmark for matching a request path against 1k-10k routes.
+# Compares the RouteTree used by RoutingService against the previous implementation, which called
+# re.match with every route's pattern string in turn until one matched, and shows the cost of a repeat
+# request served by RoutingService's (method, path) match cache.
+#
+#   $ python -m benchmarks.bench_routing
+import random
+import re
+import time
+
+from unittest.mock import AsyncMock
+
+from src.core.route_tree import RouteTree
+from src.services.routing_service import RoutingService
+
+ROUTE_COUNTS = (1_000, 2_000, 5_000, 10_000)
+
+
+# Three routes per resource, as an application would register them
+def templates(count: int):
+    for index in range(count // 3 + 1):
+        yield f'/api/resource{index}'
+        yield f'/api/resource{index}/<int:id>'
+        yield f'/api/resource{index}/<int:id>/owner/<str:name>'
+
+
+def sample_paths(routes, count: int, rng: random.Random):
+    paths = []
+    for template in rng.sample(routes, count):
+        paths.append(template.replace('<int:id>', '42').replace('<str:name>', 'alice'))
+    return paths
+
+
+def legacy_match(routes, path):
+    for regex_path, methods in routes.items():
+        match = re.match(regex_path, path)
+        if match:
+            return regex_path, match.groupdict()
+    return None
+
+
+def measure(match, paths, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for path in paths:
+            match(path)
+    return (time.perf_counter() - start) / (iterations * len(paths)) * 1e9
+
+
+def main():
+    rng = random.Random(7)
+    convert = RoutingService._convert_path_to_regex
+    print("Route lookup (ns per request path, random routes from the table)")
+    print(f"  {'routes':>8} {'legacy scan':>14} {'route tree':>12} {'speed-up':>10} {'match cache':>13}")
+    for count in ROUTE_COUNTS:
+        route_templates = list(templates(count))[:count]
+        legacy_routes = {convert(None, template): {'GET': None} for template in route_templates}
+        tree = RouteTree()
+        for template in route_templates:
+            tree.add(template, convert(None, template))
+        paths = sample_paths(route_templates, 200, rng)
+
+        legacy_ns = measure(lambda path: legacy_match(legacy_routes, path), paths[:20], 2)
+        tree_ns = measure(tree.match, paths, 200)
+
+        routing_service = RoutingService(event_bus=None, auth_service=AsyncMock(), jwt_service=None, config_service=AsyncMock())
+        for template in route_templates:
+            routing_service.add_route(template, 'GET', None)
+        cached_ns = measure(lambda path: routing_service._resolve('GET', path), paths, 200)
+        print(f"  {count:>8} {legacy_ns:>14.0f} {tree_ns:>12.0f} {legacy_ns / tree_ns:>9.0f}x {cached_ns:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ from src.core.decorators import inject
 from src.controllers.http_controller import HTTPController
 from src.core.event_bus import Event
 from src.services.orm_service import ORMService
+from src.services.routing_service import RoutingService
 from src.services.template_service import TemplateService
 
 from demo_app.decorators.requires_admin import requires_admin
@@ -11,7 +12,8 @@ from src.utils.paginator import Paginator
 
 @requires_admin
 @inject
-async def admin_users_controller(event: Event, orm_service: ORMService, template_service: TemplateService):
+async def admin_users_controller(event: Event, orm_service: ORMService, template_service: TemplateService,
+                                 routing_service: RoutingService):
     controller = HTTPController(event)
     request = event.data["request"]
 
@@ -31,7 +33,8 @@ async def admin_users_controller(event: Event, orm_service: ORMService, template
         "csrf_token": csrf_token,
         "page": paginator.page,
         "total_pages": paginator.total_pages,
-        "pagination": paginator.to_dict()
+        "pagination": paginator.to_dict(),
+        "url_for": routing_service.url_for,
     }
     rendered_content = template_service.render_template('admin/admin_users.html', context)
     await controller.send_html(rendered_content)
@@ -42,7 +45,7 @@ async def admin_users_controller(event: Event, orm_service: ORMService, template
 async def admin_edit_user_controller(event: Event, orm_service: ORMService, template_service: TemplateService):
     controller = HTTPController(event, template_service)
     request = event.data["request"]
-    user_id = int(event.data["path_params"]["id"])
+    user_id = event.data["path_params"]["id"]  # Already an int (<int:id>)
     user = await orm_service.get(User, user_id)
 
     csrf_token = request.csrf_token# or session.data.get('csrf_token')
@@ -76,6 +79,6 @@ async def admin_delete_user_controller(event: Event, orm_service: ORMService):
         await controller.send_error(405, "Method Not Allowed")
         return
 
-    user_id = int(event.data["path_params"]["id"])
+    user_id = event.data["path_params"]["id"]
     await orm_service.delete(User, user_id)
     await controller.send_redirect("/admin/users")
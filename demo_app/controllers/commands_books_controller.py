@@ -2,6 +2,7 @@ import re
 import urllib.parse
 from datetime import datetime
 from urllib.parse import unquote
+from typing import TYPE_CHECKING
 
 from src.core.event_bus import Event
 from src.controllers.http_controller import HTTPController
@@ -10,13 +11,18 @@ from demo_app.forms.book_form import BookForm
 from demo_app.handlers.book_handlers import BookCommandHandler
 from src.services.form_service import FormService
 from src.services.orm_service import ORMService
-from src.services.redis_service import RedisService
+from src.services.publisher_service import PublisherService
 from src.services.template_service import TemplateService
 
+if TYPE_CHECKING:
+    from src.services.redis_service import RedisService
+
 
 async def commands_books_controller(event: Event, form_service : FormService, template_service: TemplateService,
-                                    orm_service: ORMService, redis_service: RedisService=None):
-    command_handler = BookCommandHandler(orm_service=orm_service, redis_service=redis_service)
+                                    orm_service: ORMService, redis_service: 'RedisService' = None,
+                                    publisher_service: PublisherService = None):
+    command_handler = BookCommandHandler(orm_service=orm_service, redis_service=redis_service,
+                                         publisher_service=publisher_service)
     controller = HTTPController(event, template_service)
 
     # Request and path information
@@ -1,5 +1,6 @@
 import re
 import urllib.parse
+from typing import TYPE_CHECKING
 
 from src.controllers.http_controller import HTTPController
 from src.core.event_bus import Event
@@ -8,12 +9,14 @@ from demo_app.forms.book_form import BookForm
 from demo_app.handlers.book_handlers import BookQueryHandler
 from src.services.form_service import FormService
 from src.services.orm_service import ORMService
-from src.services.redis_service import RedisService
 from src.services.template_service import TemplateService
 
+if TYPE_CHECKING:
+    from src.services.redis_service import RedisService
+
 
 async def queries_books_controller(event: Event, form_service: FormService, template_service: TemplateService,
-                                   orm_service: ORMService, redis_service: RedisService=None):
+                                   orm_service: ORMService, redis_service: 'RedisService' = None):
     # Instantiate Command and Query Handlers
     query_handler = BookQueryHandler(orm_service=orm_service, redis_service=redis_service)
     controller = HTTPController(event, template_service)
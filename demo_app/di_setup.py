@@ -1,4 +1,7 @@
 from src.core.event_bus import EventBus
+from src.core.event_store import EventStore
+from src.core.event_transport import RedisEventTransport
+from src.core.logger import configure_logging
 from src.models.base import Base
 from src.services.orm_service import ORMService
 from src.services.form_service import FormService
@@ -13,12 +16,13 @@ from src.services.websocket_service import WebSocketService
 from src.services.factories import create_redis_service
 from src.services.config_service import ConfigService
 from src.services.jwt_service import JWTService
+from src.services.response_cache_service import ResponseCacheService
 
 from src.middleware.timing_middleware import TimingMiddleware
 from src.middleware.csrf_middleware import CSRFMiddleware
 from src.middleware.browser_session_middleware import BrowserSessionMiddleware
 from src.middleware.cors_middleware import CORSMiddleware
-from src.middleware.jwt_middleware import JWTMiddleware
+# from src.middleware.jwt_middleware import JWTMiddleware  # Loads PyJWT; enable with the JWT middleware below
 
 from demo_app.config import config as default_config
 from demo_app.subscriber_setup import register_subscribers
@@ -31,10 +35,35 @@ async def setup_container(container, config=None):
     config_service = ConfigService(config or default_config)
     container.register_singleton_instance(config_service, 'ConfigService')
 
+    configure_logging(
+        level=config_service.get('LOG_LEVEL'),
+        module_levels=config_service.get('LOG_MODULE_LEVELS'),
+        debug_sample_every=config_service.get('LOG_DEBUG_SAMPLE_EVERY'),
+        debug_rate_limit=config_service.get('LOG_DEBUG_RATE_LIMIT'),
+    )
+
     event_bus = EventBus()
+    event_bus.configure_background(
+        max_size=config_service.get('EVENT_QUEUE_MAX_SIZE'),
+        workers=config_service.get('EVENT_QUEUE_WORKERS'),
+        policy=config_service.get('EVENT_QUEUE_POLICY'),
+        spill_path=config_service.get('EVENT_QUEUE_SPILL_PATH'),
+        drain_timeout=config_service.get('EVENT_QUEUE_DRAIN_TIMEOUT'),
+    )
+    event_bus.configure_metrics(
+        enabled=config_service.get('EVENT_METRICS'),
+        sample_every=config_service.get('EVENT_METRICS_SAMPLE_EVERY'),
+    )
     await register_subscribers(event_bus)
     container.register_singleton_instance(event_bus, 'EventBus')
 
+    # Keep a replayable history of domain events, e.g. to rebuild BookReadModel
+    if config_service.get('EVENT_STORE_DIR'):
+        event_store = EventStore(config_service.get('EVENT_STORE_DIR'))
+        for topic in config_service.get('EVENT_STORE_TOPICS'):
+            event_bus.subscribe(topic, event_store.append, concurrent=True)
+        container.register_singleton_instance(event_store, 'EventStore')
+
     await setup_services(container, config_service, event_bus)
     await setup_middleware(container, config_service, event_bus)
 
@@ -46,7 +75,14 @@ async def setup_services(container, config_service, event_bus):
         if redis_service:
             container.register_transient_instance(redis_service, 'RedisService')
 
-    container.register_transient_class(TemplateService, 'TemplateService')
+    # Share selected events with the other server workers
+    if redis_service and config_service.get('EVENT_TRANSPORT_TOPICS'):
+        event_transport = RedisEventTransport(event_bus, redis_service, config_service.get('EVENT_TRANSPORT_TOPICS'))
+        await event_transport.start()
+        container.register_singleton_instance(event_transport, 'EventTransport')
+
+    # One template environment per request
+    container.register_scoped_class(TemplateService, 'TemplateService')
     container.register_transient_class(FormService, 'FormService')
 
     orm_service = ORMService(config_service=config_service, Base=Base)
@@ -66,7 +102,16 @@ async def setup_services(container, config_service, event_bus):
     #container.register_singleton_instance(websocket_service, 'WebSocketService')
     container.register_singleton_class(WebSocketService, 'WebSocketService')
 
-    routing_service = RoutingService(event_bus=event_bus, auth_service=auth_service, jwt_service=jwt_service, config_service=config_service)
+    # Responses of the routes added with cache={...}, shared with the other workers when Redis is enabled
+    response_cache = ResponseCacheService(
+        event_bus=event_bus,
+        max_bytes=config_service.get('RESPONSE_CACHE_MAX_BYTES'),
+        redis_service=redis_service if config_service.get('RESPONSE_CACHE_USE_REDIS') else None,
+    )
+    container.register_singleton_instance(response_cache, 'ResponseCacheService')
+
+    routing_service = RoutingService(event_bus=event_bus, auth_service=auth_service, jwt_service=jwt_service, config_service=config_service,
+                                     response_cache=response_cache)
     await routing_service.initialize()
     container.register_transient_instance(routing_service, 'RoutingService')
 
@@ -83,4 +128,6 @@ async def setup_middleware(container, config_service, event_bus):
     middleware_service.register_middleware(cors_middleware, priority=4)
     # middleware_service.register_middleware(IpGeolocationMiddleware(), priority=0)
     middleware_service.register_middleware(TimingMiddleware(), priority=1)
+    # Run only the middleware of the matched route: static files skip the session and CSRF middleware
+    middleware_service.use_router(await container.get('RoutingService'))
     container.register_singleton_instance(middleware_service, 'MiddlewareService')
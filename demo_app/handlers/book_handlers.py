@@ -1,22 +1,28 @@
 # CQRS
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from src.services.orm_service import ORMService
 
 from demo_app.models.book import Book
 from demo_app.models.book_read_model import BookReadModel
 
-from src.services.redis_service import RedisService
+if TYPE_CHECKING:
+    from src.services.publisher_service import PublisherService
+    from src.services.redis_service import RedisService
 
 
 class BookCommandHandler:
-    def __init__(self, orm_service: ORMService = None, redis_service: Optional[RedisService] = None):
+    def __init__(self, orm_service: ORMService = None, redis_service: Optional['RedisService'] = None,
+                 publisher_service: Optional['PublisherService'] = None):
         self.orm_service = orm_service
         # Instantiate the read model if RedisService is available
         if redis_service:
             self.book_read_model = BookReadModel(redis_service)
         else:
             self.book_read_model = None
+        # Publishes book.created/updated/deleted, e.g. for the event store (EVENT_STORE_TOPICS) and the
+        # response cache (invalidate_on)
+        self.publisher_service = publisher_service
 
     async def add_book(self, title: str, author: str, published_date: str = None, isbn: str = None, stock_quantity: int = 0):
         try:
@@ -68,19 +74,20 @@ class BookCommandHandler:
             # This pattern, known as "event sourcing", provides a complete history of state changes
             # and decouples the command side (write model) from the query side (read model).
             # However, for the purposes of this minimalistic example, we are directly updating
-            # the read model after the command is executed.
+            # the read model after the command is executed, and also publish book.created so that
+            # the read model can be rebuilt from the event store (BookReadModel.rebuild).
+            book_data = {
+                "id": str(new_book.id),
+                "title": title,
+                "author": author,
+                "published_date": str(published_date) if published_date else None,
+                "isbn": isbn,
+                "stock_quantity": str(stock_quantity)
+            }
             if self.book_read_model:
-                await self.book_read_model.add_book(
-                    title=title,
-                    book_data={
-                        "id": str(new_book.id),
-                        "title": title,
-                        "author": author,
-                        "published_date": str(published_date) if published_date else None,
-                        "isbn": isbn,
-                        "stock_quantity": str(stock_quantity)
-                    }
-                )
+                await self.book_read_model.add_book(title=title, book_data=book_data)
+            if self.publisher_service:
+                await self.publisher_service.publish_book_created(book_data)
 
             return {
                 "status": "success",
@@ -119,21 +126,20 @@ class BookCommandHandler:
                 raise ValueError(f"Book with title '{title}' not found.")
 
             # Update the read model if Redis is enabled.
-            # Note: In a full CQRS implementation, we would likely emit an event here
-            # and have a separate event handler or projection
-            # service that listens for the event and updates the read model accordingly.
+            # Note: In a full CQRS implementation, the book.updated event published below
+            # would be the only input of a separate projection service updating the read model.
+            book_data = {
+                "id": str(updated_book.id),
+                "title": new_title,
+                "author": author,
+                "published_date": str(published_date) if published_date else None,
+                "isbn": isbn,
+                "stock_quantity": str(stock_quantity)
+            }
             if self.book_read_model:
-                await self.book_read_model.update_book(
-                    title=title,
-                    updated_data={
-                        "id": str(updated_book.id),
-                        "title": new_title,
-                        "author": author,
-                        "published_date": str(published_date) if published_date else None,
-                        "isbn": isbn,
-                        "stock_quantity": str(stock_quantity)
-                    }
-                )
+                await self.book_read_model.update_book(title=title, updated_data=book_data)
+            if self.publisher_service:
+                await self.publisher_service.publish_book_updated(title, book_data)
 
             return True
         except ValueError as e:
@@ -158,6 +164,8 @@ class BookCommandHandler:
                     raise ValueError(f"Book with title '{title}' not found.")
                 if deleted and self.book_read_model:
                     await self.book_read_model.delete_book(title)
+                if deleted and self.publisher_service:
+                    await self.publisher_service.publish_book_deleted(title)
 
             if not deleted and author:
                 deleted = await self.orm_service.delete(Book, lookup_value=author, lookup_column="author")
@@ -166,6 +174,8 @@ class BookCommandHandler:
                 if deleted and self.book_read_model:
                     # Note: In a more complex scenario, we would need to iterate over books by this author.
                     await self.book_read_model.delete_book(author)
+                if deleted and self.publisher_service:
+                    await self.publisher_service.publish_book_deleted(author)
 
             if deleted:
                 return {
@@ -194,7 +204,7 @@ class BookCommandHandler:
 # In production CQRS systems, the preferred approach is to rely solely on the NoSQL read model to maximize read performance and scalability.
 # However, this fallback mechanism is used here to ensure flexibility and to make the framework more accessible in different environments.
 class BookQueryHandler:
-    def __init__(self, orm_service: ORMService = None, redis_service: Optional[RedisService] = None):
+    def __init__(self, orm_service: ORMService = None, redis_service: Optional['RedisService'] = None):
         self.orm_service = orm_service or di_container.get('ORMService')
 
         # Instantiate the read model if RedisService is available
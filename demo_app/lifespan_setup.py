@@ -0,0 +1,8 @@
+from src.core.lifecycle import on_startup
+
+
+@on_startup
+async def precompile_templates(container):
+    template_service = await container.get('TemplateService')
+    loaded = template_service.preload()
+    print(f"Precompiled {loaded} templates.")
@@ -1,7 +1,6 @@
 import asyncio
 import time
 
-import aiohttp
 import logging
 
 from src.middleware.base_middleware import BaseMiddleware
@@ -36,6 +35,8 @@ class IpGeolocationMiddleware(BaseMiddleware):
         pass
 
     async def get_ip_geolocation(self, ip_address: str):
+        import aiohttp  # Only needed once a lookup is made
+
         await self.throttler.throttle()  # Apply throttling
         url = f"https://ipinfo.io/{ip_address}/json"
         try:
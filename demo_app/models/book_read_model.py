@@ -1,10 +1,11 @@
-from typing import Dict, Optional, List
+from typing import TYPE_CHECKING, Dict, Optional, List
 
-from src.services.redis_service import RedisService
+if TYPE_CHECKING:
+    from src.services.redis_service import RedisService
 
 
 class BookReadModel:
-    def __init__(self, redis_service: RedisService):
+    def __init__(self, redis_service: 'RedisService'):
         self.redis_service = redis_service
 
     async def add_book(self, title: str, book_data: Dict[str, Optional[str]]) -> None:
@@ -60,3 +61,22 @@ class BookReadModel:
                 # Decode bytes to strings if necessary
                 books.append({k.decode() if isinstance(k, bytes) else k: v.decode() if isinstance(v, bytes) else v for k, v in book_data.items()})
         return books
+
+    # Apply one stored book event to the read model
+    async def apply(self, name: str, data: Dict[str, Optional[str]]) -> None:
+        if name == 'book.created':
+            await self.add_book(title=data['title'], book_data=data)
+        elif name == 'book.updated':
+            await self.update_book(title=data['old_title'], updated_data=data['book'])
+        elif name == 'book.deleted':
+            await self.delete_book(data['title'])
+
+    # Rebuild the read model by streaming the event store from from_offset.
+    # Returns the offset to resume from, e.g. to keep it up to date with EventStore.tail().
+    async def rebuild(self, event_store, from_offset: int = 0) -> int:
+        offset = from_offset
+        for stored in event_store.read(from_offset):
+            if stored.name.startswith('book.'):
+                await self.apply(stored.name, stored.data)
+            offset = stored.offset + 1
+        return offset
@@ -20,7 +20,7 @@ from demo_app.controllers.admin.admin_users_controller import (
 
 
 async def register_routes(routing_service):
-    routing_service.add_route('/', 'GET', welcome_controller)
+    routing_service.add_route('/', 'GET', welcome_controller, cache={"ttl": 30})  # Static page: rendered once per 30s
     routing_service.add_route('/favicon.ico', 'GET', welcome_controller)
     routing_service.add_route('/hello', 'GET', hello_controller, requires_auth=True)
     routing_service.add_route('/home', 'GET', home_controller)
@@ -33,15 +33,18 @@ async def register_routes(routing_service):
     routing_service.add_route('/cors', ['GET', 'POST', 'OPTIONS'], cors_test_controller)
     # Admin
     routing_service.add_route('/admin', 'GET', admin_home_controller, requires_auth=True)
-    routing_service.add_route('/admin/users', 'GET', admin_users_controller, requires_auth=True)
-    routing_service.add_route('/admin/users/<int:id>/edit', ['GET', 'POST'], admin_edit_user_controller, requires_auth=True)
-    routing_service.add_route('/admin/users/<int:id>/delete', 'POST', admin_delete_user_controller, requires_auth=True)
+    routing_service.add_route('/admin/users', 'GET', admin_users_controller, requires_auth=True, name='admin_users')
+    routing_service.add_route('/admin/users/<int:id>/edit', ['GET', 'POST'], admin_edit_user_controller, requires_auth=True,
+                              name='admin_edit_user')
+    routing_service.add_route('/admin/users/<int:id>/delete', 'POST', admin_delete_user_controller, requires_auth=True,
+                              name='admin_delete_user')
     # # Command
     # routing_service.add_route('/books/action/add', ['POST'], commands_books_controller)
     # routing_service.add_route('/books/<str:title>/edit', ['POST'], commands_books_controller)
     # routing_service.add_route('/books/<str:title>/delete', ['POST'], commands_books_controller)
     # # Query
-    # routing_service.add_route('/books', ['GET'], queries_books_controller)
+    # routing_service.add_route('/books', ['GET'], queries_books_controller,
+    #                           cache={"ttl": 30, "vary": ["query"], "invalidate_on": ["book.#"]})
     # routing_service.add_route('/books/action/add', ['GET'], queries_books_controller)
     # routing_service.add_route('/books/<str:title>', ['GET'], queries_books_controller)
     # routing_service.add_route('/books/<str:title>/edit', ['GET'], queries_books_controller)  # just to show the form
@@ -11,15 +11,16 @@ from demo_app.subscribers.error_subscribers import handle_403_event, handle_404_
 
 async def register_subscribers(event_bus):
 
-    event_bus.subscribe("http.request.completed", log_request_response)
+    # Post-response bookkeeping is independent, so these listeners run concurrently
+    event_bus.subscribe("http.request.completed", log_request_response, concurrent=True, timeout=5)
 
     event_bus.subscribe('http.request.received', request_received)
-    event_bus.subscribe('http.request.completed', request_completed)
+    event_bus.subscribe('http.request.completed', request_completed, concurrent=True, timeout=5)
 
-    event_bus.subscribe("user.logout.success", log_event_to_db)
-    event_bus.subscribe("user.logout.failure", log_event_to_db)
-    event_bus.subscribe("user.login.success", log_event_to_db)
-    event_bus.subscribe("user.login.failure", log_event_to_db)
+    # The event log is written by the background workers, not on the login/logout request path
+    for event_name in ("user.logout.success", "user.logout.failure", "user.login.success", "user.login.failure"):
+        event_bus.subscribe(event_name, log_event_to_db)
+        event_bus.set_deferred(event_name)
 
     event_bus.subscribe('http.error.403', handle_403_event)
     event_bus.subscribe('http.error.404', handle_404_event)
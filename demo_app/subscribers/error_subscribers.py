@@ -45,10 +45,13 @@ async def handle_405_event(event: Event):
     request = event.data['request']
     send = event.data['send']
     error_page = f"<html><body><h1>USER SIDE Eventwired 405 Method Not Allowed: {request.path}</h1></body></html>"
+    headers = [[b'content-type', b'text/html']]
+    if event.data.get('allow') is not None:
+        headers.append([b'allow', event.data['allow']])
     await send({
         'type': 'http.response.start',
         'status': 405,
-        'headers': [[b'content-type', b'text/html']],
+        'headers': headers,
     })
     await send({
         'type': 'http.response.body',
@@ -41,7 +41,9 @@ async def test_client():
     app = FrameworkApp(container, register_routes)
     await app.setup()
 
-    return EWTestClient(app), container
+    yield EWTestClient(app), container
+    # Process the events deferred to the background queue (user.* audit log) before the loop closes
+    await (await container.get('EventBus')).drain()
 
 
 @pytest.fixture(autouse=True)
@@ -1,8 +1,15 @@
 import pytest
 import fakeredis.aioredis
+from unittest.mock import AsyncMock
 
+from src.core.event_bus import Event, EventBus
+from src.core.event_store import EventStore
+from src.services.orm_service import ORMService
+from src.services.publisher_service import PublisherService
 from src.services.redis_service import RedisService
 
+from demo_app.handlers.book_handlers import BookCommandHandler
+from demo_app.models.book import Book
 from demo_app.models.book_read_model import BookReadModel
 
 
@@ -136,3 +143,52 @@ async def test_list_all_books(book_read_model: BookReadModel):
     assert len(all_books) == 2
     assert book_data_1 in all_books
     assert book_data_2 in all_books
+
+
+# Test rebuilding the read model from the event store
+@pytest.mark.asyncio
+async def test_rebuild_from_event_store(book_read_model: BookReadModel, tmp_path):
+    event_store = EventStore(str(tmp_path))
+    book = {"id": "1", "title": "Dune", "author": "Frank Herbert", "stock_quantity": "3"}
+    event_store.append(Event(name='book.created', data=book))
+    event_store.append(Event(name='book.created', data={"id": "2", "title": "Emma", "author": "Jane Austen"}))
+    event_store.append(Event(name='user.login.success', data={'user_id': 1}))
+    event_store.append(Event(name='book.updated', data={'old_title': 'Dune', 'book': {**book, "title": "Dune Messiah"}}))
+    event_store.append(Event(name='book.deleted', data={'title': 'Emma'}))
+
+    assert await book_read_model.rebuild(event_store) == 5
+
+    assert await book_read_model.get_book("Dune") is None
+    assert await book_read_model.get_book("Emma") is None
+    rebuilt = await book_read_model.get_book("Dune Messiah")
+    assert rebuilt["author"] == "Frank Herbert"
+    event_store.close()
+
+
+# Test that the events published by the command handler rebuild the same read model
+@pytest.mark.asyncio
+async def test_rebuild_follows_book_commands(book_read_model: BookReadModel, tmp_path):
+    event_bus = EventBus()
+    event_store = EventStore(str(tmp_path))
+    event_bus.subscribe('book.#', event_store.append, concurrent=True)
+    orm_service = AsyncMock(spec=ORMService)
+    orm_service.get.return_value = None
+    command_handler = BookCommandHandler(orm_service=orm_service, publisher_service=PublisherService(event_bus))
+
+    orm_service.create.return_value = Book(id=1, title="Dune", author="Frank Herbert", stock_quantity=3)
+    await command_handler.add_book(title="Dune", author="Frank Herbert", stock_quantity=3)
+    orm_service.create.return_value = Book(id=2, title="Emma", author="Jane Austen", stock_quantity=1)
+    await command_handler.add_book(title="Emma", author="Jane Austen", stock_quantity=1)
+    orm_service.update.return_value = Book(id=1, title="Dune Messiah", author="Frank Herbert", stock_quantity=5)
+    await command_handler.update_book(title="Dune", new_title="Dune Messiah", author="Frank Herbert", stock_quantity=5)
+    orm_service.delete.return_value = True
+    await command_handler.delete_book(title="Emma")
+
+    assert [stored.name for stored in event_store.read()] == ['book.created', 'book.created', 'book.updated', 'book.deleted']
+    assert await book_read_model.rebuild(event_store) == 4
+
+    assert await book_read_model.get_book("Dune") is None
+    assert await book_read_model.get_book("Emma") is None
+    rebuilt = await book_read_model.get_book("Dune Messiah")
+    assert rebuilt == {"id": "1", "title": "Dune Messiah", "author": "Frank Herbert", "stock_quantity": "5"}
+    event_store.close()
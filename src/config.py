@@ -4,6 +4,7 @@ from datetime import timedelta
 DEFAULT_CONFIG = {
     'SECRET_KEY': os.getenv('SECRET_KEY', 'default_secret'),
     'PRUNE_INTERVAL': timedelta(minutes=5),
+    'DEDUP_MAX_EVENTS': 100_000,  # Max event ids remembered by Distributor for deduplication
     'DATABASE_URL': os.getenv('DATABASE_URL', 'sqlite+aiosqlite:///eventwired.db'),
     'TEMPLATE_DIR': 'src/templates',
     'ORM_ENGINE': 'SQLAlchemy',
@@ -12,5 +13,22 @@ DEFAULT_CONFIG = {
     'USE_REDIS_FOR_CQRS': False,
     'DELETE_EXPIRED_SESSIONS': False,
     'CSRF_REDIRECT_ON_FAILURE': True,
+    'ROUTE_CACHE_SIZE': 1024,  # (method, path) pairs whose matched route RoutingService keeps, 0 disables the cache
+    'RESPONSE_CACHE_MAX_BYTES': 16 * 1024 * 1024,  # Memory held by the responses of routes added with cache={...}
+    'RESPONSE_CACHE_USE_REDIS': False,  # Share cached responses between the workers through Redis
     'ENVIRONMENT': 'development',
+    'EVENT_QUEUE_MAX_SIZE': 1000,  # Background event queue (EventBus.publish_background, deferred topics)
+    'EVENT_QUEUE_WORKERS': 2,
+    'EVENT_QUEUE_POLICY': 'block',  # block, drop_oldest, drop_new or spill
+    'EVENT_QUEUE_SPILL_PATH': None,  # Required by the spill policy
+    'EVENT_QUEUE_DRAIN_TIMEOUT': 10,  # Seconds the shutdown waits for pending background events, None for no limit
+    'EVENT_TRANSPORT_TOPICS': [],  # Topics mirrored to the other workers through Redis, e.g. ['book.#']
+    'EVENT_METRICS': True,  # Per-topic and per-listener EventBus counters (EventBus.metrics_snapshot)
+    'EVENT_METRICS_SAMPLE_EVERY': 16,  # Time listener latency on one publish in N of each event name
+    'EVENT_STORE_DIR': None,  # Directory of the append-only event store (EventStore), disabled when None
+    'EVENT_STORE_TOPICS': ['user.#', 'book.#'],  # Topics appended to the event store
+    'LOG_LEVEL': 'INFO',  # Level of the framework's loggers (src.*)
+    'LOG_MODULE_LEVELS': {},  # Per-module overrides, e.g. {'src.services.redis_service': 'DEBUG'}
+    'LOG_DEBUG_SAMPLE_EVERY': 1,  # Keep one DEBUG record in N
+    'LOG_DEBUG_RATE_LIMIT': None,  # Max DEBUG records per second and per module
 }
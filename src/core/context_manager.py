@@ -1,7 +1,7 @@
 from contextvars import ContextVar
 from contextlib import asynccontextmanager
 
-from src.core.dicontainer import di_container
+from src.core.dicontainer import di_container, RequestScope, _current_scope
 
 # Context variable for the current DI container
 _current_container: ContextVar = ContextVar("current_container", default=None)
@@ -37,4 +37,17 @@ async def container_context():
     try:
         yield di_container
     finally:
-        reset_container()
\ No newline at end of file
+        reset_container()
+
+
+# Open a request scope in the current context: request-scoped services resolved inside it are created once
+# and shared, then disposed (aclose) when the block exits
+@asynccontextmanager
+async def request_scope():
+    scope = RequestScope()
+    token = _current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_scope.reset(token)
+        await scope.aclose()
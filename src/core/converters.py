@@ -0,0 +1,94 @@
+import re
+import uuid
+
+from typing import Any, Dict
+from urllib.parse import quote
+
+
+# Parses a path parameter when a route is matched and formats it back when a URL is built.
+# to_python raises ValueError when the segment is not valid for the type, so the router tries the next route.
+class Converter:
+    regex = '[^/]+'
+
+    def to_python(self, value: str) -> Any:
+        return value
+
+    def to_url(self, value: Any) -> str:
+        return quote(str(value), safe='')
+
+
+class StringConverter(Converter):
+    def to_python(self, value: str) -> str:
+        if not value:
+            raise ValueError("Empty path segment")
+        return value
+
+
+class IntegerConverter(Converter):
+    regex = '[0-9]+'
+
+    def to_python(self, value: str) -> int:
+        if not (value.isascii() and value.isdigit()):
+            raise ValueError(f"'{value}' is not an unsigned integer")
+        return int(value)
+
+    def to_url(self, value: Any) -> str:
+        number = int(value)
+        if number < 0:
+            raise ValueError(f"{value} is negative")
+        return str(number)
+
+
+class SlugConverter(Converter):
+    regex = '[-a-zA-Z0-9_]+'
+    _pattern = re.compile(regex)
+
+    def to_python(self, value: str) -> str:
+        if not self._pattern.fullmatch(value):
+            raise ValueError(f"'{value}' is not a slug")
+        return value
+
+
+class UUIDConverter(Converter):
+    regex = '[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}'
+    _pattern = re.compile(regex)
+
+    def to_python(self, value: str) -> uuid.UUID:
+        # uuid.UUID also accepts braces, 'urn:uuid:' and missing hyphens: only the canonical form is a match
+        if not self._pattern.fullmatch(value):
+            raise ValueError(f"'{value}' is not a UUID")
+        return uuid.UUID(value)
+
+    def to_url(self, value: Any) -> str:
+        return str(value if isinstance(value, uuid.UUID) else uuid.UUID(str(value)))
+
+
+# The rest of the path, slashes included; it must end the route
+class PathConverter(Converter):
+    regex = '.+'
+
+    def to_python(self, value: str) -> str:
+        if not value:
+            raise ValueError("Empty path")
+        return value
+
+    def to_url(self, value: Any) -> str:
+        return quote(str(value), safe='/')
+
+
+# Converters by the type name used in route templates, e.g. <int:id>; untyped parameters use 'str'
+CONVERTERS: Dict[str, Converter] = {
+    'str': StringConverter(),
+    'int': IntegerConverter(),
+    'slug': SlugConverter(),
+    'uuid': UUIDConverter(),
+    'path': PathConverter(),
+}
+DEFAULT_CONVERTER = 'str'
+
+
+def get_converter(kind: str, template: str) -> Converter:
+    converter = CONVERTERS.get(kind or DEFAULT_CONVERTER)
+    if converter is None:
+        raise ValueError(f"Unknown parameter type '{kind}' in '{template}'")
+    return converter
@@ -3,6 +3,7 @@ from functools import wraps
 import warnings
 
 from src.core.context_manager import get_container
+from src.core.dicontainer import DIContainer
 
 
 # Resolve a service by name using the current DI container context.
@@ -11,6 +12,32 @@ def resolve(service_name: str):
     return container.get(service_name)
 
 
+_MISSING = object()
+_NO_INSTANCES = {}
+
+
+# Analyse a function's signature once, at decoration time, into (parameter name, position, service name)
+# triples. position is None for keyword-only parameters; unannotated parameters are never injected.
+def _injection_plan(func):
+    plan = []
+    for position, (name, param) in enumerate(inspect.signature(func).parameters.items()):
+        if param.annotation is inspect.Parameter.empty or param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+            continue
+        annotation = param.annotation
+        service_name = annotation if isinstance(annotation, str) else getattr(annotation, '__name__', str(annotation))
+        positional = position if param.kind in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD) else None
+        plan.append((name, positional, service_name))
+    return tuple(plan)
+
+
+# Singletons that are already built (and, once frozen, every registered instance) can be handed out
+# without awaiting the container
+def _built_singletons(container):
+    if not isinstance(container, DIContainer):
+        return _NO_INSTANCES
+    return container._lookup if container.frozen else container._singleton_instances
+
+
 # Decorator to automatically inject dependencies into a function's parameters.
 # Dependencies are resolved using the DI container.
 def inject(func):
@@ -20,36 +47,30 @@ def inject(func):
             f"This may cause dependency injection to fail. Make sure @inject is the inner-most decorator.",
             stacklevel=2
         )
+    plan = _injection_plan(func)
+
     @wraps(func)
     async def async_wrapper(*args, **kwargs):
-        #print(f"Injecting dependencies for {func.__name__}...")
         container = get_container()
-        sig = inspect.signature(func)
-        for name, param in sig.parameters.items():
-            if name in kwargs or name in sig.bind_partial(*args).arguments:
+        singletons = _built_singletons(container)
+        for name, position, service_name in plan:
+            if name in kwargs or (position is not None and position < len(args)):
                 continue  # Skip already provided arguments
-            if param.annotation != inspect._empty:
-                service_name = param.annotation.__name__
-                # print(f"Resolving {service_name} for {func.__name__}")
-                if service_name == "DIContainer":
-                    # If the parameter is of type DIContainer, pass the container itself
-                    kwargs[name] = container
-                else:
-                    dependency = await container.get(service_name)
-                    kwargs[name] = dependency
+            if service_name == "DIContainer":
+                # If the parameter is of type DIContainer, pass the container itself
+                kwargs[name] = container
+            else:
+                dependency = singletons.get(service_name, _MISSING)
+                kwargs[name] = await container.get(service_name) if dependency is _MISSING else dependency
         return await func(*args, **kwargs)
 
     @wraps(func)
     def sync_wrapper(*args, **kwargs):
         container = get_container()
-        sig = inspect.signature(func)
-        for name, param in sig.parameters.items():
-            if name in kwargs or name in sig.bind_partial(*args).arguments:
+        for name, position, service_name in plan:
+            if name in kwargs or (position is not None and position < len(args)):
                 continue  # Skip already provided arguments
-            if param.annotation != inspect._empty:
-                service_name = param.annotation.__name__
-                dependency = container.get_sync(service_name)  # Use sync retrieval for sync functions
-                kwargs[name] = dependency
+            kwargs[name] = container.get_sync(service_name)  # Use sync retrieval for sync functions
         return func(*args, **kwargs)
 
     if inspect.iscoroutinefunction(func):
@@ -1,5 +1,46 @@
+import asyncio
 import inspect
-from typing import Dict, Type, Any
+from contextvars import ContextVar
+from typing import Dict, Type, Any, Optional, Tuple
+
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+PRIMITIVE_TYPES = (str, int, float, bool)
+
+_MISSING = object()
+
+
+# Dispose of a scoped instance, if it has an aclose(); errors are logged, not raised
+async def _dispose(name: str, instance: Any):
+    aclose = getattr(instance, 'aclose', None)
+    if aclose is None:
+        return
+    try:
+        await aclose()
+    except Exception as e:
+        logger.error("Error disposing scoped service %s: %s", name, e)
+
+
+# Instances of the request-scoped services created during one request, in creation order
+class RequestScope:
+    __slots__ = ('instances', 'closed')
+
+    def __init__(self):
+        self.instances: Dict[str, Any] = {}
+        self.closed = False
+
+    # Dispose the instances in reverse creation order; a failing aclose() does not stop the others
+    async def aclose(self):
+        self.closed = True
+        instances, self.instances = self.instances, {}
+        for name, instance in reversed(list(instances.items())):
+            await _dispose(name, instance)
+
+
+# Request scope of the current context, set next to the current container for each request
+_current_scope: ContextVar[Optional[RequestScope]] = ContextVar("current_scope", default=None)
 
 
 class DIContainer:
@@ -17,52 +58,92 @@ class DIContainer:
         self._transient_classes: Dict[str, Type] = {}
         self._transient_instances: Dict[str, Any] = {}
         self._scoped_instances = {}
+        self._scoped_classes: Dict[str, Type] = {}
+        # Constructor resolution plan per class: ((service name or None, default), ...) in parameter order.
+        # Plans depend on what is registered, so every registration drops them.
+        self._plans: Dict[Type, Tuple[Tuple[Optional[str], Any], ...]] = {}
+        # Set by freeze(): every ready-made instance by name, and no more registrations
+        self._lookup: Dict[str, Any] = {}
+        self.frozen = False
+        # Singletons being built: name -> (future of the instance, task building it)
+        self._pending: Dict[str, Tuple[asyncio.Future, Optional[asyncio.Task]]] = {}
 
     # Reset the DI container state
     def reset(self):
+        self.frozen = False
+        self._lookup.clear()
         self._services.clear()
         self._singleton_instances.clear()
         self._scoped_instances.clear()
+        self._plans.clear()
 
     # Register a scoped service (shared within the same scope, e.g., within a request)
     def register_scope(self, class_type, scope, name=None):
+        self._ensure_not_frozen()
         name = name or class_type.__name__
         if scope not in self._scoped_instances:
             self._scoped_instances[scope] = {}
         self._scoped_instances[scope][name] = class_type
+        self._plans.clear()
 
     async def get_scoped(self, name, scope):
         if scope in self._scoped_instances and name in self._scoped_instances[scope]:
             return await self._create_instance(self._scoped_instances[scope][name])
         raise Exception(f"Scoped service {name} not found in scope {scope}")
 
+    # Register a request-scoped service: created on first use within a request, then shared until the request ends
+    def register_scoped_class(self, class_type: Type, name: str = None):
+        self._ensure_not_frozen()
+        name = name or class_type.__name__
+        self._scoped_classes[name] = class_type
+        self._plans.clear()
+
     def register_singleton_class(self, class_type: Type, name: str = None):
+        self._ensure_not_frozen()
         name = name or class_type.__name__
         self._singleton_classes[name] = class_type
+        self._plans.clear()
 
     def register_singleton_instance(self, instance: Any, name: str = None):
+        self._ensure_not_frozen()
         name = name or instance.__class__.__name__
         self._singleton_instances[name] = instance
+        self._plans.clear()
 
     def register_transient_class(self, class_type: Type, name: str = None):
+        self._ensure_not_frozen()
         name = name or class_type.__name__
         self._transient_classes[name] = class_type
+        self._plans.clear()
 
     def register_transient_instance(self, instance: Any, name: str = None):
+        self._ensure_not_frozen()
         name = name or instance.__class__.__name__
         self._transient_instances[name] = instance
+        self._plans.clear()
+
+    def _ensure_not_frozen(self):
+        if self.frozen:
+            raise RuntimeError("Cannot register services on a frozen DIContainer")
 
     # Enhanced get method to support constructor injection (auto-wiring)
     async def get(self, name):
+        if self.frozen:
+            instance = self._lookup.get(name, _MISSING)
+            if instance is not _MISSING:
+                return instance
+
         # Check if it's a singleton instance
         if name in self._singleton_instances:
             return self._singleton_instances[name]
 
         # Check if it's a singleton class to instantiate
         if name in self._singleton_classes:
-            instance = await self._create_instance(self._singleton_classes[name])
-            self._singleton_instances[name] = instance
-            return instance
+            return await self._create_singleton(name)
+
+        # Check if it's a request-scoped class
+        if name in self._scoped_classes:
+            return await self._get_scoped_instance(name)
 
         # Check if it's a transient class
         if name in self._transient_classes:
@@ -73,57 +154,166 @@ class DIContainer:
         if name in self._transient_instances:
             return self._transient_instances[name]
 
-        # Check if it's a scoped service
-        # (Implement scoped retrieval if needed)
-
         raise Exception(f"Service {name} not found")
 
+    # Single-flight construction: concurrent first requests for a singleton await the same build
+    # instead of each creating their own instance (and their own pools or clients)
+    async def _create_singleton(self, name):
+        pending = self._pending.get(name)
+        if pending is not None:
+            future, builder = pending
+            if builder is not None and builder is asyncio.current_task():
+                raise Exception(f"Circular dependency while building singleton {name}")
+            # Shielded so that a cancelled waiter does not cancel the build for everyone else
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[name] = (future, asyncio.current_task())
+        try:
+            instance = await self._create_instance(self._singleton_classes[name])
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                future.exception()  # Waiters get the error; do not log it as never retrieved
+            raise
+        finally:
+            del self._pending[name]
+        self._singleton_instances[name] = instance
+        future.set_result(instance)
+        return instance
+
+    # Outside of a request (startup, scripts, tests) a scoped service behaves like a transient one
+    async def _get_scoped_instance(self, name):
+        scope = _current_scope.get()
+        if scope is None or scope.closed:
+            return await self._create_instance(self._scoped_classes[name])
+        instance = scope.instances.get(name)
+        if instance is None:
+            created = await self._create_instance(self._scoped_classes[name])
+            # Another get() may have created it while the dependencies were awaited: keep theirs, dispose of ours
+            instance = scope.instances.setdefault(name, created)
+            if instance is not created:
+                await _dispose(name, created)
+        return instance
+
     # Synchronous get method to retrieve already instantiated services
     def get_sync(self, name):
         if name in self._singleton_instances:
             return self._singleton_instances[name]
         if name in self._transient_instances:
             return self._transient_instances[name]
+        scope = _current_scope.get()
+        if scope is not None and name in scope.instances:
+            return scope.instances[name]
         raise Exception(f"Service {name} not found or requires async initialization")
 
+    # Hot-path lookup on a frozen container: a plain dict hit for every singleton and registered instance.
+    # Services that are built per call or per request still need get().
+    def get_nowait(self, name):
+        if not self.frozen:
+            raise RuntimeError("get_nowait() requires a frozen DIContainer; call freeze() after setup")
+        instance = self._lookup.get(name, _MISSING)
+        if instance is _MISSING:
+            raise Exception(f"Service {name} not found or requires async resolution")
+        return instance
+
+    # Finish the setup: validate the dependency graph, build every singleton up front, merge the ready-made
+    # instances into one lookup table and refuse further registrations
+    async def freeze(self):
+        if self.frozen:
+            return
+        self.validate()
+        for name in self._singleton_classes:
+            await self.get(name)
+        # Same precedence as get(): singleton instances first, transient instances only when no class shadows them
+        lookup = {name: instance for name, instance in self._transient_instances.items()
+                  if name not in self._scoped_classes and name not in self._transient_classes}
+        lookup.update(self._singleton_instances)
+        self._lookup = lookup
+        self.frozen = True
+
+    # Check that every registered class can be built: all its dependencies are registered, there are no
+    # cycles, and no singleton captures a request-scoped service
+    def validate(self):
+        registered = (set(self._singleton_instances) | set(self._singleton_classes) | set(self._transient_classes)
+                      | set(self._transient_instances) | set(self._scoped_classes) | set(self._services))
+        classes = {**self._transient_classes, **self._scoped_classes, **self._singleton_classes}
+        dependencies = {}
+        for name, class_type in classes.items():
+            plan = self._plans.get(class_type)
+            if plan is None:
+                plan = self._plans[class_type] = self._build_plan(class_type)
+            dependencies[name] = [service_name for service_name, _ in plan if service_name is not None]
+            for service_name in dependencies[name]:
+                if service_name not in registered:
+                    raise Exception(f"Cannot resolve dependency '{service_name}' for class {class_type.__name__}")
+                if name in self._singleton_classes and service_name in self._scoped_classes \
+                        and service_name not in self._singleton_instances:
+                    raise Exception(f"Singleton {name} cannot depend on request-scoped service {service_name}")
+
+        # Depth-first search for cycles; instances have no dependencies to follow
+        done = set()
+        for root in dependencies:
+            if root in done:
+                continue
+            path, visiting, stack = [root], {root}, [(root, iter(dependencies[root]))]
+            while stack:
+                name, remaining = stack[-1]
+                child = next(remaining, None)
+                if child is None:
+                    stack.pop()
+                    path.pop()
+                    visiting.discard(name)
+                    done.add(name)
+                elif child in visiting:
+                    cycle = path[path.index(child):] + [child]
+                    raise Exception(f"Circular dependency: {' -> '.join(cycle)}")
+                elif child not in done and child in dependencies:
+                    visiting.add(child)
+                    path.append(child)
+                    stack.append((child, iter(dependencies[child])))
+
     async def _create_instance(self, class_type: Type):
-        constructor = inspect.signature(class_type.__init__)
+        plan = self._plans.get(class_type)
+        if plan is None:
+            plan = self._plans[class_type] = self._build_plan(class_type)
         dependencies = []
+        for service_name, default in plan:
+            dependencies.append(default if service_name is None else await self.get(service_name))
+        return class_type(*dependencies)
+
+    # Inspect the constructor once and decide, per parameter, which service to inject or which default to pass
+    def _build_plan(self, class_type: Type) -> Tuple[Tuple[Optional[str], Any], ...]:
+        constructor = inspect.signature(class_type.__init__)
+        plan = []
 
         for param in list(constructor.parameters.values())[1:]:
+            if param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+                continue
             param_type = param.annotation
             param_name = param.name
 
             if param_type == inspect._empty:
                 # Attempt to resolve by parameter name
-                if param_name in self._singleton_classes or param_name in self._services:
-                    dependency = await self.get(param_name)
-                    dependencies.append(dependency)
-                elif param_name in self._transient_classes:
-                    dependency = await self.get(param_name)
-                    dependencies.append(dependency)
-                elif param_name in self._transient_instances:
-                    dependency = await self.get(param_name)
-                    dependencies.append(dependency)
-                elif param_name in self._singleton_instances:
-                    dependency = await self.get(param_name)
-                    dependencies.append(dependency)
+                if (param_name in self._singleton_classes or param_name in self._services
+                        or param_name in self._transient_classes or param_name in self._transient_instances
+                        or param_name in self._singleton_instances or param_name in self._scoped_classes):
+                    plan.append((param_name, None))
                 elif param.default != param.empty:
-                    dependencies.append(param.default)
+                    plan.append((None, param.default))
                 else:
                     raise Exception(f"Cannot resolve dependency '{param_name}' for class {class_type.__name__}")
-            elif param_type in [str, int, float, bool]:
+            elif param_type in PRIMITIVE_TYPES:
                 if param.default != param.empty:
-                    dependencies.append(param.default)
+                    plan.append((None, param.default))
                 else:
                     raise Exception(f"Cannot resolve primitive type dependency '{param_name}' for class {class_type.__name__}")
             else:
-                dependency_name = param_type.__name__
-                dependency = await self.get(dependency_name)
-                dependencies.append(dependency)
-
-        instance = class_type(*dependencies)
-        return instance
+                # String annotations (forward references) name the service directly
+                plan.append((param_type if isinstance(param_type, str) else param_type.__name__, None))
 
+        return tuple(plan)
 
 di_container = DIContainer()
@@ -1,43 +1,63 @@
-from datetime import datetime, timezone
-from typing import List, Callable
+import time
 
+from collections import OrderedDict
+from typing import Callable, Optional, Sequence, Union
+
+from src.core.scheduling import ROUND_ROBIN, ServiceStats, Strategy, create_strategy
 from src.services.config_service import ConfigService
 
 config = ConfigService()
 
 
 class Distributor:
-    def __init__(self, services: List[Callable]):
-        self.services = services
-        self.current_index = 0
-        self.handled_events = {}
+    # dedup_by_content treats events with the same name and data as duplicates (Event.content_hash)
+    # instead of relying on the event id; their data must then be JSON-serializable.
+    # max_handled caps the number of remembered event ids; the oldest are forgotten first.
+    # strategy picks which service is offered an event first: 'round_robin', 'least_outstanding',
+    # 'weighted_round_robin' (with weights) or 'ewma_p2c', or a Strategy instance.
+    # max_concurrency limits the calls running on each service; further callers wait for a slot.
+    # The services are fixed at construction (a tuple), as each one has its stats at the same index.
+    def __init__(self, services: Sequence[Callable], dedup_by_content: bool = False, max_handled: Optional[int] = None,
+                 strategy: Union[str, Strategy] = ROUND_ROBIN, weights: Optional[Sequence[int]] = None,
+                 max_concurrency: Optional[int] = None):
+        self.services = tuple(services)
+        self.dedup_by_content = dedup_by_content
+        self.strategy = create_strategy(strategy, weights) if isinstance(strategy, str) else strategy
+        self.service_stats = tuple(ServiceStats(max_concurrency) for _ in self.services)
+        self.max_handled = max_handled or config.get("DEDUP_MAX_EVENTS")
+        # Event id -> time it was handled (epoch seconds). Insertion order is handling order, so the
+        # entries that expire first, or get evicted first, are always at the front.
+        self.handled_events: OrderedDict = OrderedDict()
         self.event_lifetime = config.get("PRUNE_INTERVAL")
 
     async def distribute(self, event) -> bool:
         self.prune_old_events()  # Prune old events
 
-        event_id = hash(event)  # Define a way to uniquely identify events
-        if event_id in self.handled_events and self.handled_events[event_id]:
+        event_id = event.content_hash() if self.dedup_by_content else event.id
+        if event_id in self.handled_events:
             return True  # Event already handled
 
-        for _ in range(len(self.services)):
-            service = self.services[self.current_index]
-            self.current_index = (self.current_index + 1) % len(self.services)
-
-            event.handled = await service(event)
+        if not self.services:
+            return event.handled
+        for index in self.strategy.order(self.service_stats):
+            event.handled = await self.service_stats[index].call(self.services[index], event)
             if event.handled:
-                self.handled_events[event_id] = event
+                self._remember(event_id)
                 break  # Early exit as soon as a service handles the event
 
         return event.handled
 
-    def prune_old_events(self):
-        now = datetime.now(timezone.utc)
-        keys_to_delete = []
+    def _remember(self, event_id):
+        self.handled_events[event_id] = time.time()
+        if len(self.handled_events) > self.max_handled:
+            self.handled_events.popitem(last=False)
 
-        for event_id, event in self.handled_events.items():
-            if event and now - event.timestamp > self.event_lifetime:
-                keys_to_delete.append(event_id)
-
-        for event_id in keys_to_delete:
-            del self.handled_events[event_id]
+    # Drop expired ids from the front of the handling order; stops at the first one still alive,
+    # so the cost is proportional to the number of ids removed (amortized O(1) per event).
+    def prune_old_events(self):
+        handled = self.handled_events
+        if not handled:
+            return
+        cutoff = time.time() - self.event_lifetime.total_seconds()
+        while handled and next(iter(handled.values())) <= cutoff:
+            handled.popitem(last=False)
@@ -1,72 +1,411 @@
 import asyncio
 import hashlib
+import itertools
 import json
+import os
+import time
 
 from datetime import datetime, timezone
-from typing import Callable, Dict, List, Union, Awaitable, Any, Coroutine
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union, Awaitable, Any, Coroutine
+
+from src.core.event_metrics import EventBusMetrics, ListenerStats, TopicStats, listener_label
+from src.core.event_queue import BackgroundEventQueue, BLOCK, DEFAULT_DRAIN_TIMEOUT
+from src.core.logger import get_logger
+from src.core.topic_trie import TopicTrie, is_pattern
+
+logger = get_logger(__name__)
+
+# Listener latency is timed on one publish in this many, per event name (see EventBus.configure_metrics)
+DEFAULT_SAMPLE_EVERY = 16
+
+# Event ids are '<worker prefix>-<counter>': unique across the worker processes of a deployment
+# and monotonic within each one. The prefix defaults to the process id (hex).
+_worker_prefix = os.getenv('EVENT_WORKER_ID') or f"{os.getpid():x}"
+_event_counter = itertools.count(1)
+
+
+def _reset_event_ids():
+    # A forked worker must not reuse its parent's prefix and counter
+    global _worker_prefix, _event_counter
+    _worker_prefix = os.getenv('EVENT_WORKER_ID') or f"{os.getpid():x}"
+    _event_counter = itertools.count(1)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_event_ids)
 
 
 class Event:
-    def __init__(self, name: str, data: Dict = None):
+    __slots__ = ('name', 'data', 'id', 'handled', '_created', '_timestamp')
+
+    def __init__(self, name: str, data: Dict = None, event_id: Optional[str] = None):
         self.name = name
         self.data = data or {}
-        self.timestamp = datetime.now(timezone.utc)
+        # An explicit id keeps an event's identity when it is rebuilt elsewhere (spill file, other process)
+        self.id = event_id or f"{_worker_prefix}-{next(_event_counter)}"
+        self.handled = False
+        self._created = time.time()
+        self._timestamp = None
+
+    # Creation time as an aware datetime, only built when somebody asks for it
+    @property
+    def timestamp(self) -> datetime:
+        if self._timestamp is None:
+            self._timestamp = datetime.fromtimestamp(self._created, timezone.utc)
+        return self._timestamp
+
+    # Creation time in epoch seconds, without building a datetime
+    @property
+    def created(self) -> float:
+        return self._created
+
+    @timestamp.setter
+    def timestamp(self, value: datetime):
+        self._timestamp = value
+        self._created = value.timestamp()
 
     def __hash__(self):
-        # Convert the event's data to a JSON string and hash it with its name
+        return hash(self.id)
+
+    def __eq__(self, other):
+        if not isinstance(other, Event):
+            return NotImplemented
+        return self.id == other.id
+
+    def __repr__(self):
+        return f"Event(name={self.name!r}, id={self.id!r})"
+
+    # Hash of the event's name and data, for the few cases that need content-based deduplication
+    # (the same payload published twice). Only works for JSON-serializable data.
+    def content_hash(self) -> str:
         event_data_str = json.dumps(self.data, sort_keys=True)
-        event_id_str = f"{self.name}:{self.timestamp.isoformat()}:{event_data_str}"
-        return int(hashlib.sha256(event_id_str.encode('utf-8')).hexdigest(), 16)
+        return hashlib.sha256(f"{self.name}:{event_data_str}".encode('utf-8')).hexdigest()
 
 
 Listener = Union[Callable[[Event], None], Callable[[Event], Awaitable[None]], Coroutine[Any, Any, None]]
 
 
+# A listener as registered with EventBus.subscribe, together with its dispatch options
+class Subscription:
+    __slots__ = ('listener', 'call', 'is_async', 'concurrent', 'timeout', 'seq', 'label')
+
+    def __init__(self, listener: Listener, concurrent: bool = False, timeout: Optional[float] = None, seq: int = 0):
+        self.listener = listener
+        self.seq = seq  # Subscription order, kept across exact and wildcard subscriptions
+        self.label = listener_label(listener)  # Name under which the listener's metrics are reported
+        self.concurrent = concurrent
+        self.timeout = timeout
+        # Classify the listener once, at subscription time, instead of on every publish
+        if asyncio.iscoroutinefunction(listener):
+            self.call, self.is_async = listener, True
+        elif asyncio.iscoroutine(listener):
+            # An already created coroutine object: awaited as-is when the event is published
+            self.call, self.is_async = (lambda event: listener), True
+        else:
+            self.call, self.is_async = listener, False
+
+
+# The listeners of one topic in EventBus.listeners. Changing the list in place (remove, append, insert, ...)
+# goes back to the bus, which updates the subscriptions and drops the precompiled dispatch of the topic.
+class TopicListeners(list):
+    __slots__ = ('_bus', '_topic')
+
+    def __init__(self, bus: 'EventBus', topic: str):
+        super().__init__()
+        self._bus = bus
+        self._topic = topic
+
+    def _changed(self):
+        self._bus._sync_topic(self._topic)
+
+    def append(self, listener):
+        super().append(listener)
+        self._changed()
+
+    def extend(self, listeners):
+        super().extend(listeners)
+        self._changed()
+
+    def insert(self, index, listener):
+        super().insert(index, listener)
+        self._changed()
+
+    def remove(self, listener):
+        super().remove(listener)
+        self._changed()
+
+    def pop(self, index=-1):
+        listener = super().pop(index)
+        self._changed()
+        return listener
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._changed()
+
+    def reverse(self):
+        super().reverse()
+        self._changed()
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._changed()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._changed()
+
+    def __iadd__(self, listeners):
+        super().__iadd__(listeners)
+        self._changed()
+        return self
+
+
 class EventBus:
     def __init__(self):
-        self.listeners: Dict[str, List[Listener]] = {}
+        # Listeners per subscribed topic, which is an event name or a wildcard pattern ('http.error.*', 'user.#').
+        # Each list may be changed in place (e.g. listeners[topic].remove(listener)) as well as through
+        # subscribe/unsubscribe.
+        self.listeners: Dict[str, TopicListeners] = {}
+        self._subscriptions: Dict[str, List[Subscription]] = {}
+        self._topics = TopicTrie()
+        self._seq = itertools.count()
+        # Ready-to-call (ordered, concurrent) dispatch records per concrete event name, resolved against the
+        # topic trie on first publish and dropped only when subscriptions change
+        self._dispatch: Dict[str, Tuple[tuple, tuple]] = {}
+        # Topics whose events are always handed to the background queue instead of running inline
+        self._deferred: Set[str] = set()
+        self.background = BackgroundEventQueue(self._run_listeners, Event)
+        self.metrics = EventBusMetrics()
+        self.metrics_enabled = True
+        self._sample_every = self.metrics.sample_every = DEFAULT_SAMPLE_EVERY
+        # Optional cross-process transport (RedisEventTransport), set by its start()
+        self.transport = None
+
+    # Configure the background queue used by publish_background() and deferred topics.
+    # policy is one of 'block', 'drop_oldest', 'drop_new' or 'spill' (which needs spill_path).
+    def configure_background(self, max_size: int = 1000, workers: int = 2, policy: str = BLOCK,
+                             spill_path: Optional[str] = None, drain_timeout: Optional[float] = DEFAULT_DRAIN_TIMEOUT):
+        if self.background.running:
+            raise RuntimeError("Cannot reconfigure the background queue while its workers are running")
+        self.background = BackgroundEventQueue(self._run_listeners, Event, max_size=max_size, workers=workers,
+                                               policy=policy, spill_path=spill_path, drain_timeout=drain_timeout)
 
-    def subscribe(self, event_name: str, listener: Listener):
+    # Turn the metrics on or off and choose how often listener latency is timed. Calls, errors, publishes and
+    # fallbacks are always counted when the metrics are on; timing every call (sample_every=1) roughly doubles
+    # the cost of a publish. With the metrics off, the dispatch records carry no stats and publish is a plain loop.
+    def configure_metrics(self, enabled: bool = True, sample_every: int = DEFAULT_SAMPLE_EVERY):
+        if sample_every < 1:
+            raise ValueError("sample_every must be at least 1")
+        self.metrics_enabled = enabled
+        self._sample_every = self.metrics.sample_every = sample_every
+        self._dispatch.clear()
+
+    # Mark a topic as deferred: publish() enqueues its events for the background workers,
+    # so slow listeners (e.g. a DB insert) stay off the request path.
+    def set_deferred(self, event_name: str, deferred: bool = True):
+        if deferred:
+            self._deferred.add(event_name)
+        else:
+            self._deferred.discard(event_name)
+
+    # Listeners run one after another in subscription order, and may stop the chain by setting
+    # 'response_already_sent'. Listeners subscribed with concurrent=True are independent bookkeeping
+    # (logging, timing, ...) and run together once the ordered listeners are done.
+    # A timeout (in seconds) cancels a listener that takes too long; it does not stop the others.
+    # event_name may use wildcard segments: '*' matches one segment and '#' zero or more,
+    # e.g. 'http.error.*' or 'user.#'. Listeners of all matching topics run in subscription order.
+    def subscribe(self, event_name: str, listener: Listener, concurrent: bool = False, timeout: Optional[float] = None):
         if event_name not in self.listeners:
-            self.listeners[event_name] = []
-        self.listeners[event_name].append(listener)
+            self.listeners[event_name] = TopicListeners(self, event_name)
+            self._subscriptions[event_name] = []
+        self._topics.add(event_name)
+        # The plain list method: the subscription is added here, with its options
+        list.append(self.listeners[event_name], listener)
+        self._subscriptions[event_name].append(
+            Subscription(listener, concurrent=concurrent, timeout=timeout, seq=next(self._seq)))
+        self._invalidate_dispatch(event_name)
+
+    def unsubscribe(self, event_name: str, listener: Listener):
+        listeners = self.listeners.get(event_name)
+        if listeners and listener in listeners:
+            listeners.remove(listener)
+
+    # Bring the subscriptions of a topic in line with its listeners list after the list was changed in place.
+    # Listeners still in the list keep their subscription (and its options); new ones get the default options.
+    # A topic left without listeners keeps its (empty) list, which may be added to again, but leaves the trie.
+    def _sync_topic(self, topic: str):
+        listeners = self.listeners[topic]
+        remaining = list(self._subscriptions[topic])
+        subscriptions = []
+        for listener in listeners:
+            for index, sub in enumerate(remaining):
+                if sub.listener == listener:
+                    subscriptions.append(remaining.pop(index))
+                    break
+            else:
+                subscriptions.append(Subscription(listener, seq=next(self._seq)))
+        self._subscriptions[topic] = subscriptions
+        if subscriptions:
+            self._topics.add(topic)
+        else:
+            self._topics.remove(topic)
+        self._invalidate_dispatch(topic)
+
+    def _invalidate_dispatch(self, topic: str):
+        if is_pattern(topic):
+            # A pattern can affect any number of event names
+            self._dispatch.clear()
+        else:
+            self._dispatch.pop(topic, None)
+
+    # Merge the subscriptions of every topic matching the event name and cache the result.
+    # Each record carries the listener's stats for this event name (None with the metrics off), so publishing
+    # never looks them up.
+    def _resolve_dispatch(self, event_name: str) -> Tuple[tuple, tuple, Optional[TopicStats]]:
+        topics = self._topics.match(event_name)
+        if len(topics) == 1:
+            subscriptions = self._subscriptions[topics[0]]
+        else:
+            subscriptions = sorted((sub for topic in topics for sub in self._subscriptions[topic]),
+                                   key=lambda sub: sub.seq)
+        enabled = self.metrics_enabled
+        records = [(sub.call, sub.is_async, sub.timeout, self.metrics.listener(event_name, sub.label) if enabled else None,
+                    sub.concurrent)
+                   for sub in subscriptions]
+        ordered = tuple(record[:4] for record in records if not record[4])
+        concurrent = tuple(record[:4] for record in records if record[4])
+        topic_stats = self.metrics.topic(event_name) if enabled else None
+        dispatch = self._dispatch[event_name] = (ordered, concurrent, topic_stats)
+        return dispatch
 
     async def publish(self, event: Event):
+        transport = self.transport
+        if transport is not None and transport.mirrors(event.name):
+            transport.send(event)
+        await self.publish_local(event)
+
+    # Publish to this process's listeners only (used for events received from other workers)
+    async def publish_local(self, event: Event):
+        if event.name in self._deferred:
+            await self.background.put(event)
+            return
+        await self._run_listeners(event)
+
+    # Hand the event to the background workers and return immediately (subject to the queue policy).
+    # Returns False if the event was dropped because the queue is full.
+    async def publish_background(self, event: Event) -> bool:
+        return await self.background.put(event)
+
+    # Wait until all queued events have been processed, then stop the background workers. Waits at most
+    # timeout seconds, by default the queue's drain_timeout, so that a hung listener cannot block the shutdown.
+    async def drain(self, timeout: Optional[float] = None):
+        await self.background.drain(self.background.drain_timeout if timeout is None else timeout)
+
+    def queue_stats(self) -> Dict[str, Any]:
+        return self.background.stats()
+
+    # Per event name: publish and unhandled counts, and per listener: calls, errors, timeouts
+    # and a latency histogram (bucket bounds in 'latency_buckets')
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        return self.metrics.snapshot()
+
+    async def _run_listeners(self, event: Event):
         handled = False
-        if event.name in self.listeners:
-            for listener in self.listeners[event.name]:
-                if event.data.get('response_already_sent', False):
-                    break  # Stop processing further listeners
-                try:
-                    if asyncio.iscoroutinefunction(listener):
-                        await listener(event)  # Await the coroutine function
-                        handled = True
-                    elif asyncio.iscoroutine(listener):
-                        await listener  # Await if it's already a coroutine object
-                        handled = True
-                    else:
-                        listener(event)  # Synchronous function call
-                        handled = True
-                except Exception as e:
-                    if "websocket.close" in str(e):
-                        # Gracefully handle WebSocket closure errors
-                        print(f"WebSocket already closed for event '{event.name}': {e}")
-                    else:
-                        print(f"Error in listener for event '{event.name}': {e}")
+        dispatch = self._dispatch.get(event.name)
+        if dispatch is None:
+            dispatch = self._resolve_dispatch(event.name)
+        ordered, concurrent, topic_stats = dispatch
+        timed = False
+        if topic_stats is not None:
+            # The listeners' latency is timed for one publish of the event name in sample_every
+            timed = topic_stats.published % self._sample_every == 0
+            topic_stats.published += 1
+        data = event.data
+        for listener, is_async, timeout, stats in ordered:
+            if data.get('response_already_sent', False):
+                break  # Stop processing further listeners
+            if stats is not None:
+                stats.calls += 1
+            if timed:
+                start = perf_counter()
+            try:
+                if not is_async:
+                    listener(event)  # Synchronous function call
+                elif timeout is None:
+                    await listener(event)
+                else:
+                    async with asyncio.timeout(timeout):
+                        await listener(event)
+                handled = True
+            except Exception as e:
+                self._report_listener_error(event, listener, e, stats)
+            if timed:
+                stats.observe(perf_counter() - start)
+        if concurrent and not data.get('response_already_sent', False):
+            if await self._fan_out(event, concurrent, timed):
+                handled = True
         if not handled:
+            if topic_stats is not None:
+                topic_stats.unhandled += 1
             await self.handle_unhandled_event(event)  # Call the fallback if not handled
 
+    # Run independent listeners together. Each one is isolated: an error or a timeout
+    # is reported without cancelling its siblings.
+    async def _fan_out(self, event: Event, records: tuple, timed: bool = False) -> bool:
+        async def run(listener, is_async, timeout, stats) -> bool:
+            if stats is not None:
+                stats.calls += 1
+            start = perf_counter() if timed else None
+            try:
+                if not is_async:
+                    listener(event)
+                elif timeout is None:
+                    await listener(event)
+                else:
+                    async with asyncio.timeout(timeout):
+                        await listener(event)
+                return True
+            except Exception as e:
+                self._report_listener_error(event, listener, e, stats)
+                return False
+            finally:
+                if start is not None:
+                    stats.observe(perf_counter() - start)
+
+        async with asyncio.TaskGroup() as task_group:
+            tasks = [task_group.create_task(run(*record)) for record in records]
+        return any(task.result() for task in tasks)
+
+    def _report_listener_error(self, event: Event, listener: Callable, error: Exception, stats: Optional[ListenerStats]):
+        if stats is not None:
+            stats.errors += 1
+        if isinstance(error, TimeoutError):
+            if stats is not None:
+                stats.timeouts += 1
+            logger.warning("Listener %s timed out for event '%s'", getattr(listener, '__name__', listener), event.name)
+        elif "websocket.close" in str(error):
+            # Gracefully handle WebSocket closure errors
+            logger.debug("WebSocket already closed for event '%s': %s", event.name, error)
+        else:
+            logger.error("Error in listener for event '%s': %s", event.name, error)
+
     async def handle_unhandled_event(self, event):
         # Default behavior for unhandled events
-        print(f"Event '{event.name}' was not handled. Triggering fallback.")
+        logger.warning("Event '%s' was not handled. Triggering fallback.", event.name)
         if 'send' in event.data:
             if 'scope' in event.data and event.data['scope']['type'] == 'websocket':
-                print("Cannot send HTTP response for WebSocket event")
+                logger.debug("Cannot send HTTP response for WebSocket event")
                 return  # Skip sending HTTP response for WebSocket events
 
             # Check if a response has already been sent
             if event.data.get('response_already_sent', False):
-                print("Response already sent, skipping fallback response.")
+                logger.debug("Response already sent, skipping fallback response.")
                 return
 
             # Mark the response as sent to prevent duplicate responses
@@ -84,4 +423,4 @@ class EventBus:
                     'body': b'Internal Server Error - Event not handled',
                 })
             except Exception as e:
-                print(f"Error sending fallback response: {e}")
+                logger.error("Error sending fallback response: %s", e)
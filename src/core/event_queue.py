@@ -0,0 +1,194 @@
+import asyncio
+import json
+import os
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# What to do with a new event when the queue is full
+BLOCK = 'block'              # Wait for room: the publisher is slowed down (backpressure)
+DROP_OLDEST = 'drop_oldest'  # Discard the oldest queued event to make room
+DROP_NEW = 'drop_new'        # Discard the new event
+SPILL = 'spill'              # Append the event to a file on disk, re-queued once there is room
+
+POLICIES = (BLOCK, DROP_OLDEST, DROP_NEW, SPILL)
+
+# Seconds EventBus.drain() (and so the lifespan shutdown) waits for the pending events before abandoning them
+DEFAULT_DRAIN_TIMEOUT = 10.0
+
+
+# Bounded queue of events processed off the request path by a pool of worker tasks.
+# The handler is the coroutine that runs an event's listeners (EventBus._run_listeners).
+class BackgroundEventQueue:
+    def __init__(self, handler: Callable[[Any], Awaitable[None]], event_factory: Callable[[str, Dict, Optional[str]], Any],
+                 max_size: int = 1000, workers: int = 2, policy: str = BLOCK, spill_path: Optional[str] = None,
+                 drain_timeout: Optional[float] = DEFAULT_DRAIN_TIMEOUT):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown queue policy '{policy}', expected one of {POLICIES}")
+        if policy == SPILL and not spill_path:
+            raise ValueError("The 'spill' policy requires a spill_path")
+        self.handler = handler
+        self.event_factory = event_factory
+        self.max_size = max_size
+        self.worker_count = workers
+        self.policy = policy
+        self.spill_path = spill_path
+        self.drain_timeout = drain_timeout  # None waits for as long as the listeners take
+        self.queue: Optional[asyncio.Queue] = None
+        self._workers: Set[asyncio.Task] = set()
+        self._handling: Dict[asyncio.Task, Any] = {}  # Worker -> event its handler is running
+        self._spilled_pending = 0
+        self._spill_lock: Optional[asyncio.Lock] = None
+        # Counters
+        self.enqueued = 0
+        self.processed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.abandoned = 0
+
+    @property
+    def depth(self) -> int:
+        return self.queue.qsize() if self.queue else 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    # Workers are started on demand, up to the configured pool size, and exit once the queue is empty,
+    # so an idle queue holds no tasks.
+    def _ensure_workers(self):
+        if self.queue is None:
+            self.queue = asyncio.Queue(maxsize=self.max_size)
+            self._spill_lock = asyncio.Lock()
+        # A worker that has just returned on an empty queue stays in the set until its done-callback runs,
+        # so only the live ones count towards the pool size
+        live = sum(1 for worker in self._workers if not worker.done())
+        if live < self.worker_count:
+            worker = asyncio.create_task(self._worker())
+            self._workers.add(worker)
+            worker.add_done_callback(self._workers.discard)
+
+    # Enqueue an event, applying the configured policy when the queue is full.
+    # Returns False if the event was dropped.
+    async def put(self, event) -> bool:
+        self._ensure_workers()
+        queue = self.queue
+        if not queue.full():
+            queue.put_nowait(event)
+        elif self.policy == BLOCK:
+            await queue.put(event)
+        elif self.policy == DROP_OLDEST:
+            queue.get_nowait()
+            queue.task_done()
+            self.dropped += 1
+            queue.put_nowait(event)
+        elif self.policy == DROP_NEW:
+            self.dropped += 1
+            return False
+        else:
+            return await self._spill(event)
+        self.enqueued += 1
+        return True
+
+    async def _worker(self):
+        queue = self.queue
+        while True:
+            if queue.empty():
+                if not self._spilled_pending:
+                    return
+                await self._reload_spilled()
+                continue
+            event = queue.get_nowait()
+            worker = asyncio.current_task()
+            self._handling[worker] = event
+            try:
+                await self.handler(event)
+                self.processed += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error("Error processing background event '%s': %s", getattr(event, 'name', event), e)
+            finally:
+                self._handling.pop(worker, None)
+                queue.task_done()
+
+    async def _spill(self, event) -> bool:
+        try:
+            line = json.dumps({'id': event.id, 'name': event.name, 'data': event.data})
+        except (TypeError, ValueError):
+            # Events carrying live objects (send, request, ...) cannot be written to disk
+            self.dropped += 1
+            return False
+        async with self._spill_lock:
+            with open(self.spill_path, 'a') as f:
+                f.write(line + '\n')
+            self._spilled_pending += 1
+        self.spilled += 1
+        return True
+
+    # Move spilled events back into the queue, keeping on disk whatever still does not fit
+    async def _reload_spilled(self):
+        async with self._spill_lock:
+            if not self._spilled_pending or not os.path.exists(self.spill_path):
+                self._spilled_pending = 0
+                return
+            with open(self.spill_path) as f:
+                lines = f.readlines()
+            remaining = []
+            for line in lines:
+                if self.queue.full():
+                    remaining.append(line)
+                    continue
+                record = json.loads(line)
+                self.queue.put_nowait(self.event_factory(record['name'], record['data'], record.get('id')))
+                self.enqueued += 1
+            if remaining:
+                with open(self.spill_path, 'w') as f:
+                    f.writelines(remaining)
+            else:
+                os.remove(self.spill_path)
+            self._spilled_pending = len(remaining)
+
+    # Wait until everything still pending (including spilled events) has been processed. On timeout the workers
+    # are cancelled, and the events they were handling and those still queued are abandoned (spilled ones stay
+    # on disk).
+    async def drain(self, timeout: Optional[float] = None):
+        if self.queue is None:
+            return
+        try:
+            async with asyncio.timeout(timeout):
+                while self.queue.qsize() or self._spilled_pending:
+                    self._ensure_workers()
+                    await self.queue.join()
+                    if self._spilled_pending:
+                        await self._reload_spilled()
+                # Events already taken off the queue are still being handled
+                await asyncio.gather(*self._workers, return_exceptions=True)
+        except TimeoutError:
+            abandoned = [getattr(event, 'name', event) for event in self._handling.values()]
+            for worker in list(self._workers):
+                worker.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            while not self.queue.empty():
+                abandoned.append(getattr(self.queue.get_nowait(), 'name', None))
+                self.queue.task_done()
+            self.abandoned += len(abandoned)
+            logger.warning("Background event queue drain timed out after %ss, abandoning %d events: %s",
+                           timeout, len(abandoned), ', '.join(map(str, abandoned)))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'depth': self.depth,
+            'max_size': self.max_size,
+            'workers': len(self._workers),
+            'policy': self.policy,
+            'enqueued': self.enqueued,
+            'processed': self.processed,
+            'failed': self.failed,
+            'dropped': self.dropped,
+            'spilled': self.spilled,
+            'abandoned': self.abandoned,
+            'spilled_pending': self._spilled_pending,
+        }
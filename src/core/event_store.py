@@ -0,0 +1,269 @@
+import asyncio
+import json
+import mmap
+import os
+import struct
+import zlib
+
+from bisect import bisect_right
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Record layout: payload length and CRC32, then the payload (compact JSON: [event id, name, data, created])
+RECORD_HEADER = struct.Struct('<II')
+# Sparse index entry: record number within the segment and byte position of that record
+INDEX_ENTRY = struct.Struct('<II')
+
+SEGMENT_SUFFIX = '.log'
+INDEX_SUFFIX = '.index'
+
+
+class StoredEvent(NamedTuple):
+    offset: int
+    id: str
+    name: str
+    data: Dict[str, Any]
+    created: float  # Epoch seconds
+
+
+class CorruptRecordError(Exception):
+    pass
+
+
+class _Segment:
+    __slots__ = ('base', 'path', 'index_path', 'count', 'size', 'index')
+
+    def __init__(self, directory: str, base: int):
+        self.base = base  # Offset of the segment's first record
+        self.path = os.path.join(directory, f"{base:020d}{SEGMENT_SUFFIX}")
+        self.index_path = os.path.join(directory, f"{base:020d}{INDEX_SUFFIX}")
+        self.count = 0
+        self.size = 0
+        self.index: List[Tuple[int, int]] = []  # (record number, byte position), ascending
+
+    def load_index(self):
+        self.index = []
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'rb') as f:
+                raw = f.read()
+            usable = len(raw) - len(raw) % INDEX_ENTRY.size
+            self.index = [INDEX_ENTRY.unpack_from(raw, position) for position in range(0, usable, INDEX_ENTRY.size)]
+
+    # Byte position to start scanning from to reach the given record number
+    def seek_position(self, record_number: int) -> Tuple[int, int]:
+        position = bisect_right(self.index, (record_number, float('inf'))) - 1
+        if position < 0:
+            return 0, 0
+        return self.index[position]
+
+
+# Append-only event store made of segment files.
+#
+# Each segment holds length-prefixed, checksummed records and is rotated once it reaches segment_bytes;
+# its name is the offset of its first record. A sparse index (one entry every index_interval records)
+# lets readers jump close to any offset. Reads go through mmap and stream one record at a time, so a
+# projection can be rebuilt from millions of events without loading them into memory.
+#
+# Appends are buffered writes on the current segment; call flush() (or close()) to make them durable.
+# A single process writes to a store; other processes open it with readonly=True to read or tail it.
+class EventStore:
+    def __init__(self, directory: str, segment_bytes: int = 64 * 1024 * 1024, index_interval: int = 1024,
+                 readonly: bool = False):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.index_interval = index_interval
+        self.readonly = readonly
+        if not readonly:
+            os.makedirs(directory, exist_ok=True)
+        self._segments: List[_Segment] = []
+        self._bases: List[int] = []
+        self._file = None
+        self._index_file = None
+        self._appended: Optional[asyncio.Event] = None
+        self._open()
+
+    @property
+    def next_offset(self) -> int:
+        active = self._segments[-1]
+        return active.base + active.count
+
+    def _open(self):
+        bases = sorted(int(name[:-len(SEGMENT_SUFFIX)]) for name in os.listdir(self.directory)
+                       if name.endswith(SEGMENT_SUFFIX))
+        for base in bases:
+            segment = _Segment(self.directory, base)
+            segment.load_index()
+            self._segments.append(segment)
+        if not self._segments:
+            self._segments.append(_Segment(self.directory, 0))
+        # Only the last segment can have been cut short; older ones were complete when rotated
+        for segment, next_segment in zip(self._segments, self._segments[1:]):
+            segment.count = next_segment.base - segment.base
+            segment.size = os.path.getsize(segment.path)
+        self._recover(self._segments[-1])
+        self._bases = [segment.base for segment in self._segments]
+        if not self.readonly:
+            self._open_active()
+
+    # Count the active segment's records from its last index entry and drop a torn record at the end
+    def _recover(self, segment: _Segment):
+        if not os.path.exists(segment.path):
+            return
+        file_size = os.path.getsize(segment.path)
+        # Index and segment are flushed separately: ignore entries pointing past the data
+        segment.index = [entry for entry in segment.index if entry[1] <= file_size]
+        record_number, position = segment.seek_position(2 ** 32)
+        with open(segment.path, 'rb') as f:
+            f.seek(position)
+            data = f.read()
+        cursor = 0
+        while cursor + RECORD_HEADER.size <= len(data):
+            length, checksum = RECORD_HEADER.unpack_from(data, cursor)
+            payload = data[cursor + RECORD_HEADER.size:cursor + RECORD_HEADER.size + length]
+            if len(payload) < length or zlib.crc32(payload) != checksum:
+                break
+            cursor += RECORD_HEADER.size + length
+            record_number += 1
+        end = position + cursor
+        segment.count = record_number
+        segment.size = end
+        if self.readonly:
+            return
+        if end < file_size:
+            logger.warning("Truncating incomplete record at byte %d of %s", end, segment.path)
+            with open(segment.path, 'r+b') as f:
+                f.truncate(end)
+        # Entries at the end position would be written again by the next append
+        index = [entry for entry in segment.index if entry[1] < end]
+        index_size = os.path.getsize(segment.index_path) if os.path.exists(segment.index_path) else 0
+        if len(index) != len(segment.index) or index_size != len(index) * INDEX_ENTRY.size:
+            segment.index = index
+            with open(segment.index_path, 'wb') as f:
+                f.write(b''.join(INDEX_ENTRY.pack(*entry) for entry in index))
+
+    def _open_active(self):
+        active = self._segments[-1]
+        self._file = open(active.path, 'ab')
+        self._index_file = open(active.index_path, 'ab')
+
+    def _rotate(self):
+        self._close_files()
+        segment = _Segment(self.directory, self.next_offset)
+        self._segments.append(segment)
+        self._bases.append(segment.base)
+        self._open_active()
+
+    # Append an event and return its offset. Can be subscribed to the EventBus as a listener directly.
+    def append(self, event) -> int:
+        if self.readonly:
+            raise RuntimeError("Cannot append to an event store opened read-only")
+        payload = json.dumps([event.id, event.name, event.data, event.created], separators=(',', ':')).encode()
+        return self._append_payload(payload)
+
+    def _append_payload(self, payload: bytes) -> int:
+        active = self._segments[-1]
+        if active.size >= self.segment_bytes:
+            self._rotate()
+            active = self._segments[-1]
+        if active.count % self.index_interval == 0:
+            entry = (active.count, active.size)
+            active.index.append(entry)
+            self._index_file.write(INDEX_ENTRY.pack(*entry))
+        self._file.write(RECORD_HEADER.pack(len(payload), zlib.crc32(payload)))
+        self._file.write(payload)
+        offset = active.base + active.count
+        active.count += 1
+        active.size += RECORD_HEADER.size + len(payload)
+        if self._appended is not None:
+            self._appended.set()
+        return offset
+
+    def flush(self, fsync: bool = False):
+        for f in (self._file, self._index_file):
+            if f is not None:
+                f.flush()
+                if fsync:
+                    os.fsync(f.fileno())
+
+    def _close_files(self):
+        self.flush()
+        for f in (self._file, self._index_file):
+            if f is not None:
+                f.close()
+        self._file = self._index_file = None
+
+    def close(self):
+        self._close_files()
+
+    # Stream the stored events starting at from_offset
+    def read(self, from_offset: int = 0) -> Iterator[StoredEvent]:
+        self.flush()
+        segment_position = max(bisect_right(self._bases, from_offset) - 1, 0)
+        for segment in self._segments[segment_position:]:
+            # Snapshot the segment's length: records appended while iterating are picked up by the next read
+            count, size = segment.count, segment.size
+            if from_offset >= segment.base + count or size == 0:
+                continue
+            yield from self._read_segment(segment, max(from_offset - segment.base, 0), count, size)
+
+    def _read_segment(self, segment: _Segment, start: int, count: int, size: int) -> Iterator[StoredEvent]:
+        record_number, position = segment.seek_position(start)
+        with open(segment.path, 'rb') as f, mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mapped:
+            while record_number < count:
+                length, checksum = RECORD_HEADER.unpack_from(mapped, position)
+                body_start = position + RECORD_HEADER.size
+                position = body_start + length
+                if record_number >= start:
+                    payload = mapped[body_start:position]
+                    if zlib.crc32(payload) != checksum:
+                        raise CorruptRecordError(f"Bad checksum for offset {segment.base + record_number} in {segment.path}")
+                    event_id, name, data, created = json.loads(payload)
+                    yield StoredEvent(segment.base + record_number, event_id, name, data, created)
+                record_number += 1
+
+    # Yield stored events from from_offset on, then keep waiting for new ones. Appends from this process
+    # wake the reader immediately; poll_interval bounds the delay for events written by other processes.
+    async def tail(self, from_offset: int = 0, poll_interval: float = 0.5):
+        if self._appended is None:
+            self._appended = asyncio.Event()
+        offset = from_offset
+        while True:
+            self._appended.clear()
+            for stored in self.read(offset):
+                yield stored
+                offset = stored.offset + 1
+            try:
+                async with asyncio.timeout(poll_interval):
+                    await self._appended.wait()
+            except TimeoutError:
+                self._refresh()
+
+    # Pick up segments and records appended by another process
+    def _refresh(self):
+        if not self.readonly:
+            return  # This process is the writer: its view is always current
+        self._segments, self._bases = [], []
+        self._open()
+
+
+# Last processed offset of a consumer, persisted atomically so it can resume where it stopped
+class Checkpoint:
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> int:
+        try:
+            with open(self.path) as f:
+                return int(f.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    # Store the offset of the next event to process
+    def save(self, offset: int):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(str(offset))
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,134 @@
+import asyncio
+import json
+import os
+import uuid
+
+from typing import Dict, Iterable, List, Optional
+
+from src.core.event_bus import Event
+from src.core.logger import get_logger
+from src.core.topic_trie import TopicTrie
+
+logger = get_logger(__name__)
+
+DEFAULT_CHANNEL = 'eventwired:events'
+
+
+# Mirrors selected EventBus topics between worker processes through Redis pub/sub.
+#
+# Events published locally on a mirrored topic are buffered and sent once per event loop tick, as a
+# single message on one shared channel. Each process holds one subscription to that channel and
+# publishes the events it receives from other workers on its local bus; messages from its own
+# worker id are ignored, since local listeners already ran.
+#
+# Wire format (compact JSON): [worker_id, [[event_id, name, data], ...]]. Event data must be
+# JSON-serializable; events carrying live objects (send, request, ...) are not mirrored.
+class RedisEventTransport:
+    def __init__(self, event_bus, redis_service, topics: Iterable[str], channel: str = DEFAULT_CHANNEL,
+                 worker_id: Optional[str] = None):
+        self.event_bus = event_bus
+        self.redis_service = redis_service
+        self.channel = channel
+        self.worker_id = worker_id or f"{os.getpid():x}-{uuid.uuid4().hex[:8]}"
+        self._topics = TopicTrie()
+        for topic in topics:
+            self._topics.add(topic)
+        self._mirrored: Dict[str, bool] = {}  # Event name -> whether any mirrored topic matches it
+        self._pending: List[list] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._listener_task: Optional[asyncio.Task] = None
+        # Counters
+        self.sent = 0
+        self.received = 0
+        self.batches = 0
+        self.skipped = 0
+
+    def mirrors(self, event_name: str) -> bool:
+        mirrored = self._mirrored.get(event_name)
+        if mirrored is None:
+            mirrored = self._mirrored[event_name] = bool(self._topics.match(event_name))
+        return mirrored
+
+    # Attach to the event bus and open the process-wide subscription
+    async def start(self):
+        self.event_bus.transport = self
+        if self._listener_task is None:
+            self._listener_task = asyncio.create_task(self.redis_service.subscribe(self.channel, self._on_message))
+
+    # Flush what is still buffered, then detach and close the subscription
+    async def stop(self):
+        if self.event_bus.transport is self:
+            self.event_bus.transport = None
+        if self._flush_task is not None:
+            await self._flush_task
+        await self.flush()
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            await asyncio.gather(self._listener_task, return_exceptions=True)
+            self._listener_task = None
+
+    # Called by EventBus.publish for mirrored topics; never waits on Redis
+    def send(self, event):
+        self._pending.append([event.id, event.name, event.data])
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_next_tick())
+
+    async def _flush_next_tick(self):
+        await asyncio.sleep(0)  # Let the rest of this tick's events join the batch
+        self._flush_task = None
+        await self.flush()
+
+    async def flush(self):
+        records, self._pending = self._pending, []
+        if not records:
+            return
+        try:
+            payload = self._encode(records)
+        except (TypeError, ValueError):
+            # Drop the offending events and send the rest
+            records = [record for record in records if self._serializable(record)]
+            if not records:
+                return
+            payload = self._encode(records)
+        try:
+            await self.redis_service.publish(self.channel, payload)
+            self.sent += len(records)
+            self.batches += 1
+        except Exception as e:
+            logger.error("Error mirroring %d events to '%s': %s", len(records), self.channel, e)
+
+    def _encode(self, records: List[list]) -> str:
+        return json.dumps([self.worker_id, records], separators=(',', ':'))
+
+    def _serializable(self, record: list) -> bool:
+        try:
+            json.dumps(record)
+            return True
+        except (TypeError, ValueError):
+            self.skipped += 1
+            logger.warning("Event '%s' is not JSON-serializable and was not mirrored", record[1])
+            return False
+
+    async def _on_message(self, payload):
+        try:
+            worker_id, records = json.loads(payload)
+        except (TypeError, ValueError) as e:
+            logger.warning("Ignoring malformed message on '%s': %s", self.channel, e)
+            return
+        if worker_id == self.worker_id:
+            return  # Loopback: local listeners already handled these events
+        for event_id, name, data in records:
+            self.received += 1
+            try:
+                await self.event_bus.publish_local(Event(name, data, event_id))
+            except Exception as e:
+                logger.error("Error delivering mirrored event '%s': %s", name, e)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'sent': self.sent,
+            'received': self.received,
+            'batches': self.batches,
+            'skipped': self.skipped,
+            'pending': len(self._pending),
+        }
@@ -1,40 +1,96 @@
+import asyncio
 import traceback
-from typing import Callable
+from typing import Callable, Optional
 
-from src.core.lifecycle import handle_lifespan_events
+from src.core.logger import get_logger
+from src.core.lifecycle import handle_lifespan_events, run_startup_hooks, run_shutdown_hooks
 from src.core.http_handler import handle_http_requests
 from src.core.request import Request
+from src.core.response import Response
 from src.core.setup_registry import run_setups
 from src.core.websocket import handle_websocket_connections
 from src.core.dicontainer import DIContainer
 from src.core.event_bus import Event
 
+logger = get_logger(__name__)
+
 
 class FrameworkApp:
-    def __init__(self, container: DIContainer, register_routes: Callable):
+    def __init__(self, container: DIContainer, register_routes: Callable, setup_container: Optional[Callable] = None,
+                 freeze_container: bool = False):
         self.container = container
         self.register_routes = register_routes
+        # Optional user callback that registers the app's services, e.g. demo_app.di_setup.setup_container
+        self.setup_container = setup_container
+        # Validate and warm up the container once set up, then serve requests from its lookup table
+        self.freeze_container = freeze_container
+        self._setup_done = False
+        self._started = False
+        self._setup_error: Optional[Exception] = None
+        self._setup_lock = asyncio.Lock()
 
     async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope['type'] == 'lifespan':
+            # Startup builds the application once; requests afterwards only read from the container
+            await handle_lifespan_events(scope, receive, send, on_startup=self.ensure_setup, on_shutdown=self.shutdown)
+            return
+
+        if not self._started:
+            # No lifespan support from the server: build lazily on the first request
+            try:
+                await self.ensure_setup()
+            except Exception as e:
+                logger.exception("Error during app startup: %s", e)
+                if scope['type'] == 'http':
+                    await Response("Internal Server Error", status_code=500, content_type='text/plain').send(send)
+                return
+
         try:
             request = Request(scope, receive)
-            if scope['type'] == 'lifespan':
-                await handle_lifespan_events(scope, receive, send)
-            elif scope['type'] == 'http':
+            if scope['type'] == 'http':
                 await handle_http_requests(scope, receive, send, request, self.container)
             elif scope['type'] == 'websocket':
                 await handle_websocket_connections(scope, receive, send, request, self.container)
         except Exception as e:
-            traceback.print_exc()  # Print traceback for debugging
-            print(f"Error in ASGI application: {e}")
+            logger.exception("Error in ASGI application: %s", e)
 
             # Publish the error event without sending the response directly
             event_bus = await self.container.get('EventBus')
             event = Event(name="http.error.500", data={'exception': e, 'traceback': traceback.format_exc(), 'send': send})
             await event_bus.publish(event)
 
+    # Build the application exactly once, whether triggered by lifespan.startup or by the first request,
+    # then run the @on_startup hooks. Concurrent first requests wait on the lock instead of running it again.
+    # A failed setup is not retried: the container is left partly configured (and setup_container may have
+    # started connections), so every later call raises, chained to the original error, until the app restarts.
+    async def ensure_setup(self):
+        if self._started:
+            return
+        async with self._setup_lock:
+            if self._started:
+                return
+            if self._setup_error is not None:
+                raise RuntimeError("The application setup failed; restart the application") from self._setup_error
+            try:
+                if not self._setup_done:
+                    if self.setup_container is not None:
+                        await self.setup_container(self.container)
+                    await self.setup()
+                if self.freeze_container:
+                    await self.container.freeze()
+                await run_startup_hooks(self.container)
+            except Exception as e:
+                self._setup_error = e
+                raise
+            self._started = True
+
+    # Run the @on_shutdown hooks and close the connections held by the container's services
+    async def shutdown(self):
+        await run_shutdown_hooks(self.container)
+
     async def setup(self):
         await run_setups(self.container)
         routing_service = await self.container.get('RoutingService')
         # Custom route registration logic for the user app
-        await self.register_routes(routing_service)
\ No newline at end of file
+        await self.register_routes(routing_service)
+        self._setup_done = True
@@ -3,15 +3,28 @@ from typing import Any, Callable
 
 from src.core.event_bus import Event
 from src.core.request import Request
-from src.core.context_manager import set_container
+from src.core.context_manager import set_container, request_scope
+from src.core.dicontainer import DIContainer
 
 
 async def handle_http_requests(scope: dict, receive: Callable[[], Any], send: Callable[[dict], None], request: Request,
                                container: Any) -> None:
+    # Request-scoped services live until the response has been handled
+    async with request_scope():
+        await _handle_http_request(scope, receive, send, request, container)
+
+
+async def _handle_http_request(scope: dict, receive: Callable[[], Any], send: Callable[[dict], None], request: Request,
+                               container: Any) -> None:
     try:
         set_container(container)
-        event_bus = await container.get('EventBus')
-        middleware_service = await container.get('MiddlewareService')
+        if isinstance(container, DIContainer) and container.frozen:
+            # Plain dict hits: the container was validated and warmed up at startup
+            event_bus = container.get_nowait('EventBus')
+            middleware_service = container.get_nowait('MiddlewareService')
+        else:
+            event_bus = await container.get('EventBus')
+            middleware_service = await container.get('MiddlewareService')
         event_data = {
             'scope': scope,
             'receive': receive,
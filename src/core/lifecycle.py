@@ -1,10 +1,98 @@
-async def handle_lifespan_events(scope, receive, send):
+import inspect
+
+from typing import Awaitable, Callable, Optional
+
+from src.core.logger import get_logger, stop_logging
+
+logger = get_logger(__name__)
+
+startup_registry = []
+shutdown_registry = []
+
+# Services closed on shutdown, in dependency order: events still buffered for other workers are sent
+# and pending background events are processed first, then WebSocket clients are closed, since their
+# controllers may still use Redis or the database, and the ORM engine goes last.
+CLOSEABLE_SERVICES = [
+    ('EventTransport', 'stop'),
+    ('EventBus', 'drain'),
+    ('EventStore', 'close'),
+    ('WebSocketService', 'shutdown'),
+    ('RedisService', 'cleanup'),
+    ('ORMService', 'cleanup'),
+]
+
+
+# Decorator to register a hook that runs on lifespan startup, once the container is set up.
+# Use it for warm-up work such as opening pool connections or precompiling templates.
+def on_startup(func):
+    startup_registry.append(func)
+    return func
+
+
+# Decorator to register a hook that runs on lifespan shutdown, before framework resources are closed.
+def on_shutdown(func):
+    shutdown_registry.append(func)
+    return func
+
+
+# Run all hooks registered with @on_startup, in registration order.
+# A failing hook aborts the startup so the server does not serve a half-initialized app.
+async def run_startup_hooks(container):
+    for hook in startup_registry:
+        await hook(container)
+
+
+# Run all hooks registered with @on_shutdown in reverse registration order, then close the
+# framework's own resources and flush the log queue. Errors are reported but never stop the remaining teardown.
+async def run_shutdown_hooks(container):
+    for hook in reversed(shutdown_registry):
+        try:
+            await hook(container)
+        except Exception as e:
+            logger.error("Error in shutdown hook %s: %s", getattr(hook, '__name__', hook), e)
+    await close_resources(container)
+    stop_logging()
+
+
+# Close the services that hold connections. Only services that were actually built are closed;
+# nothing is instantiated just to be torn down again.
+async def close_resources(container):
+    for service_name, close_method in CLOSEABLE_SERVICES:
+        try:
+            service = container.get_sync(service_name)
+        except Exception:
+            continue  # Not registered or never instantiated
+        if service is None:
+            continue
+        try:
+            result = getattr(service, close_method)()
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.error("Error closing %s: %s", service_name, e)
+
+
+async def handle_lifespan_events(scope, receive, send, on_startup: Optional[Callable[[], Awaitable[None]]] = None,
+                                 on_shutdown: Optional[Callable[[], Awaitable[None]]] = None):
     try:
         while True:
             message = await receive()
             if message['type'] == 'lifespan.startup':
+                # Build the application once, before the server starts accepting requests
+                if on_startup is not None:
+                    try:
+                        await on_startup()
+                    except Exception as e:
+                        logger.error("Error during lifespan startup: %s", e)
+                        await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                        return
                 await send({'type': 'lifespan.startup.complete'})
             elif message['type'] == 'lifespan.shutdown':
+                if on_shutdown is not None:
+                    try:
+                        await on_shutdown()
+                    except Exception as e:
+                        logger.error("Error during lifespan shutdown: %s", e)
                 await send({'type': 'lifespan.shutdown.complete'})
                 return
             else:
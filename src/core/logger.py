@@ -0,0 +1,91 @@
+import atexit
+import logging
+import queue
+import sys
+import time
+
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, TextIO, Union
+
+# Root of the framework's loggers: modules log through get_logger(__name__), i.e. 'src.core.event_bus', ...
+FRAMEWORK_LOGGER = 'src'
+DEFAULT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_handler: Optional[QueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    return logging.getLogger(name)
+
+
+# Thins out DEBUG records so verbose modules (CORS, Redis, WebSocket, ...) cannot flood the output under load.
+# Keeps one DEBUG record in every `sample_every`, and at most `rate_limit` per second and per logger.
+# Records above DEBUG always pass.
+class DebugThrottle(logging.Filter):
+    def __init__(self, sample_every: int = 1, rate_limit: Optional[int] = None, clock=time.monotonic):
+        super().__init__()
+        self.sample_every = max(1, sample_every)
+        self.rate_limit = rate_limit
+        self.clock = clock
+        self.suppressed = 0
+        self._seen = 0
+        self._windows: Dict[str, list] = {}  # logger name -> [window start, records in window]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        self._seen += 1
+        if self._seen % self.sample_every:
+            self.suppressed += 1
+            return False
+        if self.rate_limit is not None:
+            now = self.clock()
+            window = self._windows.get(record.name)
+            if window is None or now - window[0] >= 1:
+                window = self._windows[record.name] = [now, 0]
+            if window[1] >= self.rate_limit:
+                self.suppressed += 1
+                return False
+            window[1] += 1
+        return True
+
+
+# Route logging through a QueueHandler: callers only put the record on an in-memory queue, and a
+# QueueListener thread formats and writes it, so logging never does blocking I/O on the event loop.
+# level applies to the framework's loggers; module_levels overrides it per logger name,
+# e.g. {'src.services.redis_service': 'DEBUG'}. Calling it again replaces the previous pipeline.
+def configure_logging(level: Union[int, str] = logging.INFO, module_levels: Optional[Dict[str, Union[int, str]]] = None,
+                      debug_sample_every: int = 1, debug_rate_limit: Optional[int] = None,
+                      stream: Optional[TextIO] = None, fmt: str = DEFAULT_FORMAT) -> QueueListener:
+    global _handler, _listener
+    stop_logging()
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(logging.Formatter(fmt))
+
+    log_queue = queue.SimpleQueue()
+    _handler = QueueHandler(log_queue)
+    _handler.addFilter(DebugThrottle(debug_sample_every, debug_rate_limit))
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+
+    logging.getLogger().addHandler(_handler)
+    logging.getLogger(FRAMEWORK_LOGGER).setLevel(level)
+    for name, module_level in (module_levels or {}).items():
+        logging.getLogger(name).setLevel(module_level)
+    return _listener
+
+
+# Flush the queued records and detach the pipeline (called on shutdown and at exit)
+def stop_logging():
+    global _handler, _listener
+    if _handler is not None:
+        logging.getLogger().removeHandler(_handler)
+        _handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,221 @@
+import re
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from src.core.converters import Converter, get_converter
+
+# A parameter in a route template: <name>, <int:name>, <slug:name>, <uuid:name>, <path:name>, ...
+PARAMETER = re.compile(r'<(?:(\w+):)?(\w+)>')
+
+# <path:name> takes the rest of the path, slashes included; it must end the template
+CATCH_ALL = 'path'
+
+
+class _ParamEdge:
+    __slots__ = ('key', 'name', 'converter', 'pattern', 'converters', 'node')
+
+    def __init__(self, key: str, name: Optional[str], converter: Optional[Converter],
+                 pattern: Optional[re.Pattern] = None, converters: Optional[Dict[str, Converter]] = None):
+        self.key = key  # The template segment, e.g. '<int:id>'
+        self.name = name
+        self.converter = converter  # Whole-segment parameter
+        # Parameters mixed with text, e.g. 'report-<int:year>.pdf': a regex and the converter of each group
+        self.pattern = pattern
+        self.converters = converters
+        self.node = _Node()
+
+
+class _Node:
+    __slots__ = ('static', 'params', 'catch_all', 'route')
+
+    def __init__(self):
+        self.static: Dict[str, '_Node'] = {}
+        self.params: List[_ParamEdge] = []  # Tried in registration order, after the static children
+        self.catch_all: Optional[Tuple[str, Converter, Any]] = None  # (name, converter, route) of a trailing <path:...>
+        self.route: Any = None  # Set on the node where a template ends
+
+    def is_empty(self) -> bool:
+        return not (self.static or self.params or self.catch_all or self.route is not None)
+
+
+# Segment tree of route templates. Static segments are matched with a dict lookup and parameters by their
+# converter, which also parses the value (an int for <int:id>, a UUID for <uuid:key>, ...), so a lookup costs the depth of the path rather than the number of routes. Static children
+# are tried before parameters, and the search backtracks when a branch does not lead to a complete route.
+# Templates made only of static segments are also kept in a flat dict and matched without splitting the path.
+class RouteTree:
+    def __init__(self):
+        self.root = _Node()
+        self._static_routes: Dict[str, Any] = {}
+
+    def add(self, template: str, route: Any):
+        segments = self._split(template)
+        if not any('<' in segment for segment in segments):
+            self._static_routes[template] = route
+        node = self.root
+        for position, segment in enumerate(segments):
+            if '<' not in segment:
+                node = node.static.setdefault(segment, _Node())
+                continue
+            parameter = PARAMETER.fullmatch(segment)
+            if parameter and parameter.group(1) == CATCH_ALL:
+                if position != len(segments) - 1:
+                    raise ValueError(f"<path:...> must be the last segment of '{template}'")
+                node.catch_all = (parameter.group(2), get_converter(CATCH_ALL, template), route)
+                return
+            node = self._param_edge(node, segment, template).node
+        node.route = route
+
+    def remove(self, template: str):
+        segments = self._split(template)
+        self._static_routes.pop(template, None)
+        path = [self.root]
+        for segment in segments:
+            parent = path[-1]
+            parameter = PARAMETER.fullmatch(segment)
+            if parameter and parameter.group(1) == CATCH_ALL:
+                parent.catch_all = None
+                break
+            if '<' not in segment:
+                node = parent.static.get(segment)
+            else:
+                node = next((edge.node for edge in parent.params if edge.key == segment), None)
+            if node is None:
+                return
+            path.append(node)
+        else:
+            path[-1].route = None
+        # Prune the branch back up to the first node still in use
+        walked = segments[:len(path) - 1]
+        for segment, parent, node in zip(reversed(walked), reversed(path[:-1]), reversed(path[1:])):
+            if not node.is_empty():
+                break
+            if '<' not in segment:
+                del parent.static[segment]
+            else:
+                parent.params = [edge for edge in parent.params if edge.key != segment]
+
+    # The first route registered for the path (that accept() agrees to, if given) and its parsed parameters,
+    # or None. A rejected route does not end the search: the next matching branch is tried.
+    def match(self, path: str, accept: Optional[Callable[[Any], bool]] = None) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        route = self._static_routes.get(path)
+        if route is not None and (accept is None or accept(route)):
+            return route, {}
+        if not path.startswith('/'):
+            return None
+        params: Dict[str, Any] = {}
+        route = self._match(self.root, path[1:].split('/'), 0, params, accept)
+        return None if route is None else (route, params)
+
+    # Every route matching the path, in match order
+    def match_all(self, path: str) -> List[Any]:
+        routes: Dict[int, Any] = {}
+
+        def collect(route) -> bool:
+            routes.setdefault(id(route), route)
+            return False
+        self.match(path, collect)
+        return list(routes.values())
+
+    def _match(self, node: _Node, segments: List[str], index: int, params: Dict[str, Any],
+               accept: Optional[Callable[[Any], bool]]) -> Any:
+        if index == len(segments):
+            route = node.route
+            return route if route is not None and (accept is None or accept(route)) else None
+        segment = segments[index]
+        child = node.static.get(segment)
+        if child is not None:
+            route = self._match(child, segments, index + 1, params, accept)
+            if route is not None:
+                return route
+        for edge in node.params:
+            if edge.pattern is None:
+                try:
+                    params[edge.name] = edge.converter.to_python(segment)
+                except ValueError:
+                    continue
+                route = self._match(edge.node, segments, index + 1, params, accept)
+                if route is not None:
+                    return route
+                del params[edge.name]
+            else:
+                matched = edge.pattern.fullmatch(segment)
+                if matched is None:
+                    continue
+                try:
+                    captured = {name: edge.converters[name].to_python(value) for name, value in matched.groupdict().items()}
+                except ValueError:
+                    continue
+                params.update(captured)
+                route = self._match(edge.node, segments, index + 1, params, accept)
+                if route is not None:
+                    return route
+                for name in captured:
+                    del params[name]
+        if node.catch_all is not None:
+            rest = '/'.join(segments[index:])
+            name, converter, route = node.catch_all
+            if rest and (accept is None or accept(route)):
+                params[name] = converter.to_python(rest)
+                return route
+        return None
+
+    @staticmethod
+    def _split(template: str) -> List[str]:
+        if not template.startswith('/'):
+            raise ValueError(f"Route '{template}' must start with '/'")
+        return template[1:].split('/')
+
+    @staticmethod
+    def _param_edge(node: _Node, segment: str, template: str) -> _ParamEdge:
+        for edge in node.params:
+            if edge.key == segment:
+                return edge
+        parameter = PARAMETER.fullmatch(segment)
+        if parameter:
+            edge = _ParamEdge(segment, parameter.group(2), get_converter(parameter.group(1), template))
+        else:
+            parts, converters, position = [], {}, 0
+            for parameter in PARAMETER.finditer(segment):
+                converter = converters[parameter.group(2)] = get_converter(parameter.group(1), template)
+                parts.append(re.escape(segment[position:parameter.start()]))
+                parts.append(f"(?P<{parameter.group(2)}>{converter.regex})")
+                position = parameter.end()
+            parts.append(re.escape(segment[position:]))
+            edge = _ParamEdge(segment, None, None, re.compile(''.join(parts)), converters)
+        node.params.append(edge)
+        return edge
+
+
+# Reverse of matching: builds the URL of one route template from parameter values. The template is split
+# once into its static text and its parameters, so building a URL is one converter call per parameter and
+# a join. Values that are not parameters of the route are added as the query string.
+class UrlBuilder:
+    __slots__ = ('template', 'parts', 'names')
+
+    def __init__(self, template: str):
+        self.template = template
+        self.parts: List[Any] = []  # Static text, or (parameter name, converter)
+        self.names = set()
+        position = 0
+        for parameter in PARAMETER.finditer(template):
+            if parameter.start() > position:
+                self.parts.append(template[position:parameter.start()])
+            name = parameter.group(2)
+            self.parts.append((name, get_converter(parameter.group(1), template)))
+            self.names.add(name)
+            position = parameter.end()
+        if position < len(template):
+            self.parts.append(template[position:])
+        if not self.names:
+            self.parts = [template]
+
+    def build(self, params: Dict[str, Any]) -> str:
+        try:
+            url = ''.join(part if part.__class__ is str else part[1].to_url(params[part[0]]) for part in self.parts)
+        except KeyError as e:
+            raise ValueError(f"Missing parameter {e} to build '{self.template}'") from None
+        if len(params) > len(self.names):
+            query = {name: value for name, value in params.items() if name not in self.names}
+            url = f"{url}?{urlencode(query, doseq=True)}"
+        return url
@@ -0,0 +1,132 @@
+import asyncio
+import random
+
+from time import perf_counter
+from typing import List, Optional, Sequence
+
+ROUND_ROBIN = 'round_robin'
+LEAST_OUTSTANDING = 'least_outstanding'
+WEIGHTED_ROUND_ROBIN = 'weighted_round_robin'
+EWMA_P2C = 'ewma_p2c'
+
+
+# Load and latency of one service, as seen by the Distributor
+class ServiceStats:
+    __slots__ = ('in_flight', 'queued', 'completed', 'ewma', 'alpha', 'limit')
+
+    def __init__(self, max_concurrency: Optional[int] = None, alpha: float = 0.3):
+        self.in_flight = 0
+        self.queued = 0  # Callers waiting for a slot under max_concurrency
+        self.completed = 0
+        self.ewma = 0.0  # Exponentially weighted moving average of the call latency (seconds)
+        self.alpha = alpha
+        # Callers wait for a free slot once max_concurrency calls are running
+        self.limit = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+    async def call(self, service, event):
+        if self.limit is None:
+            return await self._timed_call(service, event)
+        self.queued += 1
+        try:
+            await self.limit.acquire()
+        finally:
+            self.queued -= 1
+        try:
+            return await self._timed_call(service, event)
+        finally:
+            self.limit.release()
+
+    # Calls running or waiting for a slot: the load the strategies balance
+    @property
+    def outstanding(self) -> int:
+        return self.in_flight + self.queued
+
+    async def _timed_call(self, service, event):
+        self.in_flight += 1
+        start = perf_counter()
+        try:
+            return await service(event)
+        finally:
+            elapsed = perf_counter() - start
+            self.in_flight -= 1
+            self.completed += 1
+            self.ewma = elapsed if self.completed == 1 else self.alpha * elapsed + (1 - self.alpha) * self.ewma
+
+
+# A strategy decides in which order the services are offered an event. The Distributor stops at the
+# first service that handles it, so the first index is the strategy's pick and the rest are fallbacks.
+class Strategy:
+    def order(self, stats: Sequence[ServiceStats]) -> List[int]:
+        raise NotImplementedError
+
+
+class RoundRobin(Strategy):
+    def __init__(self):
+        self.current_index = 0
+
+    def order(self, stats):
+        count = len(stats)
+        start = self.current_index % count
+        self.current_index = (start + 1) % count
+        return [(start + offset) % count for offset in range(count)]
+
+
+# Fewest outstanding calls (running or queued) first; ties are broken by rotation so idle services share the work
+class LeastOutstanding(RoundRobin):
+    def order(self, stats):
+        rotation = super().order(stats)
+        return sorted(rotation, key=lambda index: stats[index].outstanding)
+
+
+# Smooth weighted round-robin (as in nginx): a service with weight 3 gets three events for every
+# one sent to a service with weight 1, interleaved rather than in bursts
+class WeightedRoundRobin(Strategy):
+    def __init__(self, weights: Sequence[int]):
+        if any(weight <= 0 for weight in weights):
+            raise ValueError("Weights must be positive")
+        self.weights = list(weights)
+        self.current = [0] * len(weights)
+
+    def order(self, stats):
+        if len(stats) != len(self.weights):
+            raise ValueError(f"Expected {len(stats)} weights, got {len(self.weights)}")
+        current = self.current
+        for index, weight in enumerate(self.weights):
+            current[index] += weight
+        ranked = sorted(range(len(current)), key=lambda index: -current[index])
+        current[ranked[0]] -= sum(self.weights)
+        return ranked
+
+
+# Power of two choices: sample two services and pick the one with the lower expected cost
+# (EWMA latency scaled by its queue), which avoids the herding of always picking the global minimum
+class EwmaPowerOfTwo(Strategy):
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.rng = rng or random.Random()
+
+    @staticmethod
+    def cost(stats: ServiceStats) -> float:
+        return stats.ewma * (stats.outstanding + 1)
+
+    def order(self, stats):
+        count = len(stats)
+        if count == 1:
+            return [0]
+        first, second = self.rng.sample(range(count), 2)
+        pick = first if self.cost(stats[first]) <= self.cost(stats[second]) else second
+        rest = sorted((index for index in range(count) if index != pick), key=lambda index: self.cost(stats[index]))
+        return [pick] + rest
+
+
+def create_strategy(name: str, weights: Optional[Sequence[int]] = None) -> Strategy:
+    if name == ROUND_ROBIN:
+        return RoundRobin()
+    if name == LEAST_OUTSTANDING:
+        return LeastOutstanding()
+    if name == WEIGHTED_ROUND_ROBIN:
+        if weights is None:
+            raise ValueError("The weighted_round_robin strategy requires weights")
+        return WeightedRoundRobin(weights)
+    if name == EWMA_P2C:
+        return EwmaPowerOfTwo()
+    raise ValueError(f"Unknown distribution strategy '{name}'")
@@ -0,0 +1,69 @@
+from typing import Dict, List, Optional
+
+# Wildcard segments in a subscription pattern
+SINGLE = '*'  # Exactly one segment: 'http.error.*' matches 'http.error.404'
+MULTI = '#'   # Zero or more segments: 'user.#' matches 'user', 'user.login' and 'user.login.success'
+
+
+def is_pattern(topic: str) -> bool:
+    return any(segment in (SINGLE, MULTI) for segment in topic.split('.'))
+
+
+class _Node:
+    __slots__ = ('children', 'pattern')
+
+    def __init__(self):
+        self.children: Dict[str, '_Node'] = {}
+        self.pattern: Optional[str] = None  # Set on the node where a subscribed pattern ends
+
+
+# Segment trie of subscribed topics and wildcard patterns, used to find every pattern
+# matching a concrete event name.
+class TopicTrie:
+    def __init__(self):
+        self.root = _Node()
+
+    def add(self, pattern: str):
+        node = self.root
+        for segment in pattern.split('.'):
+            node = node.children.setdefault(segment, _Node())
+        node.pattern = pattern
+
+    def remove(self, pattern: str):
+        segments = pattern.split('.')
+        path = [self.root]
+        for segment in segments:
+            node = path[-1].children.get(segment)
+            if node is None:
+                return
+            path.append(node)
+        path[-1].pattern = None
+        # Prune the branch back up to the first node still in use
+        for segment, parent, node in zip(reversed(segments), reversed(path[:-1]), reversed(path[1:])):
+            if node.children or node.pattern is not None:
+                break
+            del parent.children[segment]
+
+    # Patterns matching the event name, each at most once
+    def match(self, topic: str) -> List[str]:
+        matches: Dict[str, None] = {}
+        self._collect(self.root, topic.split('.'), 0, matches)
+        return list(matches)
+
+    def _collect(self, node: _Node, segments: List[str], index: int, matches: Dict[str, None]):
+        children = node.children
+        multi = children.get(MULTI)
+        if multi is not None:
+            # '#' consumes any number of the remaining segments, including none
+            for next_index in range(index, len(segments) + 1):
+                self._collect(multi, segments, next_index, matches)
+        if index == len(segments):
+            if node.pattern is not None:
+                matches[node.pattern] = None
+            return
+        exact = children.get(segments[index])
+        if exact is not None:
+            self._collect(exact, segments, index + 1, matches)
+        single = children.get(SINGLE)
+        if single is not None:
+            self._collect(single, segments, index + 1, matches)
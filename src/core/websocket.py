@@ -3,11 +3,18 @@ from typing import Callable, Any
 
 from src.core.request import Request
 from src.core.event_bus import Event
-from src.core.context_manager import set_container
+from src.core.context_manager import set_container, request_scope
 
 
 async def handle_websocket_connections(scope: dict, receive: Callable, send: Callable, request: Request,
                                        container: Any) -> None:
+    # Request-scoped services are shared for the lifetime of the connection
+    async with request_scope():
+        await _handle_websocket_connection(scope, receive, send, request, container)
+
+
+async def _handle_websocket_connection(scope: dict, receive: Callable, send: Callable, request: Request,
+                                       container: Any) -> None:
     set_container(container)
     event_bus = await container.get('EventBus')
     try:
@@ -3,6 +3,9 @@ import re
 from src.middleware.base_middleware import BaseMiddleware
 from src.core.response import Response
 from src.services.config_service import ConfigService
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 class CORSMiddleware(BaseMiddleware):
@@ -18,9 +21,9 @@ class CORSMiddleware(BaseMiddleware):
     def _is_origin_allowed(self, origin):
         for pattern in self.origin_patterns:
             if pattern.match(origin):
-                print(f"DEBUG: Origin {origin} matched pattern {pattern.pattern}")
+                logger.debug("Origin %s matched pattern %s", origin, pattern.pattern)
                 return True
-        print(f"DEBUG: Origin {origin} did not match any patterns")
+        logger.debug("Origin %s did not match any patterns", origin)
         return False
 
     # Generate regex patterns for each origin in allowed_origins
@@ -81,8 +84,8 @@ class CORSMiddleware(BaseMiddleware):
                 response.headers = list(headers_dict.items())  # Convert back to list of tuples for ASGI compatibility
 
             except Exception as e:
-                print(f"Error adding CORS headers to response: {e}")
-                print(f"headers_dict content: {headers_dict}")  # Debugging
+                logger.error("Error adding CORS headers to response: %s", e)
+                logger.debug("headers_dict content: %s", headers_dict)
 
         return event
 
@@ -1,12 +1,15 @@
 import secrets
 
 from src.core.event_bus import EventBus, Event
+from src.core.logger import get_logger
 from src.core.request import Request
 from src.core.response import Response
 from src.core.session import Session
 from src.middleware.base_middleware import BaseMiddleware
 from src.services.config_service import ConfigService
 
+logger = get_logger(__name__)
+
 
 class CSRFMiddleware(BaseMiddleware):
     def __init__(self, event_bus: EventBus, config_service: ConfigService):
@@ -49,7 +52,7 @@ class CSRFMiddleware(BaseMiddleware):
 
     # Handle CSRF failure and send a meaningful response to the user
     async def handle_csrf_failure(self, event):
-        print("CSRF token mismatch detected.")
+        logger.debug("CSRF token mismatch detected for %s %s", event.data['request'].method, event.data['request'].path)
         if self.config_service.get("CSRF_REDIRECT_ON_FAILURE", False):
             await self.event_bus.publish(Event(name="http.error.no_csrf", data=event.data))
         else:
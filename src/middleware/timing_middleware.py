@@ -1,7 +1,10 @@
 from src.core.event_bus import Event
+from src.core.logger import get_logger
 from src.middleware.base_middleware import BaseMiddleware
 import datetime
 
+logger = get_logger(__name__)
+
 
 class TimingMiddleware(BaseMiddleware):
     async def before_request(self, event: Event) -> Event:
@@ -18,4 +21,4 @@ class TimingMiddleware(BaseMiddleware):
         before_time = datetime.datetime.fromisoformat(event.data['before_request_data'])
         after_time = datetime.datetime.fromisoformat(event.data['after_request_timestamp'])
         processing_time = (after_time - before_time).total_seconds()
-        print(f"Request processing time: {processing_time} seconds")
+        logger.debug("Request processing time: %s seconds", processing_time)
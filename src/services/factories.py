@@ -1,9 +1,8 @@
-import redis
-
-from src.services.redis_service import RedisService
-
-
+# redis is imported on call, so apps that do not use it never load the client library
 def create_redis_service(redis_url: str = "redis://localhost:6379", max_connections: int = 10, critical: bool = True):
+    import redis
+    from src.services.redis_service import RedisService
+
     try:
         # Test Redis connection synchronously
         sync_redis_client = redis.Redis.from_url(redis_url)
@@ -1,10 +1,15 @@
 import asyncio
 
-import jwt
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict
 
 
+# PyJWT is loaded on first use rather than when the module is imported
+def _jwt():
+    import jwt
+    return jwt
+
+
 class JWTService:
     def __init__(self, config_service: Any):
         # Fetch configurations from the config service
@@ -30,11 +35,13 @@ class JWTService:
         })
 
         # Generate the JWT token asynchronously to avoid blocking the event loop
+        jwt = _jwt()
         token = await asyncio.to_thread(jwt.encode, payload_copy, self.secret_key, algorithm=self.algorithm)
         return token
 
     # Validates the given JWT token and returns the decoded payload
     async def validate_token(self, token: str) -> Dict[str, Any]:
+        jwt = _jwt()
         try:
             # Decode the JWT token asynchronously
             decoded_payload = await asyncio.to_thread(jwt.decode, token, self.secret_key, algorithms=[self.algorithm])
@@ -1,4 +1,4 @@
-from typing import Callable, List, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from src.core.event_bus import Event, EventBus
 from src.middleware.base_middleware import BaseMiddleware
@@ -8,17 +8,54 @@ class MiddlewareService:
     def __init__(self, event_bus: EventBus):
         self.middlewares: List[Tuple[BaseMiddleware, int]] = []
         self.event_bus = event_bus
+        # Middleware by the name routes use to select it, see RoutingService.add_route(middleware=...)
+        self.names: Dict[str, BaseMiddleware] = {}
+        # Tells which middleware a request goes through (see use_router); without one, every request gets them all
+        self.router: Optional[Any] = None
+        # Chain per selection of middleware names, in priority order; None selects every middleware
+        self._chains: Dict[Optional[Tuple[str, ...]], Tuple[BaseMiddleware, ...]] = {}
 
-    def register_middleware(self, middleware: BaseMiddleware, priority: int = 0) -> None:
+    def register_middleware(self, middleware: BaseMiddleware, priority: int = 0, name: str = None) -> None:
         if not isinstance(middleware, BaseMiddleware):
             raise TypeError(f"{middleware} must be an instance of BaseMiddleware")
         self.middlewares.append((middleware, priority))
         # Sort middleware by priority (highest priority first)
         self.middlewares.sort(key=lambda m: m[1], reverse=True)
+        self.names[name or middleware.__class__.__name__] = middleware
+        self._chains.clear()
+
+    # Select the middleware of each request from its route: the router's middleware_for(event) returns the
+    # names of the route's middleware, or None for all of them. The names its routes use are checked now, and
+    # those of the routes added later when they are added, so that a typo fails at startup rather than per request.
+    # Register the middleware first.
+    def use_router(self, router: Any) -> None:
+        self.check_names(router.middleware_names())
+        router.check_middleware = self.check_names
+        self.router = router
+
+    def check_names(self, names: Iterable[str]) -> None:
+        unknown = sorted(set(names) - set(self.names))
+        if unknown:
+            raise ValueError(f"Unknown middleware: {', '.join(unknown)}")
+
+    # The ordered middleware for a selection of names, built once per selection
+    def chain_for(self, names: Optional[Tuple[str, ...]]) -> Tuple[BaseMiddleware, ...]:
+        chain = self._chains.get(names)
+        if chain is None:
+            if names is not None:
+                self.check_names(names)
+                selected = {id(self.names[name]) for name in names}
+                chain = tuple(middleware for middleware, _ in self.middlewares if id(middleware) in selected)
+            else:
+                chain = tuple(middleware for middleware, _ in self.middlewares)
+            self._chains[names] = chain
+        return chain
 
     async def execute(self, event: Event, handler: Callable[[Event], None]) -> None:
-        # Pass the event through all registered middlewares before reaching the handler
-        for middleware, _ in self.middlewares:
+        chain = self.chain_for(self.router.middleware_for(event) if self.router is not None else None)
+
+        # Pass the event through the middlewares of the route before reaching the handler
+        for middleware in chain:
             if hasattr(middleware, 'before_request'):
                 try:
                     event = await middleware.before_request(event)
@@ -32,7 +69,7 @@ class MiddlewareService:
             return  # Stop processing since the response has already been sent e.g. 405
 
         # Pass the event and response back through the middlewares (after_request)
-        for middleware, _ in reversed(self.middlewares):
+        for middleware in reversed(chain):
             if hasattr(middleware, 'after_request'):
                 await middleware.after_request(event)
 
@@ -49,6 +86,10 @@ class MiddlewareService:
                         response.headers.append((k, v))
 
             # print(f"Final response headers: {response.headers}")
+            # Routes with a response cache keep the response as it is sent
+            cache_response = event.data.get('cache_response')
+            if cache_response is not None:
+                await cache_response(response)
             # Finally, send the response
             await response.send(event.data['send'])
             # event.data['response_already_sent'] = True
@@ -12,3 +12,15 @@ class PublisherService:
     async def publish_logout_failure(self):
         event = Event(name='user.logout.failure', data={})
         await self.event_bus.publish(event)
+
+    async def publish_book_created(self, book: dict):
+        event = Event(name='book.created', data=book)
+        await self.event_bus.publish(event)
+
+    async def publish_book_updated(self, old_title: str, book: dict):
+        event = Event(name='book.updated', data={'old_title': old_title, 'book': book})
+        await self.event_bus.publish(event)
+
+    async def publish_book_deleted(self, title: str):
+        event = Event(name='book.deleted', data={'title': title})
+        await self.event_bus.publish(event)
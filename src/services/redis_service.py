@@ -4,6 +4,10 @@ import asyncio
 from typing import Any, Dict, Callable, Optional
 from redis.exceptions import RedisError
 
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
 
 class RedisService:
     def __init__(self, redis_url: str = "redis://localhost:6379", max_connections: int = 10, redis_client=None, critical: bool = True):
@@ -27,23 +31,23 @@ class RedisService:
             if critical:
                 raise Exception(f"Failed to connect to Redis: {e}")
             else:
-                print(f"Warning: Failed to connect to Redis. Proceeding without Redis functionality: {e}")
+                logger.warning("Failed to connect to Redis. Proceeding without Redis functionality: %s", e)
                 self.client = None
 
     # Cache Management
     async def set_cache(self, key: str, value: Any, expiration: int = 3600) -> None:
         try:
             await self.client.set(key, value, ex=expiration)
-            print(f"Cache set for key: {key}")
+            logger.debug("Cache set for key: %s", key)
         except RedisError as e:
-            print(f"Error setting cache for key '{key}': {e}")
+            logger.error("Error setting cache for key '%s': %s", key, e)
             raise
 
     async def get_cache(self, key: str) -> Optional[Any]:
         try:
             return await self.client.get(key)
         except RedisError as e:
-            print(f"Error getting cache for key '{key}': {e}")
+            logger.error("Error getting cache for key '%s': %s", key, e)
             raise
 
     # Session Management
@@ -51,60 +55,63 @@ class RedisService:
         try:
             await self.client.hset(session_id, mapping=data)
             await self.client.expire(session_id, expiration)
-            print(f"Session set for session_id: {session_id}")
+            logger.debug("Session set for session_id: %s", session_id)
         except RedisError as e:
-            print(f"Error setting session for session_id '{session_id}': {e}")
+            logger.error("Error setting session for session_id '%s': %s", session_id, e)
             raise
 
     async def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
         try:
             session_data = await self.client.hgetall(session_id)
             if session_data:
-                print(f"Session retrieved for session_id: {session_id}")
+                logger.debug("Session retrieved for session_id: %s", session_id)
             return session_data
         except RedisError as e:
-            print(f"Error getting session for session_id '{session_id}': {e}")
+            logger.error("Error getting session for session_id '%s': %s", session_id, e)
             raise
 
     # Event Bus (Pub/Sub)
     async def publish(self, channel: str, message: str) -> None:
         try:
             await self.client.publish(channel, message)
-            print(f"Published message to channel '{channel}': {message}")
+            logger.debug("Published message to channel '%s': %s", channel, message)
         except RedisError as e:
-            print(f"Error publishing to channel '{channel}': {e}")
+            logger.error("Error publishing to channel '%s': %s", channel, e)
             raise
 
     async def subscribe(self, channel: str, listener: Callable[[str], None]) -> None:
+        pubsub = self.client.pubsub()
         try:
-            pubsub = self.client.pubsub()
             await pubsub.subscribe(channel)
 
-            print(f"Subscribed to channel: {channel}")
+            logger.debug("Subscribed to channel: %s", channel)
             async for message in pubsub.listen():
                 if message["type"] == "message":
                     await listener(message["data"])
         except RedisError as e:
-            print(f"Error subscribing to channel '{channel}': {e}")
+            logger.error("Error subscribing to channel '%s': %s", channel, e)
             raise
+        finally:
+            # Also reached when the subscribing task is cancelled: release the pub/sub connection
+            await pubsub.aclose()
 
     # Message Queue (Using Lists)
     async def enqueue(self, queue_name: str, value: Any) -> None:
         try:
             await self.client.rpush(queue_name, value)
-            print(f"Enqueued value '{value}' to queue '{queue_name}'")
+            logger.debug("Enqueued value '%s' to queue '%s'", value, queue_name)
         except RedisError as e:
-            print(f"Error enqueuing to queue '{queue_name}': {e}")
+            logger.error("Error enqueuing to queue '%s': %s", queue_name, e)
             raise
 
     async def dequeue(self, queue_name: str) -> Optional[Any]:
         try:
             value = await self.client.lpop(queue_name)
             if value:
-                print(f"Dequeued value '{value}' from queue '{queue_name}'")
+                logger.debug("Dequeued value '%s' from queue '%s'", value, queue_name)
             return value
         except RedisError as e:
-            print(f"Error dequeuing from queue '{queue_name}': {e}")
+            logger.error("Error dequeuing from queue '%s': %s", queue_name, e)
             raise
 
     # Cleanup and Graceful Shutdown
@@ -113,9 +120,9 @@ class RedisService:
             await self.client.aclose()
             if self.pool:
                 await self.pool.disconnect()
-            print("Redis connections closed successfully.")
+            logger.info("Redis connections closed successfully.")
         except RedisError as e:
-            print(f"Error during Redis cleanup: {e}")
+            logger.error("Error during Redis cleanup: %s", e)
             raise
 
     # Retry Logic
@@ -126,8 +133,8 @@ class RedisService:
                 return await operation(*args, **kwargs)
             except RedisError as e:
                 if attempt < retries:
-                    print(f"Retry {attempt}/{retries} for operation '{operation.__name__}' failed: {e}")
+                    logger.warning("Retry %d/%d for operation '%s' failed: %s", attempt, retries, operation.__name__, e)
                     await asyncio.sleep(delay)
                 else:
-                    print(f"Operation '{operation.__name__}' failed after {retries} retries.")
+                    logger.error("Operation '%s' failed after %d retries.", operation.__name__, retries)
                     raise
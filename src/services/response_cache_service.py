@@ -0,0 +1,240 @@
+import base64
+import json
+import math
+import time
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.core.event_bus import Event, EventBus
+from src.core.logger import get_logger
+from src.core.response import Response
+
+if TYPE_CHECKING:
+    from src.services.redis_service import RedisService
+
+logger = get_logger(__name__)
+
+# Headers that depend on the request rather than on the page (CORS answers the request's Origin). They are not
+# stored: the middleware adds them again to every response, cached or not.
+PER_REQUEST_HEADER_PREFIXES = (b'access-control-',)
+
+
+# Caching options of one route, from add_route(cache={...}):
+#   ttl            seconds an entry is served
+#   vary           request parts the response depends on: 'query', 'cookie:<name>' or 'header:<name>'
+#   tags           tags of the entries, invalidated with invalidate(); the route template by default
+#   invalidate_on  event names (or patterns, e.g. 'book.#') that invalidate the route's tags
+class CachePolicy:
+    __slots__ = ('ttl', 'vary', 'tags', 'invalidate_on')
+
+    def __init__(self, ttl: float, vary: Iterable[str] = (), tags: Iterable[str] = (), invalidate_on: Iterable[str] = ()):
+        if ttl <= 0:
+            raise ValueError("Response cache ttl must be positive")
+        for part in vary:
+            if part != 'query' and part.partition(':')[0] not in ('cookie', 'header'):
+                raise ValueError(f"Unknown vary key '{part}', expected 'query', 'cookie:<name>' or 'header:<name>'")
+        self.ttl = ttl
+        self.vary = tuple(vary)
+        self.tags = tuple(tags)
+        self.invalidate_on = tuple(invalidate_on)
+
+    @classmethod
+    def from_options(cls, options: Dict[str, Any], template: str) -> 'CachePolicy':
+        unknown = set(options) - {'ttl', 'vary', 'tags', 'invalidate_on'}
+        if unknown:
+            raise ValueError(f"Unknown cache options for '{template}': {', '.join(sorted(unknown))}")
+        if 'ttl' not in options:
+            raise ValueError(f"Cache options for '{template}' need a ttl")
+        return cls(options['ttl'], options.get('vary', ()), options.get('tags') or (template,), options.get('invalidate_on', ()))
+
+    # The same policy, with the request parts added to vary
+    def varying_on(self, *parts: str) -> 'CachePolicy':
+        missing = [part for part in parts if part not in self.vary]
+        if not missing:
+            return self
+        return CachePolicy(self.ttl, self.vary + tuple(missing), self.tags, self.invalidate_on)
+
+
+# A finished response as sent to the client: enough to send it again without running the handler
+class CachedResponse:
+    __slots__ = ('status', 'headers', 'content_type', 'body', 'tags', 'ttl', 'stored_at', 'expires_at', 'size')
+
+    def __init__(self, status: int, headers: List[Tuple[bytes, bytes]], content_type: str, body: bytes,
+                 tags: Tuple[str, ...], ttl: float, stored_at: float):
+        self.status = status
+        self.headers = headers
+        self.content_type = content_type
+        self.body = body
+        self.tags = tags
+        self.ttl = ttl
+        self.stored_at = stored_at  # Wall clock, shared with the other workers through Redis
+        self.expires_at = time.monotonic() + ttl - (time.time() - stored_at)
+        self.size = len(body) + sum(len(name) + len(value) for name, value in headers)
+
+    def to_response(self) -> Response:
+        return Response(content=self.body, status_code=self.status, headers=list(self.headers), content_type=self.content_type)
+
+    def dumps(self) -> str:
+        return json.dumps({
+            'status': self.status,
+            'headers': [[name.decode('latin-1'), value.decode('latin-1')] for name, value in self.headers],
+            'content_type': self.content_type,
+            'body': base64.b64encode(self.body).decode('ascii'),
+            'tags': list(self.tags),
+            'ttl': self.ttl,
+            'stored_at': self.stored_at,
+        })
+
+    @classmethod
+    def loads(cls, data: str) -> 'CachedResponse':
+        entry = json.loads(data)
+        headers = [(name.encode('latin-1'), value.encode('latin-1')) for name, value in entry['headers']]
+        return cls(entry['status'], headers, entry['content_type'], base64.b64decode(entry['body']),
+                   tuple(entry['tags']), entry['ttl'], entry['stored_at'])
+
+
+# Route-level response cache. Entries live in an in-memory LRU bounded by the bytes of their bodies and
+# headers, and optionally in Redis so that the other workers (and restarted ones) can serve them too.
+# Invalidation is by tag: invalidate_on() ties event names to tags, so e.g. a 'book.updated' event going
+# through the EventBus drops every cached page tagged 'books'. The Redis tier keeps the time of the last
+# invalidation of each tag, and an entry read from Redis that is older than one of its tags is a miss.
+class ResponseCacheService:
+    def __init__(self, event_bus: EventBus, max_bytes: int = 16 * 1024 * 1024, redis_service: Optional['RedisService'] = None,
+                 key_prefix: str = 'response-cache:'):
+        self.event_bus = event_bus
+        self.max_bytes = max_bytes
+        self.redis_service = redis_service
+        self.key_prefix = key_prefix
+        self._entries: 'OrderedDict[str, CachedResponse]' = OrderedDict()
+        self._keys_by_tag: Dict[str, Set[str]] = {}
+        self._watched: Dict[str, Set[str]] = {}  # Event name -> tags it invalidates
+        self.size = 0  # Bytes held in memory
+        self.hits = 0
+        self.misses = 0
+
+    # Cache key of a request for a route: the method, the path and the request parts listed in vary
+    @staticmethod
+    def key_for(request, policy: CachePolicy) -> str:
+        parts = [request.method, request.path]
+        for part in policy.vary:
+            if part == 'query':
+                parts.append(request.query_string.decode('latin-1'))
+            else:
+                kind, _, name = part.partition(':')
+                if kind == 'cookie':
+                    parts.append(request.cookies.get(name, ''))
+                else:
+                    parts.append(request.headers.get(name.lower(), ''))
+        return '\x1f'.join(parts)
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self._discard(key)
+        if self.redis_service is not None:
+            entry = await self._get_from_redis(key)
+            if entry is not None:
+                self._store(key, entry)
+                self.hits += 1
+                return entry
+        self.misses += 1
+        return None
+
+    # Keep the finished response of a request, as sent after the middleware. Only successful responses that set
+    # no cookie are cached: a Set-Cookie header belongs to one client.
+    async def set(self, key: str, response: Response, policy: CachePolicy):
+        if response.status_code != 200:
+            return
+        response._encode_content()
+        if any(name.lower() == b'set-cookie' for name, _ in response.headers):
+            return
+        headers = [(name, value) for name, value in response.headers
+                   if name != b'content-type' and not name.lower().startswith(PER_REQUEST_HEADER_PREFIXES)]
+        entry = CachedResponse(response.status_code, headers, response.content_type, response.body, policy.tags,
+                               policy.ttl, time.time())
+        self._store(key, entry)
+        if self.redis_service is not None:
+            try:
+                await self.redis_service.set_cache(self.key_prefix + key, entry.dumps(), expiration=math.ceil(policy.ttl))
+            except Exception as e:
+                logger.warning("Could not store response %s in Redis: %s", key, e)
+
+    # Drop the entries of the tags in memory, and record the invalidation for the entries kept in Redis
+    async def invalidate(self, *tags: str):
+        for tag in tags:
+            for key in list(self._keys_by_tag.get(tag, ())):
+                self._discard(key)
+        if self.redis_service is not None:
+            now = time.time()
+            for tag in tags:
+                try:
+                    await self.redis_service.set_cache(f"{self.key_prefix}tag:{tag}", str(now), expiration=86400)
+                except Exception as e:
+                    logger.warning("Could not record the invalidation of tag %s in Redis: %s", tag, e)
+
+    # Invalidate the tags whenever an event matching event_name is published
+    def invalidate_on(self, event_name: str, tags: Iterable[str]):
+        watched = self._watched.get(event_name)
+        if watched is None:
+            watched = self._watched[event_name] = set()
+            self.event_bus.subscribe(event_name, self._make_invalidator(watched))
+        watched.update(tags)
+
+    def _make_invalidator(self, tags: Set[str]):
+        async def invalidate(event: Event):
+            logger.debug("Event %s invalidates cached responses tagged %s", event.name, sorted(tags))
+            await self.invalidate(*tags)
+        return invalidate
+
+    def clear(self):
+        self._entries.clear()
+        self._keys_by_tag.clear()
+        self.size = 0
+
+    def _store(self, key: str, entry: CachedResponse):
+        if entry.size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._discard(key)
+        self._entries[key] = entry
+        self.size += entry.size
+        for tag in entry.tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+        while self.size > self.max_bytes:
+            self._discard(next(iter(self._entries)))
+
+    def _discard(self, key: str):
+        entry = self._entries.pop(key)
+        self.size -= entry.size
+        for tag in entry.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+    async def _get_from_redis(self, key: str) -> Optional[CachedResponse]:
+        try:
+            data = await self.redis_service.get_cache(self.key_prefix + key)
+            if data is None:
+                return None
+            entry = CachedResponse.loads(data)
+            if entry.expires_at <= time.monotonic():
+                return None
+            for tag in entry.tags:
+                invalidated_at = await self.redis_service.get_cache(f"{self.key_prefix}tag:{tag}")
+                if invalidated_at is not None and float(invalidated_at) >= entry.stored_at:
+                    return None
+        except Exception as e:
+            logger.warning("Could not read response %s from Redis: %s", key, e)
+            return None
+        return entry
+
+    def info(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries), 'bytes': self.size,
+                'max_bytes': self.max_bytes}
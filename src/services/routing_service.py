@@ -1,43 +1,127 @@
-import re
 import os
 
-from typing import Callable, Dict, Union, List, Optional
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Union, List, Optional, Tuple
 
-from src.core.static_handler import StaticFilesHandler
 from src.core.event_bus import Event, EventBus
+from src.core.converters import get_converter
+from src.core.route_tree import PARAMETER, RouteTree, UrlBuilder
 from src.services.config_service import ConfigService
-from src.services.jwt_service import JWTService
+from src.services.response_cache_service import CachePolicy, ResponseCacheService
 from src.services.security.authentication_service import AuthenticationService
 
+if TYPE_CHECKING:
+    from src.core.static_handler import StaticFilesHandler
+    from src.services.jwt_service import JWTService
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+_MISS = object()
+
+
+# Everything the router needs about one route, compiled when the route is added: a request then gets its
+# handler, a 405 (with the Allow header ready) or a 404 without scanning any list
+class RouteRecord:
+    __slots__ = ('template', 'regex_path', 'handlers', 'requires_auth', 'requires_jwt_auth', 'allow', 'middleware', 'chain',
+                 'cache')
+
+    def __init__(self, template: str, regex_path: str):
+        self.template = template
+        self.regex_path = regex_path
+        self.handlers: Dict[str, Callable] = {}  # Method -> handler; also exposed as routes[regex_path]
+        self.requires_auth = False
+        self.requires_jwt_auth = False
+        self.allow = b''  # Value of the Allow header of a 405 response
+        self.middleware: Optional[Tuple[str, ...]] = None  # Declared with add_route(middleware=...)
+        self.chain: Optional[Tuple[str, ...]] = None  # Middleware the route's requests go through; None for all
+        self.cache: Optional[CachePolicy] = None  # Declared with add_route(cache=...)
+
+    def update_allow(self):
+        self.allow = ', '.join(sorted(method for method in self.handlers if method != 'WEBSOCKET')).encode()
+
 
 class RoutingService:
-    def __init__(self, event_bus: EventBus, auth_service: AuthenticationService, jwt_service: Optional[JWTService], config_service: ConfigService = ConfigService()):
+    def __init__(self, event_bus: EventBus, auth_service: AuthenticationService, jwt_service: Optional['JWTService'], config_service: ConfigService = ConfigService(),
+                 response_cache: Optional[ResponseCacheService] = None):
         self.event_bus = event_bus
         self.auth_service = auth_service
         self.jwt_service = jwt_service
         self.config_service = config_service
+        # Finished responses of the routes added with cache={...}; an in-memory one is created if needed
+        self.response_cache = response_cache
         self.routes: Dict[str, Dict[str, Callable]] = {}
+        self.records: Dict[str, RouteRecord] = {}
+        # Matches request paths to their RouteRecord
+        self.route_tree = RouteTree()
+        # LRU of resolved routes: (method, path) -> (record, path_params) or None. Cleared whenever routes change.
+        self._match_cache: 'OrderedDict[Tuple[str, str], Any]' = OrderedDict()
+        self.match_cache_size = 1024  # ROUTE_CACHE_SIZE, 0 disables the cache
+        self.match_cache_hits = 0
+        self.match_cache_misses = 0
+        # Route name -> URL builder compiled from the route's template, see url_for
+        self.url_builders: Dict[str, UrlBuilder] = {}
         self.patterns = {
             r'<int:(\w+)>': r'(?P<\1>[0-9]+)',
             r'<str:(\w+)>': r'(?P<\1>[^/]+)',
             r'<(\w+)>': r'(?P<\1>[^/]+)',  # General pattern for other types
         }
+        # Path prefix -> names of the middleware of the routes under it, unless a route declares its own
+        self.route_groups: Dict[str, Tuple[str, ...]] = {}
+        # Static files skip the middleware: no session lookup or CSRF check for assets
+        self.static_middleware: Tuple[str, ...] = ()
+        # Checks the middleware names of new routes, set by MiddlewareService.use_router
+        self.check_middleware: Optional[Callable[[Iterable[str]], None]] = None
         self.authenticated_routes: List[str] = []
         self.jwt_authenticated_routes: List[str] = []  # New list for JWT protected routes
-        self.static_handler = StaticFilesHandler(static_dir="static", static_url_path="/static", event_bus=event_bus)
+        self._static_handler: Optional['StaticFilesHandler'] = None  # Built on first use, see static_handler
+
+    # The static file handler (and aiofiles) is only loaded once static files are configured or served
+    @property
+    def static_handler(self) -> 'StaticFilesHandler':
+        if self._static_handler is None:
+            self._static_handler = self._create_static_handler("static", "/static")
+        return self._static_handler
+
+    @static_handler.setter
+    def static_handler(self, handler: 'StaticFilesHandler'):
+        self._static_handler = handler
+
+    def _create_static_handler(self, static_dir: str, static_url_path: str) -> 'StaticFilesHandler':
+        from src.core.static_handler import StaticFilesHandler
+        return StaticFilesHandler(static_dir=static_dir, static_url_path=static_url_path, event_bus=self.event_bus)
 
     async def initialize(self):
         static_dir = self.config_service.get('STATIC_DIR', 'static')
         static_url_path = self.config_service.get('STATIC_URL_PATH', '/static')
+        self.match_cache_size = self.config_service.get('ROUTE_CACHE_SIZE', self.match_cache_size)
         self.setup_static_routes(static_dir, static_url_path)
         await self.start_routing()
 
-    def add_route(self, path: str, methods: Union[str, List[str]], handler: Callable, requires_auth: bool = False, requires_jwt_auth: bool = False):
+    # middleware: names of the middleware the route's requests go through (see MiddlewareService.register_middleware),
+    # [] for none; by default those of the longest matching route group, or all of them
+    # cache: serve GET requests from the response cache, e.g. {"ttl": 30, "vary": ["query", "cookie:lang"],
+    # "invalidate_on": ["book.#"]}; see CachePolicy. Authenticated routes also vary on the session cookie or the
+    # Authorization header, so that a user never gets the page of another.
+    def add_route(self, path: str, methods: Union[str, List[str]], handler: Callable, requires_auth: bool = False, requires_jwt_auth: bool = False,
+                  name: Optional[str] = None, middleware: Optional[List[str]] = None, cache: Optional[Dict[str, Any]] = None):
         # Convert the path to a regex pattern
         regex_path = self._convert_path_to_regex(path)
+        if name is not None:
+            self._name_route(name, path)
 
-        if regex_path not in self.routes:
-            self.routes[regex_path] = {}
+        if middleware is not None and self.check_middleware is not None:
+            self.check_middleware(middleware)
+        record = self._get_record(path, regex_path)
+        if middleware is not None:
+            record.middleware = tuple(middleware)
+            record.chain = record.middleware
+        if cache is not None:
+            record.cache = CachePolicy.from_options(cache, path)
+            if self.response_cache is None:
+                self.response_cache = ResponseCacheService(self.event_bus)
+            for event_name in record.cache.invalidate_on:
+                self.response_cache.invalidate_on(event_name, record.cache.tags)
 
         if isinstance(methods, str):
             methods = [methods.upper()]
@@ -45,50 +129,153 @@ class RoutingService:
             methods = [method.upper() for method in methods]
 
         for method in methods:
-            self.routes[regex_path] = self.routes.get(regex_path, {})
-            self.routes[regex_path][method] = handler
+            record.handlers[method] = handler
 
             # If session-based authentication is required, add the path to the authenticated routes list
             if requires_auth:
+                record.requires_auth = True
                 self.authenticated_routes.append(regex_path)
             # If JWT authentication is required, add the path to the JWT authenticated routes list
             if requires_jwt_auth and self.jwt_service:
+                record.requires_jwt_auth = True
                 self.jwt_authenticated_routes.append(regex_path)
+        if record.cache is not None:
+            # A page behind authentication belongs to one user: key it by the session or the bearer token
+            if record.requires_auth:
+                record.cache = record.cache.varying_on('cookie:session_id')
+            if record.requires_jwt_auth:
+                record.cache = record.cache.varying_on('header:authorization')
+        record.update_allow()
+        self._match_cache.clear()
+
+    def _get_record(self, path: str, regex_path: str) -> RouteRecord:
+        record = self.records.get(regex_path)
+        if record is None:
+            record = self.records[regex_path] = RouteRecord(path, regex_path)
+            record.chain = self._group_middleware(path)
+            self.routes[regex_path] = record.handlers
+            self.route_tree.add(path, record)
+        return record
+
+    # Default middleware for the routes under a path prefix, e.g. add_route_group('/api', ['CORSMiddleware'])
+    def add_route_group(self, prefix: str, middleware: List[str]):
+        if self.check_middleware is not None:
+            self.check_middleware(middleware)
+        self.route_groups[prefix.rstrip('/')] = tuple(middleware)
+        for record in self.records.values():
+            if record.middleware is None:
+                record.chain = self._group_middleware(record.template)
+
+    # Every middleware name used by the routes, the route groups and the static files
+    def middleware_names(self) -> set:
+        names = set(self.static_middleware)
+        for middleware in self.route_groups.values():
+            names.update(middleware)
+        for record in self.records.values():
+            names.update(record.middleware or ())
+        return names
+
+    def _group_middleware(self, path: str) -> Optional[Tuple[str, ...]]:
+        best = None
+        for prefix in self.route_groups:
+            if (path == prefix or path.startswith(prefix + '/')) and (best is None or len(prefix) > len(best)):
+                best = prefix
+        return None if best is None else self.route_groups[best]
+
+    # Names of the middleware for the request of the event, None for all; see MiddlewareService.use_router.
+    # The route found is kept in the event, so that route_event does not match the path again.
+    def middleware_for(self, event: Event) -> Optional[Tuple[str, ...]]:
+        request = event.data.get('request')
+        if request is None:
+            return None
+        path = request.path
+        if path.startswith(self.static_handler.static_url_path):
+            return self.static_middleware
+        method = request.method
+        match = self._resolve(method, path)
+        event.data['route_match'] = (method, path, match)
+        if match is None:
+            return self._group_middleware(path)
+        return match[0].chain
+
+    # The route handling the method for the path and its parameters, or None. Most traffic goes to a few
+    # hundred concrete paths, so the answer is kept in a bounded LRU and repeat requests skip the tree.
+    def _resolve(self, method: str, path: str) -> Optional[Tuple[RouteRecord, Dict[str, Any]]]:
+        key = (method, path)
+        match = self._match_cache.get(key, _MISS)
+        if match is not _MISS:
+            self.match_cache_hits += 1
+            self._match_cache.move_to_end(key)
+        else:
+            self.match_cache_misses += 1
+            match = self.route_tree.match(path, lambda record: method in record.handlers)
+            if self.match_cache_size > 0:
+                self._match_cache[key] = match
+                if len(self._match_cache) > self.match_cache_size:
+                    self._match_cache.popitem(last=False)
+        # The handler gets its own path_params: changing them must not change the cached entry
+        return None if match is None else (match[0], dict(match[1]))
+
+    # Counters to size ROUTE_CACHE_SIZE: a low hit rate with a full cache calls for a bigger one
+    def match_cache_info(self) -> Dict[str, int]:
+        return {
+            'hits': self.match_cache_hits,
+            'misses': self.match_cache_misses,
+            'size': len(self._match_cache),
+            'max_size': self.match_cache_size,
+        }
 
     def setup_static_routes(self, static_dir: str, static_url_path: str = "/static"):
         # Convert static_dir to an absolute path
         static_dir_abs = os.path.abspath(static_dir)
         # Initialize StaticFilesHandler with the provided directory and URL path
-        self.static_handler = StaticFilesHandler(static_dir=static_dir_abs, static_url_path=static_url_path, event_bus=self.event_bus)
+        self.static_handler = self._create_static_handler(static_dir_abs, static_url_path)
 
         # Convert the static path to a regex
         static_regex = r'^/static/(?P<filename>.+)$'
-        self.routes[static_regex] = {
-            'GET': self.static_handler.handle
-        }
+        record = self._get_record('/static/<path:filename>', static_regex)
+        record.handlers['GET'] = self.static_handler.handle
+        record.middleware = record.chain = self.static_middleware
+        self._match_cache.clear()
+        record.update_allow()
+        self.url_builders['static'] = UrlBuilder(f"{static_url_path.rstrip('/')}/<path:filename>")
+
+    def _name_route(self, name: str, path: str):
+        builder = self.url_builders.get(name)
+        if builder is not None and builder.template != path:
+            raise ValueError(f"Route name '{name}' is already used for '{builder.template}'")
+        if builder is None:
+            self.url_builders[name] = UrlBuilder(path)
+
+    # Build the URL of a named route, e.g. url_for('admin_edit_user', id=3) -> '/admin/users/3/edit'.
+    # Parameters that are not part of the route are added as the query string.
+    def url_for(self, name: str, **params) -> str:
+        builder = self.url_builders.get(name)
+        if builder is None:
+            raise ValueError(f"No route named '{name}'")
+        return builder.build(params)
 
     def _convert_path_to_regex(self, path: str) -> str:
         def replace(match):
-            full_match = match.group(0)
-            if full_match.startswith('<int:'):
-                param_name = full_match[5:-1]
-                return fr'(?P<{param_name}>[0-9]+)'
-            elif full_match.startswith('<str:'):
-                param_name = full_match[5:-1]
-                return fr'(?P<{param_name}>[^/]+)'
-            else:
-                param_name = full_match[1:-1]
-                return fr'(?P<{param_name}>[^/]+)'
+            param_name = match.group(2)
+            return fr'(?P<{param_name}>{get_converter(match.group(1), path).regex})'
 
-        return f'^{re.sub(r"<[^>]+>", replace, path)}$'
+        return f'^{PARAMETER.sub(replace, path)}$'
 
     def remove_route(self, path: str, method: str):
         method = method.upper()
         regex_path = self._convert_path_to_regex(path)
-        if regex_path in self.routes and method in self.routes[regex_path]:
-            del self.routes[regex_path][method]
-            if not self.routes[regex_path]:  # Remove path if no methods remain
+        record = self.records.get(regex_path)
+        if record is not None and method in record.handlers:
+            del record.handlers[method]
+            record.update_allow()
+            self._match_cache.clear()
+            if not record.handlers:  # Remove path if no methods remain
                 del self.routes[regex_path]
+                del self.records[regex_path]
+                self.route_tree.remove(path)
+                for name in [name for name, builder in self.url_builders.items() if builder.template == path]:
+                    del self.url_builders[name]
 
     async def route_event(self, event: Event):
         # Access the request object from the event
@@ -107,45 +294,68 @@ class RoutingService:
             event.data['path_params'] = {'filename': filename}
             return await self.static_handler.handle(event)
 
-        # Check for matching route
-        for regex_path, methods in self.routes.items():
-            match = re.match(regex_path, path)
-            if match:
-                if method in methods:
-                    # Extract path parameters from the regex match and add to event.data['path_params']
-                    event.data['path_params'] = match.groupdict()
-
-                    # Check if session-based authentication is required
-                    if regex_path in self.authenticated_routes:
-                        # Check if user is logged in (i.e., session contains user_id)
-                        session = event.data.get('session')
-                        if not session or not session.get('user_id'):
-                            return await self.auth_service.send_unauthorized(event)
-
-                    # Check if JWT-based authentication is required
-                    if regex_path in self.jwt_authenticated_routes:
-                        auth_header = request.headers.get('authorization')
-                        if not auth_header or not auth_header.startswith('Bearer '):
-                            return await self.auth_service.send_unauthorized(event)
-
-                        token = auth_header.split(" ")[1]
-                        if self.jwt_service:
-                            try:
-                                payload = await self.jwt_service.validate_token(token)
-                                event.data["user"] = payload
-                            except ValueError:
-                                return await self.auth_service.send_unauthorized(event)
-
-                    # If authentication is not required or the user is logged in, proceed with the request
-                    handler = methods[method]
-                    return await handler(event)
-                else:
-                    print(f"Method {method} not allowed for {path}")
-                    # Send 405 Method Not Allowed response
-                    await self.send_405(event)
-                    return  # Ensure no further processing happens
-
-        await self.handle_404(event)
+        # Find the first route for the path that handles the method, unless middleware_for() already did
+        route_match = event.data.get('route_match')
+        if route_match is not None and route_match[0] == method and route_match[1] == path:
+            match = route_match[2]
+        else:
+            match = self._resolve(method, path)
+        if match is None:
+            records = self.route_tree.match_all(path)
+            if not records:
+                return await self.handle_404(event)
+            logger.debug("Method %s not allowed for %s", method, path)
+            # Send 405 Method Not Allowed response, listing the methods of every route for the path
+            if len(records) == 1:
+                event.data['allow'] = records[0].allow
+            else:
+                methods = {method for record in records for method in record.handlers if method != 'WEBSOCKET'}
+                event.data['allow'] = ', '.join(sorted(methods)).encode()
+            return await self.send_405(event)
+
+        record, path_params = match
+        # Add the path parameters, parsed by their converters, to event.data['path_params']
+        event.data['path_params'] = path_params
+
+        # Check if session-based authentication is required
+        if record.requires_auth:
+            # Check if user is logged in (i.e., session contains user_id)
+            session = event.data.get('session')
+            if not session or not session.get('user_id'):
+                return await self.auth_service.send_unauthorized(event)
+
+        # Check if JWT-based authentication is required
+        if record.requires_jwt_auth:
+            auth_header = request.headers.get('authorization')
+            if not auth_header or not auth_header.startswith('Bearer '):
+                return await self.auth_service.send_unauthorized(event)
+
+            token = auth_header.split(" ")[1]
+            if self.jwt_service:
+                try:
+                    payload = await self.jwt_service.validate_token(token)
+                    event.data["user"] = payload
+                except ValueError:
+                    return await self.auth_service.send_unauthorized(event)
+
+        # If authentication is not required or the user is logged in, proceed with the request
+        handler = record.handlers[method]
+        if record.cache is not None and method == 'GET':
+            return await self._handle_cached(event, record.cache, handler)
+        return await handler(event)
+
+    # Send the cached response if there is one, without running the handler; otherwise run it and cache its response
+    async def _handle_cached(self, event: Event, policy: CachePolicy, handler: Callable):
+        key = self.response_cache.key_for(event.data['request'], policy)
+        entry = await self.response_cache.get(key)
+        if entry is not None:
+            event.data['response'] = entry.to_response()
+            return
+        result = await handler(event)
+        if not event.data.get('response_already_sent'):
+            # Stored as sent, once the middleware has added its headers and cookies; see MiddlewareService.execute
+            event.data['cache_response'] = lambda response: self.response_cache.set(key, response, policy)
+        return result
 
     async def send_405(self, event: Event):
         send = event.data.get('send')
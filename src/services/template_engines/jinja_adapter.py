@@ -1,20 +1,35 @@
 import os
 
-from jinja2 import Environment, FileSystemLoader, TemplateNotFound
+from jinja2 import Environment, FileSystemLoader, TemplateNotFound, TemplateError
+
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 class JinjaAdapter:
+    # Environments are shared per template directory, so compiled templates survive across
+    # the (transient) TemplateService instances created for each request.
+    _environments = {}
+
     def __init__(self, template_dir='templates'):
         self.template_dir = template_dir
-        self.env = Environment(loader=FileSystemLoader(template_dir))
+        self.env = self._get_environment(template_dir)
+
+    @classmethod
+    def _get_environment(cls, template_dir):
+        env = cls._environments.get(template_dir)
+        if env is None:
+            env = Environment(loader=FileSystemLoader(template_dir))
+            cls._environments[template_dir] = env
+        return env
 
     def render(self, template_path: str, context: dict) -> str:
         try:
             # If the template_path is an absolute path, load it directly
             if os.path.isabs(template_path):
-                # Create a temporary FileSystemLoader for the specific template file
-                template_loader = FileSystemLoader(os.path.dirname(template_path))
-                template_env = Environment(loader=template_loader)
+                # Use the shared environment of the template's own directory
+                template_env = self._get_environment(os.path.dirname(template_path))
                 template = template_env.get_template(os.path.basename(template_path))
             else:
                 # If it's a relative path, use the standard environment loader
@@ -22,3 +37,14 @@ class JinjaAdapter:
             return template.render(context)
         except TemplateNotFound:
             raise FileNotFoundError(f"Template '{template_path}' not found.")
+
+    # Compile every template up front so the first requests do not pay the compilation cost
+    def preload(self) -> int:
+        loaded = 0
+        for template_name in self.env.list_templates():
+            try:
+                self.env.get_template(template_name)
+                loaded += 1
+            except TemplateError as e:
+                logger.error("Error precompiling template %s: %s", template_name, e)
+        return loaded
@@ -1,13 +1,39 @@
+import os
+
 from mako.lookup import TemplateLookup
 from typing import Dict
 
+from src.core.logger import get_logger
 from src.services.template_engines.template_engine import TemplateEngine
 
+logger = get_logger(__name__)
+
 
 class MakoAdapter(TemplateEngine):
+    # Lookups are shared per template directory, so compiled templates survive across
+    # the (transient) TemplateService instances created for each request.
+    _lookups = {}
+
     def __init__(self, template_dir: str):
-        self.lookup = TemplateLookup(directories=[template_dir])
+        self.template_dir = template_dir
+        self.lookup = self._lookups.get(template_dir)
+        if self.lookup is None:
+            self.lookup = TemplateLookup(directories=[template_dir])
+            self._lookups[template_dir] = self.lookup
 
     def render(self, template_name: str, context: Dict[str, str]) -> str:
         template = self.lookup.get_template(template_name)
         return template.render(**context)
+
+    # Compile every template up front so the first requests do not pay the compilation cost
+    def preload(self) -> int:
+        loaded = 0
+        for root, _, files in os.walk(self.template_dir):
+            for file_name in files:
+                template_name = os.path.relpath(os.path.join(root, file_name), self.template_dir)
+                try:
+                    self.lookup.get_template(template_name.replace(os.sep, '/'))
+                    loaded += 1
+                except Exception as e:
+                    logger.error("Error precompiling template %s: %s", template_name, e)
+        return loaded
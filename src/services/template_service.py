@@ -1,24 +1,40 @@
+import importlib
 import os.path
-from typing import Dict, Type
+from typing import Dict, Type, Union
 
-from src.services.template_engines.jinja_adapter import JinjaAdapter
-from src.services.template_engines.mako_adapter import MakoAdapter
 from src.services.config_service import ConfigService
 from src.services.template_engines.template_engine import TemplateEngine
 
-# Mapping of template engine names to their classes
-TEMPLATE_ENGINES: Dict[str, Type[TemplateEngine]] = {
-    'JinjaAdapter': JinjaAdapter,
-    'MakoAdapter': MakoAdapter,
+# Mapping of template engine names to their classes, as dotted paths: an engine and its template
+# library are only imported when a TemplateService first uses it
+TEMPLATE_ENGINES: Dict[str, Union[str, Type[TemplateEngine]]] = {
+    'JinjaAdapter': 'src.services.template_engines.jinja_adapter.JinjaAdapter',
+    'MakoAdapter': 'src.services.template_engines.mako_adapter.MakoAdapter',
     # Add other template engines here if needed
 }
+DEFAULT_TEMPLATE_ENGINE = 'JinjaAdapter'
+
+_engine_classes: Dict[str, Type[TemplateEngine]] = {}
+
+
+# Resolve a template engine class by name (a TEMPLATE_ENGINES key) or by dotted path.
+# Unknown names fall back to the default engine.
+def load_template_engine(name: str) -> Type[TemplateEngine]:
+    engine_class = _engine_classes.get(name)
+    if engine_class is None:
+        target = TEMPLATE_ENGINES.get(name) or (name if '.' in name else TEMPLATE_ENGINES[DEFAULT_TEMPLATE_ENGINE])
+        if isinstance(target, str):
+            module_name, _, class_name = target.rpartition('.')
+            target = getattr(importlib.import_module(module_name), class_name)
+        engine_class = _engine_classes[name] = target
+    return engine_class
 
 
 class TemplateService:
     def __init__(self, config_service: ConfigService = ConfigService()):
         self.config_service = config_service
-        engine_name = config_service.get('TEMPLATE_ENGINE', 'JinjaAdapter')
-        engine_class = TEMPLATE_ENGINES.get(engine_name, JinjaAdapter)  # Default to JinjaAdapter if not found
+        engine_name = config_service.get('TEMPLATE_ENGINE', DEFAULT_TEMPLATE_ENGINE)
+        engine_class = load_template_engine(engine_name)
         template_dir = config_service.get('TEMPLATE_DIR', 'templates')
         self.engine = engine_class(template_dir=template_dir)
 
@@ -27,3 +43,8 @@ class TemplateService:
             return self.engine.render(template_name, context)
         except Exception as e:
             return f"Error rendering template {template_name}: {e}"
+
+    # Precompile the engine's templates, if the engine supports it
+    def preload(self) -> int:
+        preload = getattr(self.engine, 'preload', None)
+        return preload() if preload else 0
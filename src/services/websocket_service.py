@@ -2,6 +2,9 @@ import asyncio
 from typing import List, Set, Callable, Awaitable
 
 from src.services.websocket_handler import WebSocketHandler
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 # Manages multiple WebSocket client connections, providing shared services like broadcasting messages,
@@ -38,11 +41,11 @@ class WebSocketService:
             pass
         except RuntimeError as e:
             if "websocket.close" not in str(e):
-                print(f"WebSocket RuntimeError during shutdown: {e}")
+                logger.warning("WebSocket RuntimeError during shutdown: %s", e)
         except Exception as e:
-            print(f"WebSocket error: {e}")
+            logger.error("WebSocket error: %s", e)
         finally:
-            print("Finally block reached")
+            logger.debug("WebSocket listener finished, terminating client connection")
             await self.terminate_client_connection(client)
 
     # Wrapped by listen
@@ -51,7 +54,7 @@ class WebSocketService:
 
         if message is None or message.lower() in {"disconnect", "exit"}:
             if message:
-                print(f"Received {message}, closing WebSocket connection.")
+                logger.debug("Received %s, closing WebSocket connection.", message)
             return True  # Signal to break the loop
         elif message.lower() == "ping":
             await client.send_websocket_message("pong")
@@ -67,7 +70,7 @@ class WebSocketService:
             pass
         except Exception as close_error:
             if "websocket.close" not in str(close_error):
-                print(f"Error during WebSocket closure: {close_error}")
+                logger.error("Error during WebSocket closure: %s", close_error)
 
     # Add a WebSocket client to the connected clients list
     def add_client(self, client: WebSocketHandler) -> None:
@@ -84,14 +87,14 @@ class WebSocketService:
         clients_to_remove = []
         for client in self.clients:
             if not client.connection_accepted:
-                print(f"Skipping client {client}: connection not accepted.")
+                logger.debug("Skipping client %s: connection not accepted.", client)
                 # Add client to the removal list if connection is closed
                 clients_to_remove.append(client)
                 continue
             try:
                 await client.send_websocket_message(message)
             except Exception as e:
-                print(f"Error broadcasting message to {client}: {e}")
+                logger.warning("Error broadcasting message to %s: %s", client, e)
                 # Add client to the removal list if sending the message failed
                 clients_to_remove.append(client)
 
@@ -112,12 +115,12 @@ class WebSocketService:
             try:
                 # Check if the connection is already closed before sending the shutdown message
                 if client.connection_accepted:
-                    print(f"Notifying {client} about server shutdown.")
+                    logger.debug("Notifying %s about server shutdown.", client)
                     await client.send_websocket_message("Server is shutting down. Closing connection.")
                 else:
-                    print(f"Skipping client {client}: connection already closed.")
+                    logger.debug("Skipping client %s: connection already closed.", client)
             except Exception as e:
-                print(f"Error notifying client {client}: {e}")
+                logger.warning("Error notifying client %s: %s", client, e)
 
             # Mark the client for removal regardless of whether the notification was successful
             clients_to_remove.append(client)
@@ -125,9 +128,19 @@ class WebSocketService:
         # Remove inactive clients and clear the list after shutdown
         await self._remove_inactive_clients(clients_to_remove)
 
+    # Close every accepted client connection and forget all clients, used when the worker shuts down
+    async def shutdown(self) -> None:
+        async with self._lock:
+            clients, self.clients = self.clients, []
+        for client in clients:
+            try:
+                await self.terminate_client_connection(client)
+            except Exception as e:
+                logger.warning("Error closing client %s: %s", client, e)
+
     # Reset the singleton's state for testing purposes
     def reset(self):
         self._initialized = False  # Allow re-initialization
         self.clients = []
         self._lock = asyncio.Lock()
-        print(f"WebSocketService at {hex(id(self))} has been reset.")
\ No newline at end of file
+        logger.debug("WebSocketService at %s has been reset.", hex(id(self)))
\ No newline at end of file
@@ -0,0 +1,21 @@
+import pytest
+from unittest.mock import AsyncMock
+
+from src.core.event_bus import Event, EventBus
+from src.core.request import Request
+from src.services.routing_service import RoutingService
+
+
+# A RoutingService with its own EventBus and no JWT service
+@pytest.fixture
+def routing_service():
+    return RoutingService(event_bus=EventBus(), auth_service=AsyncMock(), jwt_service=None, config_service=AsyncMock())
+
+
+# Builds the 'http.request.received' event of a request, e.g. request_event('/books', query=b'page=2')
+@pytest.fixture
+def request_event():
+    def make(path, method='GET', query=b'', headers=None):
+        scope = {'path': path, 'method': method, 'query_string': query, 'headers': headers or []}
+        return Event(name='http.request.received', data={'request': Request(scope, AsyncMock()), 'send': AsyncMock()})
+    return make
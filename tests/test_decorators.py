@@ -148,3 +148,38 @@ async def test_inject_di_container_name_match(container):
     result = await example_function()
     assert result is container
     container.get.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_inject_analyses_signature_once(monkeypatch):
+    # Built singletons are read directly; other services still go through container.get
+    container = DIContainer()
+    container.reset()
+    mock_service = MockService()
+    container.register_singleton_instance(mock_service, 'MockService')
+    container.register_transient_class(AnotherService, 'AnotherService')
+    set_container(container)
+
+    @inject
+    async def example_function(arg1, mock_service: MockService, *, another_service: AnotherService):
+        return arg1, mock_service, another_service
+
+    await container.get('AnotherService')  # Cache the container's own constructor plan
+
+    def fail(*args, **kwargs):
+        raise AssertionError("inspect.signature should not be called per call")
+    monkeypatch.setattr(container, 'get', AsyncMock(wraps=container.get))
+    monkeypatch.setattr('src.core.decorators.inspect.signature', fail)
+    try:
+        arg1, injected, another = await example_function("Hello")
+        assert arg1 == "Hello"
+        assert injected is mock_service
+        assert isinstance(another, AnotherService)
+        container.get.assert_awaited_once_with('AnotherService')
+
+        # Positional arguments are not replaced
+        other = MockService()
+        _, injected, _ = await example_function("Hello", other)
+        assert injected is other
+    finally:
+        set_container(None)
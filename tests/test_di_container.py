@@ -1,7 +1,9 @@
+import asyncio
 from unittest.mock import AsyncMock
 
 import pytest
 
+from src.core.context_manager import request_scope
 from src.core.dicontainer import DIContainer
 
 
@@ -173,3 +175,211 @@ async def test_singleton_auto_wiring(di_container):
     else:
         assert db_service.config is config_service
         assert db_service.config.config_name == "singleton_config"
+
+
+class ReportService:
+    def __init__(self, service_a: ServiceA, LoggingService=None, title: str = "report"):
+        self.service_a = service_a
+        self.logging_service = LoggingService
+        self.title = title
+
+
+# Test that constructor plans are computed once and rebuilt when registrations change
+@pytest.mark.asyncio
+async def test_constructor_plan_is_cached_and_invalidated(di_container, monkeypatch):
+    di_container.reset()
+    di_container.register_transient_class(ServiceA, 'ServiceA')
+    di_container.register_transient_class(ReportService, 'ReportService')
+
+    report = await di_container.get('ReportService')
+    assert isinstance(report.service_a, ServiceA)
+    assert report.logging_service is None  # Not registered: the default is used
+    assert report.title == "report"
+    assert ReportService in di_container._plans
+
+    # Later resolutions reuse the plan instead of inspecting the constructor again
+    def fail(*args, **kwargs):
+        raise AssertionError("inspect.signature should not be called")
+    monkeypatch.setattr('src.core.dicontainer.inspect.signature', fail)
+    await di_container.get('ReportService')
+    monkeypatch.undo()
+
+    # Registering LoggingService changes how ReportService resolves
+    logging_service = LoggingService()
+    di_container.register_singleton_instance(logging_service, 'LoggingService')
+    assert di_container._plans == {}
+    report = await di_container.get('ReportService')
+    assert report.logging_service is logging_service
+
+
+class DbSession:
+    def __init__(self):
+        self.closed = False
+
+    async def aclose(self):
+        self.closed = True
+
+
+# Test that a scoped service is shared within a request, separate between requests and disposed at the end
+@pytest.mark.asyncio
+async def test_request_scoped_lifetime(di_container):
+    di_container.reset()
+    di_container.register_scoped_class(DbSession, 'DbSession')
+
+    async def handle_request():
+        async with request_scope():
+            first = await di_container.get('DbSession')
+            assert await di_container.get('DbSession') is first
+            assert di_container.get_sync('DbSession') is first
+            await asyncio.sleep(0)
+            assert not first.closed
+        return first
+
+    first, second = await asyncio.gather(handle_request(), handle_request())
+    assert first is not second
+    assert first.closed and second.closed
+
+    # Outside of a request each get() creates a fresh instance
+    assert await di_container.get('DbSession') is not await di_container.get('DbSession')
+
+
+
+# Test that concurrent first gets within one request keep one instance and dispose of the other
+@pytest.mark.asyncio
+async def test_request_scoped_race_disposes_extra_instance(di_container, monkeypatch):
+    di_container.reset()
+    di_container.register_scoped_class(DbSession, 'DbSession')
+    created = []
+    create_instance = di_container._create_instance
+
+    async def slow_create_instance(class_type):
+        instance = await create_instance(class_type)
+        created.append(instance)
+        await asyncio.sleep(0.01)  # As an async dependency would
+        return instance
+    monkeypatch.setattr(di_container, '_create_instance', slow_create_instance)
+
+    async with request_scope():
+        first, second = await asyncio.gather(di_container.get('DbSession'), di_container.get('DbSession'))
+        assert first is second
+        assert len(created) == 2
+        extra = created[1] if created[0] is first else created[0]
+        assert extra.closed and not first.closed
+    assert first.closed
+
+class Repository:
+    def __init__(self, session: DbSession):
+        self.session = session
+
+
+class CycleA:
+    def __init__(self, b: 'CycleB'):
+        self.b = b
+
+
+class CycleB:
+    def __init__(self, a: CycleA):
+        self.a = a
+
+
+# Test that freeze() validates the graph, builds singletons and serves instances synchronously
+@pytest.mark.asyncio
+async def test_freeze(di_container):
+    di_container.reset()
+    logging_service = LoggingService()
+    di_container.register_singleton_instance(logging_service, 'LoggingService')
+    di_container.register_singleton_class(ServiceA, 'ServiceA')
+    di_container.register_transient_class(ReportService, 'ReportService')
+
+    with pytest.raises(RuntimeError):
+        di_container.get_nowait('LoggingService')
+
+    await di_container.freeze()
+    try:
+        assert di_container.get_nowait('LoggingService') is logging_service
+        service_a = di_container.get_nowait('ServiceA')  # Built by freeze()
+        assert isinstance(service_a, ServiceA)
+        assert await di_container.get('ServiceA') is service_a
+        report = await di_container.get('ReportService')
+        assert report.service_a is service_a
+        with pytest.raises(Exception, match="requires async resolution"):
+            di_container.get_nowait('ReportService')
+        with pytest.raises(RuntimeError):
+            di_container.register_transient_class(ServiceA, 'Other')
+    finally:
+        di_container.reset()
+    assert not di_container.frozen
+
+
+@pytest.mark.asyncio
+async def test_freeze_rejects_invalid_graphs(di_container):
+    di_container.reset()
+    di_container.register_transient_class(CycleA, 'CycleA')
+    di_container.register_transient_class(CycleB, 'CycleB')
+    with pytest.raises(Exception, match="Circular dependency: CycleA -> CycleB -> CycleA"):
+        await di_container.freeze()
+
+    DIContainer()  # Re-initialise the registrations
+    di_container.register_transient_class(ReportService, 'ReportService')
+    with pytest.raises(Exception, match="Cannot resolve dependency 'ServiceA' for class ReportService"):
+        await di_container.freeze()
+
+    DIContainer()
+    di_container.register_scoped_class(DbSession, 'DbSession')
+    di_container.register_singleton_class(Repository, 'Repository')
+    with pytest.raises(Exception, match="cannot depend on request-scoped"):
+        await di_container.freeze()
+    assert not di_container.frozen
+    DIContainer()
+
+
+class ConnectionPool:
+    created = 0
+
+    def __init__(self, service_a: ServiceA):
+        ConnectionPool.created += 1
+        self.service_a = service_a
+
+
+# Test that concurrent first requests for a singleton share a single construction
+@pytest.mark.asyncio
+async def test_singleton_single_flight(di_container, monkeypatch):
+    di_container.reset()
+    di_container.register_transient_class(ServiceA, 'ServiceA')
+    di_container.register_singleton_class(ConnectionPool, 'ConnectionPool')
+    ConnectionPool.created = 0
+
+    create_instance = di_container._create_instance
+
+    # Make the construction yield to the event loop, as an async dependency would
+    async def slow_create_instance(class_type):
+        await asyncio.sleep(0.01)
+        return await create_instance(class_type)
+    monkeypatch.setattr(di_container, '_create_instance', slow_create_instance)
+
+    pools = await asyncio.gather(*(di_container.get('ConnectionPool') for _ in range(500)))
+    assert ConnectionPool.created == 1
+    assert all(pool is pools[0] for pool in pools)
+    assert di_container._pending == {}
+
+
+@pytest.mark.asyncio
+async def test_singleton_single_flight_failure(di_container, monkeypatch):
+    di_container.reset()
+    di_container.register_singleton_class(ConnectionPool, 'ConnectionPool')
+    attempts = []
+
+    async def failing_create_instance(class_type):
+        attempts.append(class_type)
+        await asyncio.sleep(0.01)
+        raise ConnectionError("database unavailable")
+    monkeypatch.setattr(di_container, '_create_instance', failing_create_instance)
+
+    results = await asyncio.gather(*(di_container.get('ConnectionPool') for _ in range(50)), return_exceptions=True)
+    assert len(attempts) == 1
+    assert all(isinstance(result, ConnectionError) for result in results)
+
+    # The failure is not cached: the next request tries again
+    with pytest.raises(ConnectionError):
+        await di_container.get('ConnectionPool')
+    assert len(attempts) == 2
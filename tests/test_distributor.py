@@ -125,28 +125,146 @@ async def test_distributor_skips_handled_event(monkeypatch):
 
 @pytest.mark.asyncio
 async def test_prune_old_events(monkeypatch):
-    # Step 1: Create a mock event class with a timestamp attribute
-    class MockEvent:
-        def __init__(self, timestamp):
-            self.timestamp = timestamp
-
-    # Step 2: Initialize the Distributor with a mocked event_lifetime
+    # Step 1: Initialize the Distributor with a mocked event_lifetime
     distributor = Distributor(services=[])
     monkeypatch.setattr(distributor, 'event_lifetime', timedelta(seconds=5))
 
-    # Step 3: Add events to the handled_events dictionary
-    old_event = MockEvent(timestamp=datetime.now(timezone.utc) - timedelta(seconds=10))
-    new_event = MockEvent(timestamp=datetime.now(timezone.utc))
-
-    distributor.handled_events = {
-        "old_event_id": old_event,
-        "new_event_id": new_event,
-    }
+    # Step 2: Add event ids to handled_events, in handling order, with the time they were handled
+    now = datetime.now(timezone.utc)
+    distributor.handled_events["old_event_id"] = (now - timedelta(seconds=10)).timestamp()
+    distributor.handled_events["new_event_id"] = now.timestamp()
 
-    # Step 4: Invoke prune_old_events
+    # Step 3: Invoke prune_old_events
     distributor.prune_old_events()
     await asyncio.sleep(0)  # No-op await to introduce a checkpoint
 
-    # Step 5: Assert that the old event was pruned and the new event remains
+    # Step 4: Assert that the old event was pruned and the new event remains
     assert "old_event_id" not in distributor.handled_events
     assert "new_event_id" in distributor.handled_events
+
+
+@pytest.mark.asyncio
+async def test_distributor_handles_events_with_live_objects():
+    # HTTP events carry objects such as 'send' that cannot be serialized
+    async def service(event: Event):
+        await event.data['send']({'type': 'http.response.start'})
+        return True
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    distributor = Distributor(services=[service])
+    assert await distributor.distribute(Event(name='http.request.received', data={'send': send})) is True
+    assert sent == [{'type': 'http.response.start'}]
+
+
+@pytest.mark.asyncio
+async def test_distributor_dedup_by_content():
+    call_count = {'service': 0}
+
+    async def service(event: Event):
+        await asyncio.sleep(0)  # No-op to introduce a checkpoint
+        call_count['service'] += 1
+        return True
+
+    distributor = Distributor(services=[service], dedup_by_content=True)
+    await distributor.distribute(Event(name='order.created', data={'order_id': 1}))
+    await distributor.distribute(Event(name='order.created', data={'order_id': 1}))
+    await distributor.distribute(Event(name='order.created', data={'order_id': 2}))
+
+    assert call_count['service'] == 2
+
+
+@pytest.mark.asyncio
+async def test_distributor_keeps_ids_only_and_caps_memory():
+    async def service(event: Event):
+        await asyncio.sleep(0)  # No-op to introduce a checkpoint
+        return True
+
+    distributor = Distributor(services=[service], max_handled=3)
+    events = [Event(name='test.event', data={'n': n}) for n in range(5)]
+    for event in events:
+        await distributor.distribute(event)
+
+    # Only the three most recently handled ids are remembered, not the events themselves
+    assert list(distributor.handled_events) == [event.id for event in events[2:]]
+    assert all(isinstance(value, float) for value in distributor.handled_events.values())
+
+
+def test_prune_stops_at_first_live_entry(monkeypatch):
+    distributor = Distributor(services=[])
+    monkeypatch.setattr(distributor, 'event_lifetime', timedelta(seconds=5))
+    now = datetime.now(timezone.utc).timestamp()
+    distributor.handled_events.update([('old_1', now - 30), ('old_2', now - 10), ('new', now), ('old_3', now - 20)])
+
+    # Pruning stops at 'new': an entry is never handled before one ahead of it in the handling order
+    distributor.prune_old_events()
+    assert list(distributor.handled_events) == ['new', 'old_3']
+
+    distributor.handled_events.clear()
+    distributor.handled_events.update([('old_1', now - 30), ('new', now)])
+    distributor.prune_old_events()
+    assert list(distributor.handled_events) == ['new']
+
+
+@pytest.mark.asyncio
+async def test_distributor_least_outstanding_avoids_busy_service():
+    release = asyncio.Event()
+    calls = []
+
+    async def slow_service(event: Event):
+        calls.append('slow')
+        await release.wait()
+        return True
+
+    async def fast_service(event: Event):
+        await asyncio.sleep(0)  # No-op to introduce a checkpoint
+        calls.append('fast')
+        return True
+
+    distributor = Distributor(services=[slow_service, fast_service], strategy='least_outstanding')
+    busy = asyncio.create_task(distributor.distribute(Event(name='job', data={})))
+    await asyncio.sleep(0)
+
+    # The slow service is still busy, so the next events all go to the fast one
+    for _ in range(3):
+        await distributor.distribute(Event(name='job', data={}))
+    assert calls == ['slow', 'fast', 'fast', 'fast']
+
+    release.set()
+    assert await busy is True
+
+
+@pytest.mark.asyncio
+async def test_distributor_weighted_round_robin():
+    counts = {'a': 0, 'b': 0}
+
+    def make_service(name):
+        async def service(event: Event):
+            await asyncio.sleep(0)  # No-op to introduce a checkpoint
+            counts[name] += 1
+            return True
+        return service
+
+    distributor = Distributor(services=[make_service('a'), make_service('b')],
+                              strategy='weighted_round_robin', weights=[3, 1])
+    for _ in range(8):
+        await distributor.distribute(Event(name='job', data={}))
+
+    assert counts == {'a': 6, 'b': 2}
+
+
+def test_services_are_fixed_with_their_stats():
+    async def service(event: Event):
+        return True
+
+    services = [service]
+    distributor = Distributor(services=services)
+    services.append(service)  # The distributor keeps its own copy
+
+    assert distributor.services == (service,)
+    assert len(distributor.service_stats) == 1
+    with pytest.raises(AttributeError):
+        distributor.services.append(service)
@@ -1,6 +1,8 @@
 import asyncio
+import time
 import pytest
 from typing import Callable
+from unittest.mock import AsyncMock
 
 from src.core.event_bus import Event, EventBus
 
@@ -156,3 +158,407 @@ async def test_event_bus_listener_exception_handling():
 
     # Ensure the safe listener was still called despite the faulty listener
     assert call_count['count'] == 1
+
+
+@pytest.mark.asyncio
+async def test_event_bus_mixed_listener_kinds():
+    event_bus = EventBus()
+    calls = []
+
+    async def async_listener(event: Event):
+        calls.append('async')
+        await asyncio.sleep(0)  # No-op async checkpoint
+
+    def sync_listener(event: Event):
+        calls.append('sync')
+
+    event_bus.subscribe('test.event', async_listener)
+    event_bus.subscribe('test.event', sync_listener)
+    await event_bus.publish(Event(name='test.event', data={}))
+
+    # Listeners keep their subscription order regardless of their kind
+    assert calls == ['async', 'sync']
+
+
+@pytest.mark.asyncio
+async def test_event_bus_stops_after_response_already_sent():
+    event_bus = EventBus()
+    calls = []
+
+    async def responding_listener(event: Event):
+        calls.append('responding')
+        event.data['response_already_sent'] = True
+        await asyncio.sleep(0)  # No-op async checkpoint
+
+    def late_listener(event: Event):
+        calls.append('late')
+
+    event_bus.subscribe('test.event', responding_listener)
+    event_bus.subscribe('test.event', late_listener)
+    await event_bus.publish(Event(name='test.event', data={}))
+
+    assert calls == ['responding']
+
+
+@pytest.mark.asyncio
+async def test_event_bus_subscribe_during_publish():
+    event_bus = EventBus()
+    calls = []
+
+    def added_listener(event: Event):
+        calls.append('added')
+
+    def subscribing_listener(event: Event):
+        calls.append('subscribing')
+        event_bus.subscribe('test.event', added_listener)
+
+    event_bus.subscribe('test.event', subscribing_listener)
+
+    # The listener added while publishing only sees the following events
+    await event_bus.publish(Event(name='test.event', data={}))
+    assert calls == ['subscribing']
+
+    await event_bus.publish(Event(name='test.event', data={}))
+    assert calls == ['subscribing', 'subscribing', 'added']
+
+
+def test_event_bus_unsubscribe_last_listener():
+    event_bus = EventBus()
+
+    def dummy_listener(event: Event):
+        pass
+
+    event_bus.subscribe('test.event', dummy_listener)
+    event_bus.unsubscribe('test.event', dummy_listener)
+    # Unsubscribing an unknown listener is a no-op
+    event_bus.unsubscribe('test.event', dummy_listener)
+
+    # As before the dispatch was precompiled, the topic keeps an empty list
+    assert len(event_bus.listeners['test.event']) == 0
+
+
+
+@pytest.mark.asyncio
+async def test_event_bus_listeners_changed_in_place():
+    event_bus = EventBus()
+    calls = []
+
+    def first(event: Event):
+        calls.append('first')
+
+    def second(event: Event):
+        calls.append('second')
+
+    async def slow(event: Event):
+        await asyncio.sleep(1)
+
+    event_bus.subscribe('user.#', first)
+    event_bus.subscribe('user.#', slow, timeout=0.01)
+    await event_bus.publish(Event(name='user.login', data={}))
+
+    event_bus.listeners['user.#'].append(second)
+    event_bus.listeners['user.#'].remove(first)
+    start = time.perf_counter()
+    await event_bus.publish(Event(name='user.login', data={}))
+    assert calls == ['first', 'second']
+    # The listener kept in the list keeps its options: the timeout still applies
+    assert time.perf_counter() - start < 0.5
+
+    listeners = event_bus.listeners['user.#']
+    listeners.clear()
+    assert event_bus.listeners['user.#'] == []
+    await event_bus.publish(Event(name='user.login', data={}))
+    assert calls == ['first', 'second']
+
+    # A held reference to the emptied list still works
+    listeners.append(first)
+    await event_bus.publish(Event(name='user.login', data={}))
+    assert calls == ['first', 'second', 'first']
+
+@pytest.mark.asyncio
+async def test_event_bus_concurrent_listeners_run_together():
+    event_bus = EventBus()
+    calls = []
+
+    async def slow_listener(event: Event):
+        await asyncio.sleep(0.1)
+        calls.append('slow')
+
+    for _ in range(3):
+        event_bus.subscribe('http.request.completed', slow_listener, concurrent=True)
+
+    start = time.perf_counter()
+    await event_bus.publish(Event(name='http.request.completed', data={}))
+    elapsed = time.perf_counter() - start
+
+    # Three 0.1s listeners overlap instead of adding up
+    assert calls == ['slow', 'slow', 'slow']
+    assert elapsed < 0.25
+
+
+@pytest.mark.asyncio
+async def test_event_bus_concurrent_listeners_run_after_ordered_ones():
+    event_bus = EventBus()
+    calls = []
+
+    async def concurrent_listener(event: Event):
+        calls.append('concurrent')
+        await asyncio.sleep(0)  # No-op async checkpoint
+
+    async def ordered_listener(event: Event):
+        await asyncio.sleep(0.01)
+        calls.append('ordered')
+
+    event_bus.subscribe('test.event', concurrent_listener, concurrent=True)
+    event_bus.subscribe('test.event', ordered_listener)
+    await event_bus.publish(Event(name='test.event', data={}))
+
+    assert calls == ['ordered', 'concurrent']
+
+
+@pytest.mark.asyncio
+async def test_event_bus_concurrent_listeners_skipped_after_response_sent():
+    event_bus = EventBus()
+    concurrent_listener = AsyncMock()
+
+    async def responding_listener(event: Event):
+        event.data['response_already_sent'] = True
+        await asyncio.sleep(0)  # No-op async checkpoint
+
+    event_bus.subscribe('test.event', responding_listener)
+    event_bus.subscribe('test.event', concurrent_listener, concurrent=True)
+    await event_bus.publish(Event(name='test.event', data={}))
+
+    concurrent_listener.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_event_bus_listener_timeout_does_not_cancel_siblings(caplog):
+    event_bus = EventBus()
+    calls = []
+
+    async def hanging_listener(event: Event):
+        await asyncio.sleep(10)
+        calls.append('hanging')
+
+    async def failing_listener(event: Event):
+        await asyncio.sleep(0)  # No-op async checkpoint
+        raise ValueError("An error occurred")
+
+    async def quick_listener(event: Event):
+        await asyncio.sleep(0.01)
+        calls.append('quick')
+
+    event_bus.subscribe('test.event', hanging_listener, concurrent=True, timeout=0.05)
+    event_bus.subscribe('test.event', failing_listener, concurrent=True)
+    event_bus.subscribe('test.event', quick_listener, concurrent=True)
+    await event_bus.publish(Event(name='test.event', data={}))
+
+    assert calls == ['quick']
+    assert "Listener hanging_listener timed out for event 'test.event'" in caplog.text
+    assert "Error in listener for event 'test.event': An error occurred" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_event_bus_ordered_listener_timeout():
+    event_bus = EventBus()
+    calls = []
+
+    async def hanging_listener(event: Event):
+        await asyncio.sleep(10)
+
+    def next_listener(event: Event):
+        calls.append('next')
+
+    event_bus.subscribe('test.event', hanging_listener, timeout=0.05)
+    event_bus.subscribe('test.event', next_listener)
+    await event_bus.publish(Event(name='test.event', data={}))
+
+    assert calls == ['next']
+
+
+@pytest.mark.asyncio
+async def test_event_bus_unhandled_when_all_concurrent_listeners_fail():
+    event_bus = EventBus()
+    event_bus.handle_unhandled_event = AsyncMock()
+
+    async def failing_listener(event: Event):
+        await asyncio.sleep(0)  # No-op async checkpoint
+        raise ValueError("An error occurred")
+
+    event_bus.subscribe('test.event', failing_listener, concurrent=True)
+    event = Event(name='test.event', data={})
+    await event_bus.publish(event)
+
+    event_bus.handle_unhandled_event.assert_awaited_once_with(event)
+
+
+@pytest.mark.asyncio
+async def test_event_bus_single_segment_wildcard():
+    event_bus = EventBus()
+    received = []
+    event_bus.subscribe('http.error.*', lambda event: received.append(event.name))
+
+    await event_bus.publish(Event(name='http.error.404', data={}))
+    await event_bus.publish(Event(name='http.error.500', data={}))
+    event_bus.handle_unhandled_event = AsyncMock()
+    await event_bus.publish(Event(name='http.error', data={}))
+    await event_bus.publish(Event(name='http.error.500.detail', data={}))
+
+    assert received == ['http.error.404', 'http.error.500']
+    assert event_bus.handle_unhandled_event.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_event_bus_multi_segment_wildcard():
+    event_bus = EventBus()
+    received = []
+    event_bus.subscribe('user.#', lambda event: received.append(event.name))
+
+    for name in ('user', 'user.login', 'user.login.success', 'http.request.received'):
+        await event_bus.publish(Event(name=name, data={}))
+
+    assert received == ['user', 'user.login', 'user.login.success']
+
+
+@pytest.mark.asyncio
+async def test_event_bus_wildcard_and_exact_listeners_keep_subscription_order():
+    event_bus = EventBus()
+    calls = []
+
+    event_bus.subscribe('user.#', lambda event: calls.append('all users'))
+    event_bus.subscribe('user.login.success', lambda event: calls.append('exact'))
+    event_bus.subscribe('user.*.success', lambda event: calls.append('any success'))
+    event_bus.subscribe('#', lambda event: calls.append('everything'))
+
+    await event_bus.publish(Event(name='user.login.success', data={}))
+    assert calls == ['all users', 'exact', 'any success', 'everything']
+
+
+@pytest.mark.asyncio
+async def test_event_bus_resolution_cache_invalidated_on_subscription_changes():
+    event_bus = EventBus()
+    calls = []
+
+    def wildcard_listener(event: Event):
+        calls.append('wildcard')
+
+    event_bus.subscribe('test.event', lambda event: calls.append('exact'))
+    await event_bus.publish(Event(name='test.event', data={}))
+    assert 'test.event' in event_bus._dispatch
+
+    event_bus.subscribe('test.*', wildcard_listener)
+    assert 'test.event' not in event_bus._dispatch
+    await event_bus.publish(Event(name='test.event', data={}))
+
+    event_bus.unsubscribe('test.*', wildcard_listener)
+    assert event_bus.listeners['test.*'] == []
+    await event_bus.publish(Event(name='test.event', data={}))
+
+    assert calls == ['exact', 'exact', 'wildcard', 'exact']
+
+
+def test_event_ids_are_unique_and_monotonic():
+    first = Event(name='test.event')
+    second = Event(name='test.event')
+
+    prefix, counter = first.id.rsplit('-', 1)
+    assert second.id == f"{prefix}-{int(counter) + 1}"
+    assert first != second
+    assert hash(first) == hash(first.id)
+    # Rebuilding an event with its id keeps its identity
+    assert Event(name='test.event', event_id=first.id) == first
+
+
+def test_event_timestamp_and_content_hash():
+    event = Event(name='test.event', data={'send': object()})
+    # Events holding live objects are hashable; content_hash is opt-in
+    assert {event: True}[event]
+    assert event.timestamp.tzinfo is not None
+    assert abs(event.timestamp.timestamp() - time.time()) < 5
+
+    assert Event(name='a', data={'x': 1, 'y': 2}).content_hash() == Event(name='a', data={'y': 2, 'x': 1}).content_hash()
+    assert Event(name='a', data={'x': 1}).content_hash() != Event(name='b', data={'x': 1}).content_hash()
+
+
+@pytest.mark.asyncio
+async def test_event_bus_metrics_per_topic_and_listener():
+    event_bus = EventBus()
+    event_bus.configure_metrics(sample_every=1)
+    event_bus.handle_unhandled_event = AsyncMock()
+
+    async def slow_listener(event: Event):
+        await asyncio.sleep(0.02)
+
+    def failing_listener(event: Event):
+        raise ValueError("An error occurred")
+
+    event_bus.subscribe('test.event', slow_listener)
+    event_bus.subscribe('test.event', failing_listener)
+    for _ in range(3):
+        await event_bus.publish(Event(name='test.event', data={}))
+    await event_bus.publish(Event(name='nobody.listens', data={}))
+
+    snapshot = event_bus.metrics_snapshot()
+    topic = snapshot['topics']['test.event']
+    assert topic['published'] == 3
+    assert topic['unhandled'] == 0
+
+    slow = topic['listeners'][f"{__name__}.{slow_listener.__qualname__}"]
+    assert slow['calls'] == 3
+    assert slow['errors'] == 0
+    assert slow['total_seconds'] >= 0.06
+    # All three calls land in the (0.01, 0.025] or a slower bucket
+    fast_buckets = snapshot['latency_buckets'].index(0.01) + 1
+    assert sum(slow['histogram']) == 3
+    assert sum(slow['histogram'][:fast_buckets]) == 0
+
+    failing = topic['listeners'][f"{__name__}.{failing_listener.__qualname__}"]
+    assert failing['calls'] == 3
+    assert failing['errors'] == 3
+
+    assert snapshot['topics']['nobody.listens']['unhandled'] == 1
+
+
+@pytest.mark.asyncio
+async def test_event_bus_metrics_timeouts_and_resubscription():
+    event_bus = EventBus()
+
+    async def hanging_listener(event: Event):
+        await asyncio.sleep(10)
+
+    event_bus.subscribe('test.event', hanging_listener, concurrent=True, timeout=0.01)
+    await event_bus.publish(Event(name='test.event', data={}))
+    # Counters survive the dispatch cache being rebuilt
+    event_bus.subscribe('test.*', lambda event: None)
+    await event_bus.publish(Event(name='test.event', data={}))
+
+    stats = event_bus.metrics_snapshot()['topics']['test.event']['listeners'][
+        f"{__name__}.{hanging_listener.__qualname__}"]
+    assert stats['calls'] == 2
+    assert stats['errors'] == 2
+    assert stats['timeouts'] == 2
+
+    event_bus.metrics.reset()
+    assert event_bus.metrics_snapshot()['topics']['test.event']['published'] == 0
+
+
+@pytest.mark.asyncio
+async def test_event_bus_metrics_sampling_and_switch():
+    event_bus = EventBus()
+    event_bus.configure_metrics(sample_every=4)
+    event_bus.subscribe('test.event', lambda event: None)
+    for _ in range(10):
+        await event_bus.publish(Event(name='test.event', data={}))
+
+    topic = event_bus.metrics_snapshot()['topics']['test.event']
+    listener, = topic['listeners'].values()
+    assert topic['published'] == 10
+    assert listener['calls'] == 10
+    assert listener['timed_calls'] == sum(listener['histogram']) == 3  # Publishes 1, 5 and 9
+
+    event_bus.metrics.reset()
+    event_bus.configure_metrics(enabled=False)
+    await event_bus.publish(Event(name='test.event', data={}))
+    assert event_bus.metrics_snapshot()['topics']['test.event']['published'] == 0
+    assert event_bus._dispatch['test.event'][0][0][3] is None  # No stats in the dispatch record
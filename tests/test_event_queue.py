@@ -0,0 +1,215 @@
+import asyncio
+import pytest
+from unittest.mock import Mock
+
+from src.core.event_bus import Event, EventBus
+from src.core.event_queue import BackgroundEventQueue, BLOCK, DROP_OLDEST, DROP_NEW, SPILL
+from src.core.lifecycle import close_resources
+
+
+# Handler that records event names and blocks until released, so the queue can be filled
+def make_gated_handler():
+    gate = asyncio.Event()
+    handled = []
+
+    async def handler(event):
+        await gate.wait()
+        handled.append(event.name)
+
+    return handler, gate, handled
+
+
+def test_invalid_policy():
+    with pytest.raises(ValueError):
+        BackgroundEventQueue(lambda e: None, Event, policy='unknown')
+    with pytest.raises(ValueError):
+        BackgroundEventQueue(lambda e: None, Event, policy=SPILL)
+
+
+@pytest.mark.asyncio
+async def test_block_policy_applies_backpressure():
+    handler, gate, handled = make_gated_handler()
+    queue = BackgroundEventQueue(handler, Event, max_size=1, workers=1, policy=BLOCK)
+
+    await queue.put(Event('e1'))
+    await asyncio.sleep(0)  # Worker picks e1 and waits on the gate
+    await queue.put(Event('e2'))  # Fills the queue
+
+    blocked = asyncio.create_task(queue.put(Event('e3')))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+
+    gate.set()
+    assert await blocked is True
+    await queue.drain()
+    assert handled == ['e1', 'e2', 'e3']
+    assert queue.stats()['dropped'] == 0
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_policy():
+    handler, gate, handled = make_gated_handler()
+    queue = BackgroundEventQueue(handler, Event, max_size=2, workers=1, policy=DROP_OLDEST)
+
+    await queue.put(Event('e1'))
+    await asyncio.sleep(0)
+    for name in ('e2', 'e3', 'e4'):
+        assert await queue.put(Event(name)) is True
+
+    gate.set()
+    await queue.drain()
+    assert handled == ['e1', 'e3', 'e4']
+    assert queue.stats()['dropped'] == 1
+
+
+@pytest.mark.asyncio
+async def test_drop_new_policy():
+    handler, gate, handled = make_gated_handler()
+    queue = BackgroundEventQueue(handler, Event, max_size=2, workers=1, policy=DROP_NEW)
+
+    await queue.put(Event('e1'))
+    await asyncio.sleep(0)
+    assert await queue.put(Event('e2')) is True
+    assert await queue.put(Event('e3')) is True
+    assert await queue.put(Event('e4')) is False
+
+    gate.set()
+    await queue.drain()
+    assert handled == ['e1', 'e2', 'e3']
+    assert queue.stats()['dropped'] == 1
+
+
+@pytest.mark.asyncio
+async def test_spill_policy_requeues_from_disk(tmp_path):
+    spill_path = str(tmp_path / 'spill.jsonl')
+    handler, gate, handled = make_gated_handler()
+    queue = BackgroundEventQueue(handler, Event, max_size=1, workers=1, policy=SPILL, spill_path=spill_path)
+
+    await queue.put(Event('e1'))
+    await asyncio.sleep(0)
+    await queue.put(Event('e2'))
+    assert await queue.put(Event('e3', {'id': 3})) is True
+    # Live objects cannot be spilled
+    assert await queue.put(Event('e4', {'send': object()})) is False
+
+    stats = queue.stats()
+    assert stats['spilled'] == 1
+    assert stats['spilled_pending'] == 1
+    assert stats['dropped'] == 1
+
+    gate.set()
+    await queue.drain()
+    assert handled == ['e1', 'e2', 'e3']
+    assert queue.stats()['spilled_pending'] == 0
+    assert not (tmp_path / 'spill.jsonl').exists()
+
+
+@pytest.mark.asyncio
+async def test_failed_events_are_counted():
+    async def handler(event):
+        if event.name == 'bad':
+            raise RuntimeError("boom")
+
+    queue = BackgroundEventQueue(handler, Event, workers=2)
+    await queue.put(Event('good'))
+    await queue.put(Event('bad'))
+    await queue.drain()
+
+    stats = queue.stats()
+    assert stats['enqueued'] == 2
+    assert stats['processed'] == 1
+    assert stats['failed'] == 1
+    assert stats['depth'] == 0
+    # Idle workers exit once the queue is empty
+    assert stats['workers'] == 0
+
+
+@pytest.mark.asyncio
+async def test_finished_worker_is_replaced_before_its_done_callback():
+    handled = []
+
+    async def handler(event):
+        handled.append(event.name)
+
+    queue = BackgroundEventQueue(handler, Event, workers=1)
+    await queue.put(Event('e1'))
+    await asyncio.sleep(0)  # The worker handles e1 and returns; its done-callback has not run yet
+    [worker] = queue._workers
+    assert worker.done()
+
+    await queue.put(Event('e2'))
+    await queue.drain(timeout=1)
+    assert handled == ['e1', 'e2']
+    assert queue.depth == 0
+
+
+@pytest.mark.asyncio
+async def test_deferred_topic_runs_off_the_publish_path():
+    event_bus = EventBus()
+    handled = []
+
+    async def listener(event):
+        handled.append(event.name)
+
+    event_bus.subscribe('user.login.success', listener)
+    event_bus.set_deferred('user.login.success')
+
+    await event_bus.publish(Event('user.login.success'))
+    assert handled == []
+
+    await event_bus.drain()
+    assert handled == ['user.login.success']
+    assert event_bus.queue_stats()['processed'] == 1
+
+
+@pytest.mark.asyncio
+async def test_publish_background():
+    event_bus = EventBus()
+    handled = []
+    event_bus.subscribe('report.generate', lambda event: handled.append(event.data['id']))
+
+    assert await event_bus.publish_background(Event('report.generate', {'id': 1})) is True
+    await event_bus.drain()
+    assert handled == [1]
+
+
+@pytest.mark.asyncio
+async def test_configure_background_while_running():
+    event_bus = EventBus()
+    handler_gate = asyncio.Event()
+
+    async def listener(event):
+        await handler_gate.wait()
+
+    event_bus.subscribe('slow', listener)
+    event_bus.configure_background(max_size=10, workers=1, policy=DROP_NEW)
+    await event_bus.publish_background(Event('slow'))
+    with pytest.raises(RuntimeError):
+        event_bus.configure_background(max_size=5)
+
+    handler_gate.set()
+    await event_bus.drain()
+    assert event_bus.queue_stats()['policy'] == DROP_NEW
+
+
+@pytest.mark.asyncio
+async def test_shutdown_drain_abandons_hung_listeners():
+    event_bus = EventBus()
+    event_bus.configure_background(workers=1, drain_timeout=0.05)
+
+    async def hung_listener(event):
+        await asyncio.Event().wait()  # e.g. a DB insert that never returns
+
+    event_bus.subscribe('user.login.success', hung_listener)
+    event_bus.set_deferred('user.login.success')
+    await event_bus.publish(Event('user.login.success'))
+    await event_bus.publish(Event('user.login.success'))
+
+    container = Mock()
+    container.get_sync = Mock(side_effect=lambda name: event_bus if name == 'EventBus' else None)
+    await asyncio.wait_for(close_resources(container), timeout=1)
+
+    stats = event_bus.queue_stats()
+    assert stats['abandoned'] == 2  # The one being handled and the one still queued
+    assert stats['depth'] == 0
+    assert stats['workers'] == 0
@@ -0,0 +1,143 @@
+import asyncio
+import os
+
+import pytest
+
+from src.core.event_bus import Event
+from src.core.event_store import Checkpoint, EventStore, INDEX_ENTRY
+
+
+def test_append_and_read(tmp_path):
+    store = EventStore(str(tmp_path))
+    events = [Event(name='book.created', data={'title': f'Book {n}'}) for n in range(3)]
+    assert [store.append(event) for event in events] == [0, 1, 2]
+
+    stored = list(store.read())
+    assert [s.offset for s in stored] == [0, 1, 2]
+    assert [s.id for s in stored] == [event.id for event in events]
+    assert stored[1].name == 'book.created'
+    assert stored[1].data == {'title': 'Book 1'}
+    assert stored[1].created == events[1].created
+
+    assert [s.offset for s in store.read(2)] == [2]
+    assert list(store.read(3)) == []
+    store.close()
+
+
+def test_segments_rotate_and_reads_span_them(tmp_path):
+    store = EventStore(str(tmp_path), segment_bytes=200, index_interval=2)
+    for n in range(50):
+        store.append(Event(name='user.login.success', data={'n': n}))
+    store.close()
+
+    segments = sorted(name for name in os.listdir(tmp_path) if name.endswith('.log'))
+    assert len(segments) > 1
+    assert segments[0] == f"{0:020d}.log"
+
+    reopened = EventStore(str(tmp_path), segment_bytes=200, index_interval=2)
+    assert reopened.next_offset == 50
+    # Reading from the middle uses the segment bases and the sparse index
+    assert [s.data['n'] for s in reopened.read(37)] == list(range(37, 50))
+    assert reopened.append(Event(name='user.logout.success')) == 50
+    reopened.close()
+
+
+def test_sparse_index(tmp_path):
+    store = EventStore(str(tmp_path), index_interval=10)
+    for n in range(25):
+        store.append(Event(name='test.event', data={'n': n}))
+    store.close()
+
+    with open(tmp_path / f"{0:020d}.index", 'rb') as f:
+        raw = f.read()
+    entries = [INDEX_ENTRY.unpack_from(raw, position) for position in range(0, len(raw), INDEX_ENTRY.size)]
+    assert [record_number for record_number, _ in entries] == [0, 10, 20]
+
+
+def test_torn_record_is_truncated_on_open(tmp_path):
+    store = EventStore(str(tmp_path))
+    for n in range(3):
+        store.append(Event(name='test.event', data={'n': n}))
+    store.close()
+
+    segment_path = tmp_path / f"{0:020d}.log"
+    with open(segment_path, 'ab') as f:
+        f.write(b'\x40\x00\x00\x00\x00')  # Header of a record that was never completely written
+
+    reopened = EventStore(str(tmp_path))
+    assert reopened.next_offset == 3
+    assert reopened.append(Event(name='test.event', data={'n': 3})) == 3
+    assert [s.data['n'] for s in reopened.read()] == [0, 1, 2, 3]
+    reopened.close()
+
+
+def test_readonly_store(tmp_path):
+    writer = EventStore(str(tmp_path))
+    writer.append(Event(name='test.event'))
+    writer.flush()
+
+    reader = EventStore(str(tmp_path), readonly=True)
+    assert [s.offset for s in reader.read()] == [0]
+    with pytest.raises(RuntimeError):
+        reader.append(Event(name='test.event'))
+    writer.close()
+
+
+def test_checkpoint(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / 'projection.checkpoint'))
+    assert checkpoint.load() == 0
+    checkpoint.save(42)
+    assert checkpoint.load() == 42
+
+
+@pytest.mark.asyncio
+async def test_tail_from_checkpoint(tmp_path):
+    store = EventStore(str(tmp_path))
+    for n in range(3):
+        store.append(Event(name='test.event', data={'n': n}))
+    checkpoint = Checkpoint(str(tmp_path / 'consumer.checkpoint'))
+    checkpoint.save(1)
+
+    received = []
+
+    async def consume():
+        async for stored in store.tail(checkpoint.load(), poll_interval=0.05):
+            received.append(stored.data['n'])
+            checkpoint.save(stored.offset + 1)
+            if len(received) == 4:
+                return
+
+    consumer = asyncio.create_task(consume())
+    await asyncio.sleep(0.01)
+    store.append(Event(name='test.event', data={'n': 3}))
+    store.append(Event(name='test.event', data={'n': 4}))
+    await asyncio.wait_for(consumer, 1)
+
+    assert received == [1, 2, 3, 4]
+    assert checkpoint.load() == 5
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_readonly_tail_picks_up_other_writer(tmp_path):
+    writer = EventStore(str(tmp_path), segment_bytes=100)
+    writer.append(Event(name='test.event', data={'n': 0}))
+    writer.flush()
+    reader = EventStore(str(tmp_path), readonly=True)
+
+    received = []
+
+    async def consume():
+        async for stored in reader.tail(poll_interval=0.02):
+            received.append(stored.data['n'])
+            if len(received) == 5:
+                return
+
+    consumer = asyncio.create_task(consume())
+    for n in range(1, 5):
+        writer.append(Event(name='test.event', data={'n': n}))
+    writer.flush()
+    await asyncio.wait_for(consumer, 1)
+
+    assert received == [0, 1, 2, 3, 4]
+    writer.close()
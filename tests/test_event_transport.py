@@ -0,0 +1,116 @@
+import asyncio
+import json
+
+import fakeredis
+import fakeredis.aioredis
+import pytest
+
+from src.core.event_bus import Event, EventBus
+from src.core.event_transport import RedisEventTransport
+from src.services.redis_service import RedisService
+
+
+# Two workers sharing one (fake) Redis server, each with its own EventBus and transport
+@pytest.fixture
+async def workers():
+    server = fakeredis.FakeServer()
+    clients, transports = [], []
+    for worker_id in ('worker-a', 'worker-b'):
+        client = fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+        clients.append(client)
+        transport = RedisEventTransport(EventBus(), RedisService(redis_client=client), topics=['user.#', 'book.updated'],
+                                        worker_id=worker_id)
+        await transport.start()
+        transports.append(transport)
+    await asyncio.sleep(0.05)  # Let both subscriptions register
+    yield transports
+    for transport in transports:
+        await transport.stop()
+    for client in clients:
+        await client.aclose()
+        await client.connection_pool.disconnect()
+
+
+async def wait_for(condition, timeout=1.0):
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_mirrored_events_reach_other_workers_once(workers):
+    worker_a, worker_b = workers
+    received_a, received_b = [], []
+    worker_a.event_bus.subscribe('user.login.success', lambda event: received_a.append(event))
+    worker_b.event_bus.subscribe('user.login.success', lambda event: received_b.append(event))
+
+    event = Event(name='user.login.success', data={'user_id': 7})
+    await worker_a.event_bus.publish(event)
+    await wait_for(lambda: received_b)
+    await asyncio.sleep(0.05)  # Give a loopback delivery the chance to show up
+
+    # The origin worker only ran its listener locally, once; the other worker got a copy with the same id
+    assert received_a == [event]
+    assert [(e.id, e.name, e.data) for e in received_b] == [(event.id, 'user.login.success', {'user_id': 7})]
+    assert worker_b.received == 1
+
+
+@pytest.mark.asyncio
+async def test_events_published_in_one_tick_are_batched(workers):
+    worker_a, worker_b = workers
+    received_b = []
+    worker_b.event_bus.subscribe('book.updated', lambda event: received_b.append(event.data['id']))
+
+    for book_id in range(5):
+        await worker_a.event_bus.publish(Event(name='book.updated', data={'id': book_id}))
+    await wait_for(lambda: len(received_b) == 5)
+
+    assert received_b == [0, 1, 2, 3, 4]
+    assert worker_a.stats()['batches'] == 1
+    assert worker_a.stats()['sent'] == 5
+
+
+@pytest.mark.asyncio
+async def test_only_selected_topics_are_mirrored(workers):
+    worker_a, worker_b = workers
+    received_b = []
+    worker_b.event_bus.subscribe('http.request.completed', lambda event: received_b.append(event))
+
+    await worker_a.event_bus.publish(Event(name='http.request.completed', data={}))
+    await asyncio.sleep(0.05)
+
+    assert received_b == []
+    assert worker_a.stats()['sent'] == 0
+
+
+@pytest.mark.asyncio
+async def test_unserializable_events_are_skipped(workers):
+    worker_a, worker_b = workers
+    received_b = []
+    worker_b.event_bus.subscribe('user.#', lambda event: received_b.append(event.name))
+
+    await worker_a.event_bus.publish(Event(name='user.login.success', data={'send': object()}))
+    await worker_a.event_bus.publish(Event(name='user.logout.success', data={'user_id': 1}))
+    await wait_for(lambda: received_b)
+
+    assert received_b == ['user.logout.success']
+    assert worker_a.stats()['skipped'] == 1
+
+
+@pytest.mark.asyncio
+async def test_compact_wire_format():
+    published = []
+
+    class RecordingRedis:
+        async def publish(self, channel, message):
+            published.append((channel, message))
+
+    transport = RedisEventTransport(EventBus(), RecordingRedis(), topics=['user.#'], worker_id='w1')
+    event = Event(name='user.login.success', data={'user_id': 7})
+    transport.send(event)
+    await transport.stop()
+
+    channel, message = published[0]
+    assert channel == 'eventwired:events'
+    assert ' ' not in message
+    assert json.loads(message) == ['w1', [[event.id, 'user.login.success', {'user_id': 7}]]]
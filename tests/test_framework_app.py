@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, Mock
 
@@ -20,8 +21,9 @@ async def test_framework_app_lifespan(monkeypatch):
     # Call the app with a lifespan event
     await app(scope, receive, send)
 
-    # Ensure the lifespan handler was called
-    mock_handle_lifespan_events.assert_awaited_once_with(scope, receive, send)
+    # Ensure the lifespan handler was called with the app's one-time setup and teardown as hooks
+    mock_handle_lifespan_events.assert_awaited_once_with(scope, receive, send, on_startup=app.ensure_setup,
+                                                         on_shutdown=app.shutdown)
 
 
 @pytest.mark.asyncio
@@ -101,6 +103,7 @@ async def test_framework_app_exception_handling(monkeypatch):
 
     scope = {'type': 'http'}
     app = FrameworkApp(container=container, register_routes=AsyncMock())
+    monkeypatch.setattr(app, 'ensure_setup', AsyncMock())  # Only EventBus is available: treat the app as set up
 
     # Call the app with an HTTP event that raises an exception
     await app(scope, receive, send)
@@ -116,3 +119,89 @@ async def test_framework_app_exception_handling(monkeypatch):
 
     # Ensure the publish method was awaited once
     mock_event_bus.publish.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_framework_app_setup_runs_once(monkeypatch):
+    container = AsyncMock()
+    register_routes = AsyncMock()
+    setup_calls = {'count': 0}
+
+    async def setup_container(c):
+        setup_calls['count'] += 1
+        await asyncio.sleep(0)  # Give concurrent requests a chance to race the setup
+
+    mock_handle_http_requests = AsyncMock()
+    monkeypatch.setattr('src.core.framework_app.handle_http_requests', mock_handle_http_requests)
+
+    app = FrameworkApp(container=container, register_routes=register_routes, setup_container=setup_container)
+
+    # Several concurrent first requests, followed by more requests
+    scope = {'type': 'http'}
+    await asyncio.gather(*(app(scope, AsyncMock(), AsyncMock()) for _ in range(10)))
+    await app(scope, AsyncMock(), AsyncMock())
+
+    assert setup_calls['count'] == 1
+    register_routes.assert_awaited_once()
+    assert mock_handle_http_requests.await_count == 11
+
+
+@pytest.mark.asyncio
+async def test_framework_app_setup_on_lifespan_startup():
+    container = AsyncMock()
+    container.get_sync = Mock(side_effect=Exception("Service not found"))  # Nothing to close on shutdown
+    register_routes = AsyncMock()
+    setup_container = AsyncMock()
+
+    receive = AsyncMock(side_effect=[{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}])
+    send = AsyncMock()
+
+    app = FrameworkApp(container=container, register_routes=register_routes, setup_container=setup_container)
+    await app({'type': 'lifespan'}, receive, send)
+
+    setup_container.assert_awaited_once_with(container)
+    register_routes.assert_awaited_once()
+    send.assert_any_call({'type': 'lifespan.startup.complete'})
+
+    # Setup already happened during startup, so it is not repeated for later calls
+    await app.ensure_setup()
+    setup_container.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_framework_app_setup_failure_is_permanent(monkeypatch):
+    container = AsyncMock()
+    setup_container = AsyncMock(side_effect=[Exception("Database unavailable"), None])
+
+    mock_handle_http_requests = AsyncMock()
+    monkeypatch.setattr('src.core.framework_app.handle_http_requests', mock_handle_http_requests)
+
+    app = FrameworkApp(container=container, register_routes=AsyncMock(), setup_container=setup_container)
+
+    scope = {'type': 'http'}
+    send = AsyncMock()
+    await app(scope, AsyncMock(), send)
+    mock_handle_http_requests.assert_not_awaited()
+    assert send.await_args_list[0].args[0]['status'] == 500
+
+    # The partly configured container is not set up again: later calls fail with the original error
+    await app(scope, AsyncMock(), AsyncMock())
+    with pytest.raises(RuntimeError) as exc_info:
+        await app.ensure_setup()
+    assert str(exc_info.value.__cause__) == "Database unavailable"
+    assert setup_container.await_count == 1
+    mock_handle_http_requests.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_framework_app_without_setup_container_is_set_up_lazily(monkeypatch):
+    container = AsyncMock()
+    register_routes = AsyncMock()
+    monkeypatch.setattr('src.core.framework_app.handle_http_requests', AsyncMock())
+
+    # The caller registered the services itself; routes and startup hooks still need the first request
+    app = FrameworkApp(container=container, register_routes=register_routes)
+    await app({'type': 'http'}, AsyncMock(), AsyncMock())
+    await app({'type': 'http'}, AsyncMock(), AsyncMock())
+
+    register_routes.assert_awaited_once()
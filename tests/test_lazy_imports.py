@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+
+from src.services.config_service import ConfigService
+from src.services.template_engines.jinja_adapter import JinjaAdapter
+from src.services.template_engines.mako_adapter import MakoAdapter
+from src.services.template_service import TemplateService, load_template_engine
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def loaded_in_fresh_interpreter(module, candidates):
+    code = f"import sys, {module}; print(','.join(m for m in {candidates!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=dict(os.environ, PYTHONPATH=ROOT),
+                            capture_output=True, text=True, check=True)
+    return [name for name in result.stdout.strip().split(',') if name]
+
+
+# Test that importing the framework services does not load their optional libraries
+def test_optional_libraries_are_imported_lazily():
+    modules = "src.services.template_service, src.services.routing_service, src.services.factories, src.services.jwt_service"
+    assert loaded_in_fresh_interpreter(modules, ('jinja2', 'mako', 'redis', 'jwt', 'aiofiles', 'pytest')) == []
+
+
+def test_template_engines_resolve_by_name_or_dotted_path():
+    assert load_template_engine('JinjaAdapter') is JinjaAdapter
+    assert load_template_engine('src.services.template_engines.mako_adapter.MakoAdapter') is MakoAdapter
+    assert load_template_engine('UnknownAdapter') is JinjaAdapter  # Falls back to the default engine
+
+    template_service = TemplateService(ConfigService({'TEMPLATE_ENGINE': 'MakoAdapter', 'TEMPLATE_DIR': ROOT}))
+    assert isinstance(template_service.engine, MakoAdapter)
@@ -1,7 +1,15 @@
 import pytest
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, Mock
 
-from src.core.lifecycle import handle_lifespan_events
+from src.core.lifecycle import handle_lifespan_events, on_startup, on_shutdown, run_startup_hooks, \
+    run_shutdown_hooks
+
+
+@pytest.fixture
+def lifespan_registries(monkeypatch):
+    # Isolate the global hook registries for each test
+    monkeypatch.setattr('src.core.lifecycle.startup_registry', [])
+    monkeypatch.setattr('src.core.lifecycle.shutdown_registry', [])
 
 
 @pytest.mark.asyncio
@@ -80,3 +88,114 @@ async def test_handle_lifespan_events_exception_handling(capfd):
     # Capture and verify the printed output
     captured = capfd.readouterr()
     assert "Error during lifespan handling: Test exception" in captured.out
+
+
+@pytest.mark.asyncio
+async def test_handle_lifespan_events_runs_startup_hook():
+    receive = AsyncMock()
+    receive.side_effect = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}]
+    send = AsyncMock()
+    on_startup = AsyncMock()
+
+    await handle_lifespan_events({'type': 'lifespan'}, receive, send, on_startup=on_startup)
+
+    # The startup hook must finish before the server is told startup is complete
+    on_startup.assert_awaited_once()
+    assert send.call_args_list[0].args[0] == {'type': 'lifespan.startup.complete'}
+
+
+@pytest.mark.asyncio
+async def test_handle_lifespan_events_startup_hook_failure():
+    receive = AsyncMock()
+    receive.side_effect = [{'type': 'lifespan.startup'}]
+    send = AsyncMock()
+    on_startup = AsyncMock(side_effect=Exception("Setup failed"))
+
+    await handle_lifespan_events({'type': 'lifespan'}, receive, send, on_startup=on_startup)
+
+    send.assert_called_once_with({'type': 'lifespan.startup.failed', 'message': 'Setup failed'})
+
+
+@pytest.mark.asyncio
+async def test_handle_lifespan_events_runs_shutdown_hook():
+    receive = AsyncMock()
+    receive.side_effect = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}]
+    send = AsyncMock()
+    on_shutdown_hook = AsyncMock(side_effect=Exception("Teardown failed"))
+
+    await handle_lifespan_events({'type': 'lifespan'}, receive, send, on_shutdown=on_shutdown_hook)
+
+    # A failing teardown is reported but the shutdown is still acknowledged
+    on_shutdown_hook.assert_awaited_once()
+    send.assert_called_with({'type': 'lifespan.shutdown.complete'})
+
+
+@pytest.mark.asyncio
+async def test_startup_hooks_run_in_registration_order(lifespan_registries):
+    calls = []
+    container = Mock()
+
+    @on_startup
+    async def warm_up_pool(c):
+        calls.append(('pool', c))
+
+    @on_startup
+    async def precompile_templates(c):
+        calls.append(('templates', c))
+
+    await run_startup_hooks(container)
+
+    assert calls == [('pool', container), ('templates', container)]
+
+
+@pytest.mark.asyncio
+async def test_shutdown_closes_resources_in_dependency_order(lifespan_registries):
+    calls = []
+
+    websocket_service = Mock()
+    websocket_service.shutdown = AsyncMock(side_effect=lambda: calls.append('websocket'))
+    redis_service = Mock()
+    redis_service.cleanup = AsyncMock(side_effect=lambda: calls.append('redis'))
+    orm_service = Mock()
+    orm_service.cleanup = AsyncMock(side_effect=lambda: calls.append('orm'))
+    services = {'WebSocketService': websocket_service, 'RedisService': redis_service, 'ORMService': orm_service}
+
+    def get_sync(name):
+        if name in services:
+            return services[name]
+        raise Exception(f"Service {name} not found")
+
+    container = Mock()
+    container.get_sync = Mock(side_effect=get_sync)
+
+    @on_shutdown
+    async def first_hook(c):
+        calls.append('first_hook')
+
+    @on_shutdown
+    async def failing_hook(c):
+        calls.append('failing_hook')
+        raise Exception("Hook failed")
+
+    await run_shutdown_hooks(container)
+
+    # Hooks run in reverse registration order, then services are closed from the top of the stack down
+    assert calls == ['failing_hook', 'first_hook', 'websocket', 'redis', 'orm']
+
+
+@pytest.mark.asyncio
+async def test_shutdown_skips_services_that_were_never_built(lifespan_registries):
+    orm_service = Mock()
+    orm_service.cleanup = AsyncMock()
+
+    def get_sync(name):
+        if name == 'ORMService':
+            return orm_service
+        raise Exception(f"Service {name} not found or requires async initialization")
+
+    container = Mock()
+    container.get_sync = Mock(side_effect=get_sync)
+
+    await run_shutdown_hooks(container)
+
+    orm_service.cleanup.assert_awaited_once()
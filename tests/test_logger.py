@@ -0,0 +1,76 @@
+import io
+import logging
+
+import pytest
+
+from src.core.logger import DebugThrottle, configure_logging, get_logger, stop_logging
+
+
+def make_record(level=logging.DEBUG, name='src.test'):
+    return logging.LogRecord(name, level, __file__, 1, "message", None, None)
+
+
+@pytest.fixture
+def log_stream():
+    stream = io.StringIO()
+    yield stream
+    stop_logging()
+    logging.getLogger('src').setLevel(logging.NOTSET)
+    logging.getLogger('src.services.redis_service').setLevel(logging.NOTSET)
+
+
+def test_records_are_written_by_the_listener(log_stream):
+    configure_logging(level='INFO', stream=log_stream)
+    logger = get_logger('src.core.event_bus')
+
+    logger.info("Event %s published", 'test.event')
+    logger.debug("Not written at INFO level")
+    stop_logging()
+
+    output = log_stream.getvalue()
+    assert "src.core.event_bus - INFO - Event test.event published" in output
+    assert "Not written" not in output
+
+
+def test_module_levels(log_stream):
+    configure_logging(level='WARNING', module_levels={'src.services.redis_service': 'DEBUG'}, stream=log_stream)
+
+    get_logger('src.services.redis_service').debug("Cache set for key: %s", 'k')
+    get_logger('src.core.event_bus').info("Quiet module")
+    stop_logging()
+
+    output = log_stream.getvalue()
+    assert "Cache set for key: k" in output
+    assert "Quiet module" not in output
+
+
+def test_configure_logging_replaces_previous_pipeline(log_stream):
+    configure_logging(stream=io.StringIO())
+    configure_logging(stream=log_stream)
+    get_logger('src.core.event_bus').warning("Only once")
+    stop_logging()
+
+    assert log_stream.getvalue().count("Only once") == 1
+
+
+def test_debug_sampling():
+    throttle = DebugThrottle(sample_every=3)
+    kept = [throttle.filter(make_record()) for _ in range(9)]
+
+    assert kept.count(True) == 3
+    assert throttle.suppressed == 6
+    # Records above DEBUG are never sampled out
+    assert all(throttle.filter(make_record(logging.ERROR)) for _ in range(5))
+
+
+def test_debug_rate_limit_per_logger():
+    now = [0.0]
+    throttle = DebugThrottle(rate_limit=2, clock=lambda: now[0])
+
+    assert [throttle.filter(make_record()) for _ in range(4)] == [True, True, False, False]
+    # Each logger has its own budget
+    assert throttle.filter(make_record(name='src.other')) is True
+    # The budget is restored in the next one-second window
+    now[0] = 1.5
+    assert throttle.filter(make_record()) is True
+    assert throttle.suppressed == 2
@@ -0,0 +1,95 @@
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from src.core.event_bus import Event, EventBus
+from src.middleware.base_middleware import BaseMiddleware
+from src.services.middleware_service import MiddlewareService
+from src.services.routing_service import RoutingService
+
+
+class RecordingMiddleware(BaseMiddleware):
+    def __init__(self, calls):
+        self.calls = calls
+
+    async def before_request(self, event: Event) -> Event:
+        self.calls.append(self.__class__.__name__)
+        return event
+
+    async def after_request(self, event: Event) -> None:
+        pass
+
+
+class SessionMiddleware(RecordingMiddleware):
+    pass
+
+
+class CSRFMiddleware(RecordingMiddleware):
+    pass
+
+
+class CORSMiddleware(RecordingMiddleware):
+    pass
+
+
+@pytest.fixture
+def services(routing_service):
+    calls = []
+    middleware_service = MiddlewareService(event_bus=EventBus())
+    middleware_service.register_middleware(CORSMiddleware(calls), priority=4)
+    middleware_service.register_middleware(SessionMiddleware(calls), priority=10)
+    middleware_service.register_middleware(CSRFMiddleware(calls), priority=9)
+    middleware_service.use_router(routing_service)
+    return middleware_service, routing_service, calls
+
+
+@pytest.mark.asyncio
+async def test_routes_select_their_middleware_chain(services, request_event):
+    middleware_service, routing_service, calls = services
+    routing_service.add_route_group('/api', ['CORSMiddleware'])
+    routing_service.add_route('/', 'GET', AsyncMock())
+    routing_service.add_route('/api/books', 'GET', AsyncMock())
+    routing_service.add_route('/api/login', 'POST', AsyncMock(), middleware=['CSRFMiddleware', 'SessionMiddleware'])
+    routing_service.add_route('/health', 'GET', AsyncMock(), middleware=[])
+    routing_service.setup_static_routes('static', '/static')
+
+    expected = {
+        ('/', 'GET'): ['SessionMiddleware', 'CSRFMiddleware', 'CORSMiddleware'],
+        ('/api/books', 'GET'): ['CORSMiddleware'],
+        ('/api/login', 'POST'): ['SessionMiddleware', 'CSRFMiddleware'],  # Priority order, not declaration order
+        ('/api/missing', 'GET'): ['CORSMiddleware'],  # 404 under the group
+        ('/health', 'GET'): [],
+        ('/static/css/style.css', 'GET'): [],
+    }
+    for (path, method), chain in expected.items():
+        calls.clear()
+        await middleware_service.execute(request_event(path, method), AsyncMock())
+        assert calls == chain, path
+
+
+@pytest.mark.asyncio
+async def test_route_event_reuses_the_match_of_middleware_for(services, request_event):
+    middleware_service, routing_service, _ = services
+    handler = AsyncMock()
+    routing_service.add_route('/books/<int:id>', 'GET', handler)
+    routing_service._resolve = Mock(wraps=routing_service._resolve)
+
+    await middleware_service.execute(request_event('/books/3'), routing_service.route_event)
+
+    handler.assert_called_once()
+    assert handler.call_args.args[0].data['path_params'] == {'id': 3}
+    assert routing_service._resolve.call_count == 1
+
+
+def test_unknown_middleware_name_is_rejected_at_registration(services, routing_service):
+    middleware_service, _, _ = services
+    with pytest.raises(ValueError):
+        routing_service.add_route('/books', 'GET', AsyncMock(), middleware=['SessionMiddlewar'])
+    with pytest.raises(ValueError):
+        routing_service.add_route_group('/api', ['CORSMiddlewar'])
+    assert r'^/books$' not in routing_service.routes
+
+    # Routes added before the router is attached are checked by use_router
+    other_router = RoutingService(event_bus=EventBus(), auth_service=AsyncMock(), jwt_service=None, config_service=AsyncMock())
+    other_router.add_route('/books', 'GET', AsyncMock(), middleware=['SessionMiddlewar'])
+    with pytest.raises(ValueError):
+        middleware_service.use_router(other_router)
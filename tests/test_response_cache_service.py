@@ -0,0 +1,152 @@
+import pytest
+import fakeredis.aioredis as fakeredis
+from unittest.mock import AsyncMock
+
+from src.core.event_bus import Event, EventBus
+from src.core.response import Response
+from src.middleware.base_middleware import BaseMiddleware
+from src.services.middleware_service import MiddlewareService
+from src.services.redis_service import RedisService
+from src.services.response_cache_service import CachePolicy, ResponseCacheService
+
+
+def _counting_handler(calls):
+    async def handler(event):
+        calls.append(event)
+        event.data['response'] = Response(f"<h1>render {len(calls)}</h1>", content_type='text/html')
+    return handler
+
+
+# Requests go through the middleware chain, which sends (and caches) the response
+@pytest.fixture
+def middleware_service(routing_service):
+    middleware_service = MiddlewareService(event_bus=routing_service.event_bus)
+    middleware_service.use_router(routing_service)
+    return middleware_service
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_bypasses_the_handler(routing_service, middleware_service, request_event):
+    calls = []
+    routing_service.add_route('/books', 'GET', _counting_handler(calls), cache={'ttl': 30, 'vary': ['query', 'cookie:lang']})
+
+    bodies = []
+    for query, cookie in ((b'page=1', 'lang=en'), (b'page=1', 'lang=en'), (b'page=2', 'lang=en'), (b'page=1', 'lang=fr')):
+        event = request_event('/books', query=query, headers=[(b'cookie', cookie.encode())])
+        await middleware_service.execute(event, routing_service.route_event)
+        response = event.data['response']
+        response._encode_content()
+        bodies.append(response.body)
+
+    assert len(calls) == 3
+    assert bodies[0] == bodies[1] == b'<h1>render 1</h1>'
+    assert (b'content-type', b'text/html') in event.data['response'].headers
+    assert routing_service.response_cache.info()['hits'] == 1
+
+
+@pytest.mark.asyncio
+async def test_events_invalidate_tagged_entries(routing_service, middleware_service, request_event):
+    calls = []
+    routing_service.add_route('/books', 'GET', _counting_handler(calls), cache={'ttl': 30, 'invalidate_on': ['book.#']})
+    routing_service.add_route('/authors', 'GET', _counting_handler(calls), cache={'ttl': 30})
+
+    for path in ('/books', '/authors', '/books', '/authors'):
+        await middleware_service.execute(request_event(path), routing_service.route_event)
+    assert len(calls) == 2
+
+    await routing_service.event_bus.publish(Event(name='book.updated', data={}))
+    await middleware_service.execute(request_event('/books'), routing_service.route_event)
+    await middleware_service.execute(request_event('/authors'), routing_service.route_event)
+    assert [event.data['request'].path for event in calls] == ['/books', '/authors', '/books']
+
+
+@pytest.mark.asyncio
+async def test_authenticated_pages_are_cached_per_session(routing_service, middleware_service, request_event):
+    calls = []
+    routing_service.add_route('/account', 'GET', _counting_handler(calls), requires_auth=True, cache={'ttl': 30})
+
+    for session_id in ('alice', 'bob', 'alice'):
+        event = request_event('/account', headers=[(b'cookie', f'session_id={session_id}'.encode())])
+        event.data['session'] = {'user_id': session_id}
+        await middleware_service.execute(event, routing_service.route_event)
+
+    assert [event.data['session']['user_id'] for event in calls] == ['alice', 'bob']
+    assert routing_service.records[r'^/account$'].cache.vary == ('cookie:session_id',)
+
+
+@pytest.mark.asyncio
+async def test_cookies_set_by_middleware_are_never_cached(routing_service, middleware_service, request_event):
+    class NewSessionMiddleware(BaseMiddleware):
+        async def before_request(self, event):
+            return event
+
+        async def after_request(self, event):
+            event.data['response'].set_cookie('session_id', 'new-visitor')
+
+    middleware_service.register_middleware(NewSessionMiddleware())
+    calls = []
+    routing_service.add_route('/', 'GET', _counting_handler(calls), cache={'ttl': 30})
+
+    for _ in range(2):
+        await middleware_service.execute(request_event('/'), routing_service.route_event)
+
+    assert len(calls) == 2
+    assert routing_service.response_cache.info()['entries'] == 0
+
+
+@pytest.mark.asyncio
+async def test_responses_with_cookies_or_errors_are_not_cached():
+    cache = ResponseCacheService(EventBus())
+    policy = CachePolicy(ttl=30)
+    with_cookie = Response('hello')
+    with_cookie.set_cookie('session_id', 'abc')
+
+    await cache.set('a', with_cookie, policy)
+    await cache.set('b', Response('missing', status_code=404), policy)
+    await cache.set('c', Response('hello', headers=[(b'access-control-allow-origin', b'https://a.example')]), policy)
+
+    assert await cache.get('a') is None
+    assert await cache.get('b') is None
+    assert (await cache.get('c')).headers == []  # CORS headers are added per request by the middleware
+
+
+@pytest.mark.asyncio
+async def test_memory_is_bounded_by_bytes():
+    cache = ResponseCacheService(EventBus(), max_bytes=100)
+    policy = CachePolicy(ttl=30)
+    for key in ('a', 'b', 'c'):
+        await cache.set(key, Response(b'x' * 40), policy)
+    await cache.set('huge', Response(b'x' * 200), policy)
+
+    assert cache.size <= 100
+    assert await cache.get('a') is None  # Least recently used evicted
+    assert await cache.get('c') is not None
+    assert await cache.get('huge') is None
+
+
+def test_invalid_cache_options_are_rejected(routing_service):
+    with pytest.raises(ValueError):
+        routing_service.add_route('/books', 'GET', AsyncMock(), cache={'vary': ['query']})
+    with pytest.raises(ValueError):
+        routing_service.add_route('/books', 'GET', AsyncMock(), cache={'ttl': 30, 'vary': ['body']})
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_is_shared_and_invalidated():
+    fake_redis = await fakeredis.FakeRedis(decode_responses=True)
+    redis_service = RedisService(redis_client=fake_redis)
+    policy = CachePolicy(ttl=30, tags=['books'])
+    worker_a = ResponseCacheService(EventBus(), redis_service=redis_service)
+    worker_b = ResponseCacheService(EventBus(), redis_service=redis_service)
+
+    await worker_a.set('/books', Response(b'\x00binary', headers=[(b'x-rendered-by', b'a')]), policy)
+    entry = await worker_b.get('/books')
+    assert entry.body == b'\x00binary'
+    assert (b'x-rendered-by', b'a') in entry.headers
+
+    await worker_a.invalidate('books')
+    worker_b.clear()
+    assert await worker_b.get('/books') is None
+
+    await fake_redis.aclose()
+    await fake_redis.connection_pool.disconnect()
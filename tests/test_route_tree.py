@@ -0,0 +1,93 @@
+import uuid
+
+import pytest
+
+from src.core.route_tree import RouteTree, UrlBuilder
+
+
+def test_static_and_typed_parameters():
+    tree = RouteTree()
+    tree.add('/', 'root')
+    tree.add('/page/<int:id>', 'page')
+    tree.add('/user/<str:username>', 'user')
+    tree.add('/page/<int:id>/user/<name>', 'page_user')
+
+    assert tree.match('/') == ('root', {})
+    assert tree.match('/page/45') == ('page', {'id': 45})
+    assert tree.match('/page/abc') is None  # Not an int
+    assert tree.match('/page/٤٥') is None  # Only ASCII digits, as with [0-9]+
+    assert tree.match('/user/johndoe') == ('user', {'username': 'johndoe'})
+    assert tree.match('/page/45/user/johndoe') == ('page_user', {'id': 45, 'name': 'johndoe'})
+    assert tree.match('/page/45/') is None
+    assert tree.match('/user/') is None  # A parameter needs at least one character
+
+
+def test_static_segments_win_and_search_backtracks():
+    tree = RouteTree()
+    tree.add('/books/<str:title>', 'book')
+    tree.add('/books/new', 'new_book')
+    tree.add('/books/<str:title>/edit', 'edit_book')
+    tree.add('/books/new/<int:step>', 'wizard')
+
+    assert tree.match('/books/new') == ('new_book', {})
+    assert tree.match('/books/dune') == ('book', {'title': 'dune'})
+    # The static 'new' branch has no 'edit' child: the parameter branch is tried next
+    assert tree.match('/books/new/edit') == ('edit_book', {'title': 'new'})
+    assert tree.match('/books/new/2') == ('wizard', {'step': 2})
+
+
+def test_catch_all_and_mixed_segments():
+    tree = RouteTree()
+    tree.add('/static/<path:filename>', 'static')
+    tree.add('/reports/report-<int:year>.pdf', 'report')
+
+    assert tree.match('/static/css/site.css') == ('static', {'filename': 'css/site.css'})
+    assert tree.match('/static/') is None
+    assert tree.match('/reports/report-2024.pdf') == ('report', {'year': 2024})
+    assert tree.match('/reports/report-x.pdf') is None
+
+    with pytest.raises(ValueError):
+        tree.add('/files/<path:rest>/edit', 'invalid')
+    with pytest.raises(ValueError):
+        tree.add('/items/<float:price>', 'invalid')
+
+
+def test_remove_prunes_branches():
+    tree = RouteTree()
+    tree.add('/a/<int:id>/b', 'ab')
+    tree.add('/a/<int:id>', 'a')
+    tree.add('/static/<path:filename>', 'static')
+
+    tree.remove('/a/<int:id>/b')
+    assert tree.match('/a/1/b') is None
+    assert tree.match('/a/1') == ('a', {'id': 1})
+
+    tree.remove('/a/<int:id>')
+    tree.remove('/static/<path:filename>')
+    assert tree.root.static == {}
+    assert tree.match('/a/1') is None
+
+
+def test_converters_parse_values():
+    tree = RouteTree()
+    tree.add('/posts/<slug:slug>', 'post')
+    tree.add('/orders/<uuid:order_id>', 'order')
+
+    assert tree.match('/posts/hello-world_2') == ('post', {'slug': 'hello-world_2'})
+    assert tree.match('/posts/hello world') is None
+    route, params = tree.match('/orders/12345678-1234-5678-1234-567812345678')
+    assert route == 'order'
+    assert params == {'order_id': uuid.UUID('12345678-1234-5678-1234-567812345678')}
+    assert tree.match('/orders/123456781234567812345678123456789') is None  # Only the canonical form
+
+
+def test_url_builder():
+    builder = UrlBuilder('/admin/users/<int:id>/edit')
+    assert builder.build({'id': 3}) == '/admin/users/3/edit'
+    assert builder.build({'id': 3, 'page': 2}) == '/admin/users/3/edit?page=2'
+    assert UrlBuilder('/books/<str:title>').build({'title': 'War & Peace'}) == '/books/War%20%26%20Peace'
+    assert UrlBuilder('/static/<path:filename>').build({'filename': 'css/site.css'}) == '/static/css/site.css'
+    with pytest.raises(ValueError):
+        builder.build({})
+    with pytest.raises(ValueError):
+        builder.build({'id': -1})
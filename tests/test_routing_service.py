@@ -162,7 +162,7 @@ async def test_route_with_int_param(monkeypatch):
 
     # Ensure the correct handler was called with path parameter 'id' = 45
     handler.assert_called_once_with(event)
-    assert event.data['path_params'] == {'id': '45'}
+    assert event.data['path_params'] == {'id': 45}  # Parsed by the int converter
 
 
 @pytest.mark.asyncio
@@ -226,7 +226,7 @@ async def test_route_with_multiple_params(monkeypatch):
 
     # Ensure the correct handler was called with both parameters extracted
     handler.assert_called_once_with(event)
-    assert event.data['path_params'] == {'id': '45', 'username': 'johndoe'}
+    assert event.data['path_params'] == {'id': 45, 'username': 'johndoe'}
 
 
 @pytest.mark.asyncio
@@ -561,3 +561,80 @@ async def test_route_with_jwt_auth_no_token(monkeypatch):
         # Ensure that the unauthorized handler is called
         auth_service.send_unauthorized.assert_called_once_with(event)
         handler.assert_not_called()
+
+
+def test_url_for_named_routes():
+    routing_service = RoutingService(event_bus=EventBus(), auth_service=AsyncMock(), jwt_service=None, config_service=AsyncMock())
+    routing_service.add_route('/admin/users/<int:id>/edit', ['GET', 'POST'], AsyncMock(), name='admin_edit_user')
+    routing_service.setup_static_routes('static', '/static')
+
+    assert routing_service.url_for('admin_edit_user', id=7) == '/admin/users/7/edit'
+    assert routing_service.url_for('static', filename='css/style.css') == '/static/css/style.css'
+    with pytest.raises(ValueError):
+        routing_service.add_route('/admin/users', 'GET', AsyncMock(), name='admin_edit_user')
+
+    routing_service.remove_route('/admin/users/<int:id>/edit', 'GET')
+    assert routing_service.url_for('admin_edit_user', id=7) == '/admin/users/7/edit'  # POST is still routed
+    routing_service.remove_route('/admin/users/<int:id>/edit', 'POST')
+    with pytest.raises(ValueError):
+        routing_service.url_for('admin_edit_user', id=7)
+
+
+@pytest.mark.asyncio
+async def test_method_mismatch_falls_through_to_next_route(routing_service, request_event):
+    create_handler, title_handler = AsyncMock(), AsyncMock()
+    routing_service.add_route('/books/new', 'POST', create_handler)
+    routing_service.add_route('/books/<str:title>', 'GET', title_handler)
+
+    event = request_event('/books/new', 'GET')
+    await routing_service.route_event(event)
+
+    title_handler.assert_called_once_with(event)
+    create_handler.assert_not_called()
+    assert event.data['path_params'] == {'title': 'new'}
+
+
+@pytest.mark.asyncio
+async def test_405_carries_allow_header(routing_service, request_event):
+    routing_service.add_route('/books', ['GET', 'POST'], AsyncMock())
+    routing_service.add_route('/books/<int:id>', 'GET', AsyncMock())
+    routing_service.add_route('/books/<str:title>', ['PUT', 'WEBSOCKET'], AsyncMock())
+
+    with patch.object(routing_service.event_bus, 'publish', AsyncMock()) as publish:
+        await routing_service.route_event(request_event('/books', 'DELETE'))
+        await routing_service.route_event(request_event('/books/7', 'DELETE'))
+        await routing_service.route_event(request_event('/authors', 'GET'))
+
+    events = [call.args[0] for call in publish.call_args_list]
+    assert [event.name for event in events] == ['http.error.405', 'http.error.405', 'http.error.404']
+    assert events[0].data['allow'] == b'GET, POST'
+    assert events[1].data['allow'] == b'GET, PUT'  # Both routes match '/books/7'
+
+    routing_service.remove_route('/books', 'POST')
+    assert routing_service.records[r'^/books$'].allow == b'GET'
+
+
+def test_match_cache_counts_and_invalidates(routing_service):
+    routing_service.add_route('/books/<int:id>', 'GET', AsyncMock())
+
+    record, params = routing_service._resolve('GET', '/books/7')
+    params['id'] = 8  # Must not leak into the cached entry
+    assert routing_service._resolve('GET', '/books/7') == (record, {'id': 7})
+    assert routing_service._resolve('POST', '/books/7') is None
+    assert routing_service.match_cache_info() == {'hits': 1, 'misses': 2, 'size': 2, 'max_size': 1024}
+
+    # Adding a method must not leave the cached miss behind
+    routing_service.add_route('/books/<int:id>', 'POST', AsyncMock())
+    assert routing_service._resolve('POST', '/books/7') == (record, {'id': 7})
+    routing_service.remove_route('/books/<int:id>', 'GET')
+    assert routing_service._resolve('GET', '/books/7') is None
+
+
+def test_match_cache_is_bounded(routing_service):
+    routing_service.add_route('/books/<int:id>', 'GET', AsyncMock())
+    routing_service.match_cache_size = 2
+
+    for path in ('/books/1', '/books/2', '/books/1', '/books/3'):
+        routing_service._resolve('GET', path)
+
+    assert list(routing_service._match_cache) == [('GET', '/books/1'), ('GET', '/books/3')]  # Least recently used evicted
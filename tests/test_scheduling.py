@@ -0,0 +1,116 @@
+import asyncio
+import random
+
+import pytest
+
+from src.core.scheduling import (EwmaPowerOfTwo, LeastOutstanding, RoundRobin, ServiceStats, WeightedRoundRobin,
+                                 create_strategy)
+
+
+def make_stats(in_flight=(), ewma=()):
+    stats = [ServiceStats() for _ in range(max(len(in_flight), len(ewma)))]
+    for service_stats, value in zip(stats, in_flight):
+        service_stats.in_flight = value
+    for service_stats, value in zip(stats, ewma):
+        service_stats.ewma = value
+    return stats
+
+
+def test_round_robin_rotates():
+    strategy = RoundRobin()
+    stats = make_stats(in_flight=(0, 0, 0))
+    assert [strategy.order(stats)[0] for _ in range(4)] == [0, 1, 2, 0]
+    assert strategy.order(stats) == [1, 2, 0]
+
+
+def test_least_outstanding_prefers_idle_services():
+    strategy = LeastOutstanding()
+    assert strategy.order(make_stats(in_flight=(3, 0, 1))) == [1, 2, 0]
+    # Ties are broken by rotation, so idle services share the work
+    stats = make_stats(in_flight=(0, 0, 5))
+    assert {strategy.order(stats)[0] for _ in range(6)} == {0, 1}
+
+
+def test_weighted_round_robin_is_smooth():
+    strategy = WeightedRoundRobin([5, 1, 1])
+    stats = make_stats(in_flight=(0, 0, 0))
+    picks = [strategy.order(stats)[0] for _ in range(7)]
+    assert picks == [0, 0, 1, 0, 2, 0, 0]
+
+
+def test_weighted_round_robin_validates_weights():
+    with pytest.raises(ValueError):
+        WeightedRoundRobin([1, 0])
+    with pytest.raises(ValueError):
+        WeightedRoundRobin([1, 2]).order(make_stats(in_flight=(0, 0, 0)))
+    with pytest.raises(ValueError):
+        create_strategy('weighted_round_robin')
+    with pytest.raises(ValueError):
+        create_strategy('random')
+
+
+def test_ewma_power_of_two_picks_the_cheaper_of_two():
+    strategy = EwmaPowerOfTwo(rng=random.Random(7))
+    stats = make_stats(in_flight=(0, 0, 0), ewma=(0.5, 0.01, 0.2))
+    picks = [strategy.order(stats)[0] for _ in range(200)]
+
+    # The slowest service only wins when it is not sampled, i.e. never
+    assert 0 not in picks
+    assert picks.count(1) > picks.count(2)
+
+
+@pytest.mark.asyncio
+async def test_service_stats_tracks_latency_and_in_flight():
+    stats = ServiceStats()
+    observed = []
+
+    async def service(event):
+        observed.append(stats.in_flight)
+        await asyncio.sleep(0.01)
+        return True
+
+    assert await stats.call(service, None) is True
+    assert observed == [1]
+    assert stats.in_flight == 0
+    assert stats.completed == 1
+    assert stats.ewma >= 0.01
+
+
+@pytest.mark.asyncio
+async def test_service_stats_concurrency_cap_queues_callers():
+    stats = ServiceStats(max_concurrency=2)
+    peak = 0
+
+    async def service(event):
+        nonlocal peak
+        peak = max(peak, stats.in_flight)
+        await asyncio.sleep(0.01)
+        return True
+
+    results = await asyncio.gather(*(stats.call(service, None) for _ in range(6)))
+    assert all(results)
+    assert peak == 2
+    assert stats.completed == 6
+
+
+@pytest.mark.asyncio
+async def test_callers_waiting_for_a_slot_count_as_outstanding():
+    capped, idle = ServiceStats(max_concurrency=1), ServiceStats(max_concurrency=1)
+    release = asyncio.Event()
+
+    async def service(event):
+        await release.wait()
+        return True
+
+    calls = [asyncio.create_task(capped.call(service, None)) for _ in range(4)]
+    await asyncio.sleep(0)
+    assert (capped.in_flight, capped.queued, capped.outstanding) == (1, 3, 4)
+
+    # Both strategies steer new events away from the service with a queue
+    assert LeastOutstanding().order([capped, idle])[0] == 1
+    capped.ewma = idle.ewma = 0.01
+    assert EwmaPowerOfTwo().order([capped, idle])[0] == 1
+
+    release.set()
+    await asyncio.gather(*calls)
+    assert capped.outstanding == 0
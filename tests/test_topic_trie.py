@@ -0,0 +1,49 @@
+from src.core.topic_trie import TopicTrie, is_pattern
+
+
+def test_is_pattern():
+    assert is_pattern('http.error.*')
+    assert is_pattern('user.#')
+    assert not is_pattern('user.login.success')
+    assert not is_pattern('http.error.4*')  # Wildcards only count as whole segments
+
+
+def test_match_exact_and_wildcards():
+    trie = TopicTrie()
+    for pattern in ('http.error.404', 'http.error.*', 'http.#', '#', '*.error.404', 'user.#'):
+        trie.add(pattern)
+
+    assert sorted(trie.match('http.error.404')) == sorted(['http.error.404', 'http.error.*', 'http.#', '#', '*.error.404'])
+    assert sorted(trie.match('http')) == ['#', 'http.#']
+    assert sorted(trie.match('user.login.success')) == ['#', 'user.#']
+
+
+def test_multi_wildcard_in_the_middle():
+    trie = TopicTrie()
+    trie.add('a.#.z')
+
+    assert trie.match('a.z') == ['a.#.z']
+    assert trie.match('a.b.c.z') == ['a.#.z']
+    assert trie.match('a.b.c') == []
+
+
+def test_pattern_matched_once():
+    trie = TopicTrie()
+    trie.add('a.#.#')
+    assert trie.match('a.b.c') == ['a.#.#']
+
+
+def test_remove_prunes_unused_branches():
+    trie = TopicTrie()
+    trie.add('a.b.c')
+    trie.add('a.*')
+
+    trie.remove('a.b.c')
+    assert trie.match('a.b.c') == []
+    assert trie.match('a.b') == ['a.*']
+    assert 'b' not in trie.root.children['a'].children
+
+    trie.remove('a.*')
+    assert trie.root.children == {}
+    # Removing an unknown pattern is a no-op
+    trie.remove('x.y')
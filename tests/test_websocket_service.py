@@ -259,3 +259,20 @@ async def test_listen_websocket_service_error_handling(websocket_service, monkey
 
     # Ensure stop was called
     mock_stop.assert_awaited_once_with(mock_controller)
+
+
+@pytest.mark.asyncio
+async def test_shutdown_closes_all_clients(websocket_service):
+    accepted_client = AsyncMock()
+    accepted_client.connection_accepted = True
+    closed_client = AsyncMock()
+    closed_client.connection_accepted = False
+
+    websocket_service.register_client(accepted_client)
+    websocket_service.register_client(closed_client)
+
+    await websocket_service.shutdown()
+
+    accepted_client.close_websocket.assert_awaited_once()
+    closed_client.close_websocket.assert_not_awaited()
+    assert websocket_service.clients == []